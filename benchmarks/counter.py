@@ -0,0 +1,96 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark of counting bytes from many threads.
+
+    Compares SizeCounter with a single counter guarded by a lock, for
+    several numbers of threads each adding the same number of times.
+
+    Run as::
+
+        python -m benchmarks.counter
+"""
+from __future__ import print_function
+
+import threading
+import time
+
+from bytesize import Size
+from bytesize import SizeCounter
+
+ADDS = 100000
+
+class LockedCounter(object):
+    """ A count of bytes guarded by a single lock. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._magnitude = 0
+
+    def add(self, amount):
+        """ Add to the count.
+
+            :param int amount: the number of bytes
+        """
+        with self._lock:
+            self._magnitude += amount
+
+    def snapshot(self):
+        """ The count so far.
+
+            :rtype: :class:`Size`
+        """
+        with self._lock:
+            return Size(self._magnitude)
+
+def _run(counter, threads, adds=ADDS):
+    """ Time threads adding to counter.
+
+        :param counter: the counter
+        :param int threads: the number of threads
+        :param int adds: the number of additions by each thread
+        :returns: the elapsed time in seconds
+        :rtype: float
+    """
+    def work():
+        """ Add to the counter. """
+        add = counter.add
+        for _ in range(adds):
+            add(4096)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.time()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.time() - start
+    assert counter.snapshot() == Size(4096 * adds * threads)
+    return elapsed
+
+def main():
+    """ Print the time per addition for each counter and thread count. """
+    for threads in (1, 2, 4, 8, 16):
+        per_add = float(ADDS * threads) / 1e6
+        locked = min(_run(LockedCounter(), threads) for _ in range(3))
+        sharded = min(_run(SizeCounter(), threads) for _ in range(3))
+        print("%d threads" % threads)
+        print("   locked:      %6.3f usec" % (locked / per_add))
+        print("   SizeCounter: %6.3f usec (%.1fx)" % \
+           (sharded / per_add, locked / sharded))
+
+if __name__ == "__main__":
+    main()
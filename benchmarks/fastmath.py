@@ -0,0 +1,64 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark of unchecked arithmetic.
+
+    Compares each operator of Size with the corresponding operation of
+    FastMath, on the same operands.
+
+    Run as::
+
+        python -m benchmarks.fastmath
+"""
+from __future__ import print_function
+
+import timeit
+
+NUMBER = 200000
+
+SETUP = """
+from bytesize import FastMath
+from bytesize import GiB
+from bytesize import MiB
+from bytesize import Size
+a = Size(3, GiB)
+b = Size(5, MiB)
+"""
+
+OPERATIONS = [
+   ("+", "a + b", "FastMath.add(a, b)"),
+   ("-", "a - b", "FastMath.subtract(a, b)"),
+   ("* int", "a * 3", "FastMath.multiply(a, 3)"),
+   ("// int", "a // 3", "FastMath.truncate_divide(a, 3)"),
+   ("// Size", "a // b", "FastMath.floor_divide(a, b)"),
+   ("/ Size", "a / b", "FastMath.divide(a, b)"),
+   ("%", "a % b", "FastMath.modulo(a, b)"),
+   ("-x", "-a", "FastMath.negative(a)"),
+   ("abs", "abs(a)", "FastMath.absolute(a)")
+]
+
+def main():
+    """ Print the time per operation for Size and FastMath. """
+    for (name, checked, unchecked) in OPERATIONS:
+        (size, fast) = [
+           min(timeit.repeat(statement, SETUP, number=NUMBER, repeat=5)) * \
+              1e9 / NUMBER for statement in (checked, unchecked)
+        ]
+        print("%-8s Size %7.1f ns, FastMath %7.1f ns (%.2fx)" % \
+           (name, size, fast, size / fast))
+
+if __name__ == "__main__":
+    main()
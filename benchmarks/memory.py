@@ -0,0 +1,72 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Memory benchmark for Size objects.
+
+    Reports the number of bytes allocated per Size instance, as measured
+    by tracemalloc, for several kinds of construction.
+
+    Run as::
+
+        python -m benchmarks.memory
+"""
+from __future__ import print_function
+
+import tracemalloc
+
+from bytesize import GiB
+from bytesize import Size
+
+COUNT = 100000
+
+def _bytes_per_instance(make, count=COUNT):
+    """ Measure the bytes allocated per object by make.
+
+        :param make: a function from an int index to an object
+        :param int count: the number of objects to construct
+        :returns: the average number of bytes allocated per object
+        :rtype: float
+
+        The integers used as indices are allocated before tracing starts,
+        so they are not counted, but the integer magnitude of each
+        Size is, as is one list slot per object.
+    """
+    indices = list(range(count))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [make(i) for i in indices]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del objects
+    return float(after - before) / count
+
+WORKLOADS = [
+   ("Size(int)", lambda i: Size(i)),
+   ("Size(int, GiB)", lambda i: Size(i, GiB)),
+   ("Size + Size", lambda i, s=Size(1): s + Size(i)),
+   ("-Size", lambda i, s=Size(1): -s),
+]
+
+def main():
+    """ Print bytes per instance for each workload. """
+    for (name, make) in WORKLOADS:
+        print("%-20s %8.1f bytes/instance" % (name, _bytes_per_instance(make)))
+
+if __name__ == "__main__":
+    main()
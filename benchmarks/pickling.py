@@ -0,0 +1,79 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark of pickling lists of sizes.
+
+    Compares, for a list of a million Sizes, the pickle of each Size as
+    its magnitude with the default pickle of its slot state, which
+    Size used before it defined __reduce__, and with a list of the
+    magnitudes alone, in time and in number of bytes.
+
+    Run as::
+
+        python -m benchmarks.pickling
+"""
+from __future__ import print_function
+
+import time
+
+from six.moves import cPickle as pickle
+
+from bytesize import Size
+
+COUNT = 1000000
+
+class SlotStateSize(Size):
+    """ A Size which pickles with the default protocol. """
+    __slots__ = ()
+    __reduce__ = object.__reduce__
+
+def _time(func, repeat=3):
+    """ The least time taken by func.
+
+        :param func: a function of no arguments
+        :param int repeat: the number of times to call func
+        :returns: the time in seconds
+        :rtype: float
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+    return min(times)
+
+def main():
+    """ Print the times to pickle and unpickle and the pickle sizes. """
+    magnitudes = [i * 4096 - 2 ** 31 for i in range(COUNT)]
+    cases = [
+       ("slot state", [SlotStateSize(m) for m in magnitudes]),
+       ("__reduce__", [Size(m) for m in magnitudes]),
+       ("ints", magnitudes)
+    ]
+    for protocol in sorted(set([2, pickle.HIGHEST_PROTOCOL])):
+        print("protocol %d" % protocol)
+        for (name, values) in cases:
+            data = pickle.dumps(values, protocol)
+            assert pickle.loads(data) == values
+            dump = _time(lambda: pickle.dumps(values, protocol))
+            load = _time(lambda: pickle.loads(data))
+            print(
+               "   %-10s dump %6.3f s, load %6.3f s, %5.2f bytes per size" % \
+               (name, dump, load, float(len(data)) / COUNT)
+            )
+
+if __name__ == "__main__":
+    main()
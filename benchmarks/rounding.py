@@ -0,0 +1,122 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark of rounding sizes to units.
+
+    Compares Size.roundTo with the Fraction-based path it replaced,
+    for each rounding method, on a mix of aligned and unaligned sizes;
+    and, if numpy is available, round_to with roundTo in a loop, for
+    units which are and are not powers of two.
+
+    Run as::
+
+        python -m benchmarks.rounding
+"""
+from __future__ import print_function
+
+import timeit
+
+from fractions import Fraction
+
+from bytesize import KiB
+from bytesize import MiB
+from bytesize import ROUND_CEILING
+from bytesize import ROUND_DOWN
+from bytesize import ROUND_FLOOR
+from bytesize import ROUND_HALF_EVEN
+from bytesize import ROUND_HALF_UP
+from bytesize import ROUND_UP
+from bytesize import ROUNDING_METHODS
+from bytesize import Size
+
+try:
+    from bytesize import round_to
+except ImportError: # numpy is not available
+    round_to = None
+
+SIZES = [Size(i * 4093 + 512) for i in range(100)] + \
+   [Size(i, MiB) for i in range(-50, 50)]
+
+UNIT = Size(4, KiB)
+
+def _fraction_round(size, unit, rounding):
+    """ Round size to unit as roundTo did before it used only ints. """
+    factor = int(unit)
+    value = int(size) / Fraction(factor)
+    (base, rest) = divmod(value.numerator, value.denominator)
+    if rest == 0 or rounding in (ROUND_DOWN, ROUND_FLOOR):
+        rounded = base
+    elif rounding in (ROUND_UP, ROUND_CEILING):
+        rounded = base + 1
+    else:
+        fraction = Fraction(rest, value.denominator)
+        half = Fraction(1, 2)
+        if fraction < half:
+            rounded = base
+        elif fraction > half:
+            rounded = base + 1
+        elif rounding == ROUND_HALF_UP:
+            rounded = base + 1
+        elif rounding == ROUND_HALF_EVEN:
+            rounded = base + base % 2
+        else:
+            rounded = base
+    return Size(rounded * factor)
+
+def main(number=200):
+    """ Print the time per size for each rounding method and path. """
+    per_size = float(number * len(SIZES)) / 1e6
+    for rounding in ROUNDING_METHODS():
+        current = min(timeit.repeat(
+           lambda: [s.roundTo(UNIT, rounding) for s in SIZES],
+           number=number,
+           repeat=3
+        ))
+        fraction = min(timeit.repeat(
+           lambda: [_fraction_round(s, UNIT, rounding) for s in SIZES],
+           number=number,
+           repeat=3
+        ))
+        print("%s" % rounding)
+        print("   roundTo():   %6.2f usec" % (current / per_size))
+        print("   Fraction:    %6.2f usec (%.1fx)" % \
+           (fraction / per_size, fraction / current))
+
+def bulk(count=100000):
+    """ Print the time per size to round many sizes at once. """
+    magnitudes = [i * 4093 - count for i in range(count)]
+    sizes = [Size(m) for m in magnitudes]
+    per_size = float(count) / 1e6
+    for unit in (Size(4, KiB), Size(4000)):
+        single = min(timeit.repeat(
+           lambda: [s.roundTo(unit, ROUND_HALF_EVEN) for s in sizes],
+           number=1,
+           repeat=3
+        ))
+        many = min(timeit.repeat(
+           lambda: round_to(magnitudes, unit, ROUND_HALF_EVEN),
+           number=1,
+           repeat=3
+        ))
+        print("round_to %s" % unit)
+        print("   roundTo():   %6.3f usec" % (single / per_size))
+        print("   round_to():  %6.3f usec (%.1fx)" % \
+           (many / per_size, single / many))
+
+if __name__ == "__main__":
+    main()
+    if round_to is not None:
+        bulk()
@@ -0,0 +1,86 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark of binary encodings of sizes.
+
+    Compares pickling a list of Sizes with the varint encoding of each
+    Size and, if numpy is available, with the encoding of a SizeArray,
+    in time to encode and decode and in number of bytes. A SizeArray
+    is decoded to a SizeArray, not to a list of Sizes.
+
+    Run as::
+
+        python -m benchmarks.serial
+"""
+from __future__ import print_function
+
+import timeit
+
+from six.moves import cPickle as pickle
+
+from bytesize import KiB
+from bytesize import Size
+
+try:
+    from bytesize import SizeArray
+except ImportError: # numpy is not available
+    SizeArray = None
+
+COUNT = 10000
+
+SIZES = [Size(i * 37, KiB) + Size(i) for i in range(COUNT)]
+
+def _varints(sizes):
+    """ Encode sizes as one varint each. """
+    return [s.to_bytes() for s in sizes]
+
+def main():
+    """ Print the time per size and the size of each encoding. """
+    cases = [
+       ("pickle",
+          lambda: pickle.dumps(SIZES, pickle.HIGHEST_PROTOCOL),
+          pickle.loads,
+          list,
+          len),
+       ("varints",
+          lambda: _varints(SIZES),
+          lambda data: [Size.from_bytes(d) for d in data],
+          list,
+          lambda data: sum(len(d) for d in data))
+    ]
+    if SizeArray is not None:
+        array = SizeArray(SIZES)
+        cases.append(
+           ("SizeArray",
+              array.to_bytes,
+              SizeArray.from_bytes,
+              list,
+              len)
+        )
+
+    for (name, encode, decode, sizes, length) in cases:
+        data = encode()
+        assert sizes(decode(data)) == SIZES
+        encode_time = min(timeit.repeat(encode, number=10, repeat=3)) / 10
+        decode_time = min(
+           timeit.repeat(lambda: decode(data), number=10, repeat=3)
+        ) / 10
+        print("%-10s encode %6.3f usec, decode %6.3f usec, %7d bytes" % \
+           (name, encode_time * 1e6 / COUNT, decode_time * 1e6 / COUNT,
+           length(data)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Statistics for comparing benchmark runs.
+
+    Only what the benchmark suite needs, so that it depends on nothing
+    but the standard library: the mean and variance of a sample, and
+    Welch's t-test of whether two samples have the same mean, which
+    does not assume that they have the same variance.
+"""
+from __future__ import division
+
+import math
+
+def mean(sample):
+    """ The mean of a sample.
+
+        :param sample: the sample, not empty
+        :type sample: a sequence of float
+        :rtype: float
+    """
+    return sum(sample) / len(sample)
+
+def variance(sample):
+    """ The unbiased variance of a sample.
+
+        :param sample: the sample, at least two values
+        :type sample: a sequence of float
+        :rtype: float
+    """
+    center = mean(sample)
+    return sum((x - center) ** 2 for x in sample) / (len(sample) - 1)
+
+def _continued_fraction(a, b, x):
+    """ The continued fraction for the incomplete beta function.
+
+        :param float a: the first parameter
+        :param float b: the second parameter
+        :param float x: the point, in (0, 1)
+        :rtype: float
+
+        Evaluated by the modified Lentz method.
+    """
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1.0)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 300):
+        for numerator in (
+              m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+              -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))
+           ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-15:
+            break
+    return result
+
+def incomplete_beta(a, b, x):
+    """ The regularized incomplete beta function.
+
+        :param float a: the first parameter, positive
+        :param float b: the second parameter, positive
+        :param float x: the point, in [0, 1]
+        :rtype: float
+    """
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + \
+       a * math.log(x) + b * math.log(1.0 - x)
+    # The continued fraction converges quickly only on one side.
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _continued_fraction(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _continued_fraction(b, a, 1.0 - x) / b
+
+def welch(first, second):
+    """ Welch's t-test of whether two samples have the same mean.
+
+        :param first: the first sample, at least two values
+        :type first: a sequence of float
+        :param second: the second sample, at least two values
+        :type second: a sequence of float
+        :returns: the t statistic, the degrees of freedom, and the
+           two-sided p-value
+        :rtype: tuple of float * float * float
+    """
+    first_error = variance(first) / len(first)
+    second_error = variance(second) / len(second)
+    error = first_error + second_error
+    difference = mean(second) - mean(first)
+    if error == 0.0:
+        return (0.0, float("inf"), 1.0 if difference == 0.0 else 0.0)
+
+    t = difference / math.sqrt(error)
+    freedom = error ** 2 / (
+       first_error ** 2 / (len(first) - 1) +
+       second_error ** 2 / (len(second) - 1)
+    )
+    p = incomplete_beta(freedom / 2.0, 0.5, freedom / (freedom + t * t))
+    return (t, freedom, p)
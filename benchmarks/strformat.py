@@ -0,0 +1,105 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark for displaying Sizes.
+
+    Compares str() with the uncompiled path: components() followed
+    by format_magnitude(), on the sizes used in the display tests,
+    and str() on each of a column of sizes with format_many().
+
+    Run as::
+
+        python -m benchmarks.strformat
+"""
+from __future__ import print_function
+
+import timeit
+
+from decimal import Decimal
+
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import MiB
+from bytesize import TiB
+from bytesize import format_magnitude
+from bytesize import format_many
+
+SIZES = [
+   Size(58929971),
+   Size(478360371),
+   Size("12.68", TiB),
+   Size("26.55", MiB),
+   Size('12.687', TiB),
+   Size(0x10000000000000),
+   Size(300, MiB),
+   Size(0xff),
+   Size(16384 - (Decimal(1024)/100 + 1)),
+   Size(1024**9 - 1),
+   Size(1024**10),
+]
+
+def _uncompiled(size, config):
+    """ Format size without a compiled formatter. """
+    (magnitude, units) = size.components(
+       min_value=config.min_value,
+       binary_units=config.binary_units
+    )
+    res = format_magnitude(
+       magnitude,
+       max_places=config.max_places,
+       strip=config.strip
+    )
+    return res + " " + units.abbr + "B"
+
+def main(number=20000):
+    """ Print the time per size for each path. """
+    for config in (StrConfig(), StrConfig(strip=True)):
+        Size.set_str_config(config)
+        compiled = min(timeit.repeat(
+           lambda: [str(s) for s in SIZES],
+           number=number,
+           repeat=3
+        ))
+        uncompiled = min(timeit.repeat(
+           lambda: [_uncompiled(s, config) for s in SIZES],
+           number=number,
+           repeat=3
+        ))
+        per_size = float(number * len(SIZES)) / 1e6
+        print("%s" % config)
+        print("   str():       %6.2f usec" % (compiled / per_size))
+        print("   uncompiled:  %6.2f usec (%.1fx)" % \
+           (uncompiled / per_size, uncompiled / compiled))
+
+def column(count=100000):
+    """ Print the time per size to format a column of sizes. """
+    sizes = [Size(i * 7919 ** 3) for i in range(count)]
+    Size.set_str_config(StrConfig())
+    single = min(timeit.repeat(
+       lambda: [str(s) for s in sizes],
+       number=1,
+       repeat=3
+    ))
+    many = min(timeit.repeat(lambda: format_many(sizes), number=1, repeat=3))
+    per_size = float(count) / 1e6
+    print("column of %d sizes" % count)
+    print("   str():       %6.2f usec" % (single / per_size))
+    print("   format_many: %6.2f usec (%.1fx)" % \
+       (many / per_size, single / many))
+
+if __name__ == "__main__":
+    main()
+    column()
@@ -0,0 +1,308 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Benchmark suite for the hot paths of Size.
+
+    Each benchmark applies one operation to every element of a fixed
+    workload: small ints, ints of several YiB, Decimals, Fractions,
+    strings, and sizes formatted under several StrConfigs. A run times
+    every benchmark repeatedly, and may save the time per operation of
+    every repetition as JSON; two saved runs may be compared, and a
+    benchmark is reported as slower or faster only if the difference
+    in its mean time is both large enough to matter and statistically
+    significant by Welch's t-test.
+
+    Run as::
+
+        python -m benchmarks.suite run --output=new.json
+        python -m benchmarks.suite compare old.json new.json
+
+    compare exits with status 1 if any benchmark is slower.
+
+    The t-test accounts only for variation within each run, so runs to
+    be compared should be made on the same, otherwise idle, machine.
+    By default a change must be at least 10% to be reported.
+"""
+from __future__ import print_function
+
+import argparse
+import fnmatch
+import json
+import platform
+import sys
+import timeit
+
+from decimal import Decimal
+from fractions import Fraction
+
+from bytesize import GiB
+from bytesize import KiB
+from bytesize import MiB
+from bytesize import ROUND_CEILING
+from bytesize import ROUND_DOWN
+from bytesize import ROUND_FLOOR
+from bytesize import ROUND_HALF_DOWN
+from bytesize import ROUND_HALF_EVEN
+from bytesize import ROUND_HALF_UP
+from bytesize import ROUND_UP
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import YiB
+from bytesize import convert_magnitude
+
+from . import stats
+
+FORMAT_VERSION = 1
+
+# WORKLOADS
+SMALL = [(i * 7919) % 1000003 - 500000 for i in range(100)]
+HUGE = [(i + 1) * int(YiB) * 3 + i * 7919 for i in range(100)]
+DECIMALS = [Decimal("%d.%03d" % (i, (i * 37) % 1000)) for i in range(100)]
+FRACTIONS = [Fraction(i * 7919 + 1, i % 9 + 2) for i in range(100)]
+STRINGS = [str(d) for d in DECIMALS]
+
+SMALL_SIZES = [Size(m) for m in SMALL]
+HUGE_SIZES = [Size(m) for m in HUGE]
+MIXED_SIZES = [Size(m, KiB) for m in SMALL[:50]] + HUGE_SIZES[:50]
+
+ROUNDINGS = [
+   ("ceiling", ROUND_CEILING),
+   ("down", ROUND_DOWN),
+   ("floor", ROUND_FLOOR),
+   ("half-down", ROUND_HALF_DOWN),
+   ("half-even", ROUND_HALF_EVEN),
+   ("half-up", ROUND_HALF_UP),
+   ("up", ROUND_UP)
+]
+
+CONFIGS = [
+   ("default", StrConfig()),
+   ("strip", StrConfig(max_places=4, strip=True)),
+   ("exact", StrConfig(max_places=None)),
+   ("si", StrConfig(binary_units=False, min_value=10))
+]
+
+def _benchmarks():
+    """ All benchmarks, in order.
+
+        :returns: pairs of a name and a function of no arguments which
+           performs the operation on every element of its workload,
+           and the number of elements
+        :rtype: list of tuple of str * (function * int)
+    """
+    # pylint: disable=too-many-locals
+    one = Size(4096)
+    huge = Size(5, YiB)
+    benchmarks = [
+       ("init/small-int", lambda: [Size(m) for m in SMALL]),
+       ("init/huge-int", lambda: [Size(m) for m in HUGE]),
+       ("init/int-units", lambda: [Size(m, GiB) for m in SMALL]),
+       ("init/decimal-units", lambda: [Size(d, MiB) for d in DECIMALS]),
+       ("init/fraction-units", lambda: [Size(f, KiB) for f in FRACTIONS]),
+       ("init/str", lambda: [Size(s, KiB) for s in STRINGS]),
+       ("add/small", lambda: [s + one for s in SMALL_SIZES]),
+       ("add/huge", lambda: [s + huge for s in HUGE_SIZES]),
+       ("sub/small", lambda: [s - one for s in SMALL_SIZES]),
+       ("mul/int", lambda: [s * 3 for s in SMALL_SIZES]),
+       ("mul/huge-int", lambda: [s * 3 for s in HUGE_SIZES]),
+       ("mul/decimal", lambda: [s * Decimal("1.5") for s in SMALL_SIZES]),
+       ("mul/fraction",
+          lambda: [s * Fraction(3, 2) for s in SMALL_SIZES]),
+       ("floordiv/int", lambda: [s // 3 for s in SMALL_SIZES]),
+       ("floordiv/size", lambda: [s // one for s in SMALL_SIZES]),
+       ("mod/size", lambda: [s % one for s in SMALL_SIZES]),
+       ("truediv/size", lambda: [s / one for s in SMALL_SIZES]),
+       ("neg", lambda: [-s for s in SMALL_SIZES]),
+       ("abs", lambda: [abs(s) for s in SMALL_SIZES]),
+       ("compare", lambda: [s < one for s in SMALL_SIZES]),
+       ("equal", lambda: [s == one for s in SMALL_SIZES]),
+       ("hash", lambda: [hash(s) for s in SMALL_SIZES]),
+       ("components/small", lambda: [s.components() for s in SMALL_SIZES]),
+       ("components/huge", lambda: [s.components() for s in HUGE_SIZES]),
+       ("components/si",
+          lambda: [s.components(binary_units=False) for s in MIXED_SIZES]),
+       ("convert_magnitude/int",
+          lambda: [convert_magnitude(m) for m in SMALL]),
+       ("convert_magnitude/huge-int",
+          lambda: [convert_magnitude(m) for m in HUGE]),
+       ("convert_magnitude/decimal",
+          lambda: [convert_magnitude(d) for d in DECIMALS]),
+       ("convert_magnitude/fraction",
+          lambda: [convert_magnitude(f) for f in FRACTIONS])
+    ]
+
+    for (name, method) in ROUNDINGS:
+        benchmarks.append((
+           "roundTo/%s" % name,
+           lambda method=method: \
+              [s.roundTo(KiB, method) for s in MIXED_SIZES]
+        ))
+
+    for (name, config) in CONFIGS:
+        formatter = config.formatter
+        benchmarks.append((
+           "str/%s" % name,
+           lambda formatter=formatter: \
+              [formatter(int(s)) for s in MIXED_SIZES]
+        ))
+    benchmarks.append(("str/Size", lambda: [str(s) for s in MIXED_SIZES]))
+
+    return [(name, (func, len(func()))) for (name, func) in benchmarks]
+
+def _time(func, min_time):
+    """ Time calls to func.
+
+        :param func: a function of no arguments
+        :param float min_time: the least time to spend, in seconds
+        :returns: the time per call, in seconds
+        :rtype: float
+
+        Calls func as many times as makes the total time at least
+        min_time, doubling the number of calls until it does.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            return elapsed / number
+        number *= 2
+
+def run(pattern="*", samples=15, min_time=0.01, report=None):
+    """ Run the benchmarks.
+
+        :param str pattern: an fnmatch pattern to select benchmarks
+        :param int samples: the number of times to time each benchmark
+        :param float min_time: the least time for each sample, in seconds
+        :param report: a function to call with each name and sample
+        :returns: the results, ready to save as JSON
+        :rtype: dict
+
+        Each benchmark is timed once in each of samples rounds, after a
+        round which is not recorded, so that a disturbance which lasts
+        for a while slows every benchmark a little rather than one a
+        lot.
+    """
+    selected = [
+       (name, func, count) for (name, (func, count)) in _benchmarks() \
+          if fnmatch.fnmatch(name, pattern)
+    ]
+    results = dict((name, []) for (name, _, _) in selected)
+    for round_number in range(samples + 1):
+        for (name, func, count) in selected:
+            elapsed = _time(func, min_time) / count
+            if round_number > 0:
+                results[name].append(elapsed)
+
+    if report is not None:
+        for (name, _, _) in selected:
+            report(name, results[name])
+    return {
+       "version": FORMAT_VERSION,
+       "python": platform.python_version(),
+       "implementation": platform.python_implementation(),
+       "benchmarks": results
+    }
+
+def compare(base, new, alpha=0.01, threshold=0.1):
+    """ Compare two runs.
+
+        :param dict base: the results of the first run
+        :param dict new: the results of the second run
+        :param float alpha: the significance level
+        :param float threshold: the least relative change which matters
+        :returns: for each benchmark in both runs, its name, the mean
+           times in each run, the relative change, the p-value, and the
+           verdict, "slower", "faster" or ""
+        :rtype: list of tuple
+    """
+    rows = []
+    for name in sorted(set(base["benchmarks"]) & set(new["benchmarks"])):
+        first = base["benchmarks"][name]
+        second = new["benchmarks"][name]
+        (before, after) = (stats.mean(first), stats.mean(second))
+        change = after / before - 1
+        p = stats.welch(first, second)[2]
+        verdict = ""
+        if p < alpha and abs(change) >= threshold:
+            verdict = "slower" if change > 0 else "faster"
+        rows.append((name, before, after, change, p, verdict))
+    return rows
+
+def _print_sample(name, sample):
+    """ Print the mean and spread of a sample. """
+    spread = stats.variance(sample) ** 0.5 if len(sample) > 1 else 0.0
+    print(
+       "%-30s %10.1f ns +- %.1f" % \
+       (name, stats.mean(sample) * 1e9, spread * 1e9)
+    )
+
+def main(args=None):
+    """ Run or compare benchmarks, as the command line directs.
+
+        :param args: the arguments, default is sys.argv[1:]
+        :type args: list of str or NoneType
+        :returns: the exit status
+        :rtype: int
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    commands = parser.add_subparsers(dest="command")
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="file to save results in")
+    run_parser.add_argument(
+       "--pattern",
+       default="*",
+       help="fnmatch pattern to select benchmarks, default is all"
+    )
+    run_parser.add_argument("--samples", type=int, default=15)
+    run_parser.add_argument("--min-time", type=float, default=0.01)
+
+    compare_parser = commands.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("base", help="results of the first run")
+    compare_parser.add_argument("new", help="results of the second run")
+    compare_parser.add_argument("--alpha", type=float, default=0.01)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    namespace = parser.parse_args(args)
+    if namespace.command == "run":
+        results = run(
+           namespace.pattern,
+           namespace.samples,
+           namespace.min_time,
+           _print_sample
+        )
+        if namespace.output is not None:
+            with open(namespace.output, "w") as output:
+                json.dump(results, output, indent=1, sort_keys=True)
+        return 0
+
+    if namespace.command == "compare":
+        with open(namespace.base) as base:
+            base = json.load(base)
+        with open(namespace.new) as new:
+            new = json.load(new)
+        rows = compare(base, new, namespace.alpha, namespace.threshold)
+        for (name, before, after, change, p, verdict) in rows:
+            print("%-30s %10.1f ns %10.1f ns %+7.1f%% p=%.4f %s" % \
+               (name, before * 1e9, after * 1e9, change * 100, p, verdict))
+        return 1 if any(row[-1] == "slower" for row in rows) else 0
+
+    parser.print_usage()
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
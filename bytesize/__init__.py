@@ -46,28 +46,65 @@
 
        - UNITS: :func:`._constants.UNITS`
 
-    * Rounding constants, with meaning as for the Python decimal module:
-       - ROUND_DOWN
-       - ROUND_HALF_DOWN
-       - ROUND_HALF_UP
-       - ROUND_UP
+    * Rounding constants:
+       - ROUND_CEILING: toward positive infinity
+       - ROUND_DOWN: toward negative infinity, same as ROUND_FLOOR
+       - ROUND_FLOOR: toward negative infinity
+       - ROUND_HALF_DOWN: to nearest, ties toward negative infinity
+       - ROUND_HALF_EVEN: to nearest, ties to even
+       - ROUND_HALF_UP: to nearest, ties toward positive infinity
+       - ROUND_UP: toward positive infinity, same as ROUND_CEILING
+
+       Unlike the Python decimal module, ROUND_DOWN and ROUND_UP do
+       not round toward and away from 0; see
+       :func:`._util.round_quotient`.
 
        - ROUNDING_METHODS
 
     * Configuration classes:
        - StrConfig: :class:`._config.StrConfig`
 
+    * Configuration functions:
+       - str_config: :meth:`._size.Size.str_config`
+
     * Exception classes:
        - SizeError: :class:`._errors.SizeError`
 
     * Size classes:
        - Size: :class:`._size.Size`
+       - SizeArray: :class:`._array.SizeArray`, only if numpy is available
+       - SizeAccumulator: :class:`._accumulator.SizeAccumulator`
+       - SizeCounter: :class:`._counter.SizeCounter`
+
+    * Unchecked arithmetic:
+       - FastMath: :class:`._fastmath.FastMath`
+
+    * Parsing functions
+       - parse: :meth:`._size.Size.parse`
+       - parse_many: :meth:`._size.Size.parse_many`
 
     * Formatting functions
        - convert_magnitude: :func:`._util.convert_magnitude`
        - format_magnitude: :func:`._util.format_magnitude`
+       - format_column: :meth:`._size.Size.format_column`
+       - format_many: :meth:`._size.Size.format_many`
        - round_fraction: :func:`._util.round_fraction`
 
+    * Aggregation functions
+       - maximum: :func:`._aggregate.maximum`
+       - mean: :func:`._aggregate.mean`
+       - minimum: :func:`._aggregate.minimum`
+       - total: :func:`._aggregate.total`
+
+    * Rounding functions
+       - round_to: :func:`._array.round_to`, only if numpy is available
+
+    * Instrumentation functions
+       - disable_instrumentation: :func:`._instrument.disable`
+       - enable_instrumentation: :func:`._instrument.enable`
+       - instrumentation_snapshot: :func:`._instrument.snapshot`
+       - reset_instrumentation: :func:`._instrument.reset`
+
     All parts of the public interface of bytesize must be imported directly
     from the top-level bytesize module, as::
 
@@ -110,8 +147,11 @@ from ._constants import UNITS
 
 # ROUNDING CONSTANTS
 from ._constants import RoundingMethods as _RoundingMethods
+ROUND_CEILING = _RoundingMethods.ROUND_CEILING
 ROUND_DOWN = _RoundingMethods.ROUND_DOWN
+ROUND_FLOOR = _RoundingMethods.ROUND_FLOOR
 ROUND_HALF_DOWN = _RoundingMethods.ROUND_HALF_DOWN
+ROUND_HALF_EVEN = _RoundingMethods.ROUND_HALF_EVEN
 ROUND_HALF_UP = _RoundingMethods.ROUND_HALF_UP
 ROUND_UP = _RoundingMethods.ROUND_UP
 
@@ -126,7 +166,80 @@ from ._errors import SizeError
 # SIZE
 from ._size import Size
 
+str_config = Size.str_config
+
+# PARSING
+parse = Size.parse
+parse_many = Size.parse_many
+
 # FORMATTING
 from ._util import convert_magnitude
 from ._util import format_magnitude
+format_column = Size.format_column
+format_many = Size.format_many
 from ._util import round_fraction
+
+# INSTRUMENTATION
+from ._instrument import disable as disable_instrumentation
+from ._instrument import enable as enable_instrumentation
+from ._instrument import reset as reset_instrumentation
+from ._instrument import snapshot as instrumentation_snapshot
+
+# NAMES IMPORTED ON FIRST USE
+# Each is imported from its module the first time it is looked up, so
+# that importing bytesize does not import numpy, or any module only
+# some programs need. SizeArray and round_to require numpy; if numpy is
+# not available, neither is defined.
+import importlib as _importlib
+import sys as _sys
+
+_LAZY_NAMES = {
+   # SIZE
+   "SizeAccumulator": "._accumulator",
+   "SizeArray": "._array",
+   "SizeCounter": "._counter",
+
+   # UNCHECKED ARITHMETIC
+   "FastMath": "._fastmath",
+
+   # ROUNDING
+   "round_to": "._array",
+
+   # AGGREGATION
+   "maximum": "._aggregate",
+   "mean": "._aggregate",
+   "minimum": "._aggregate",
+   "total": "._aggregate"
+}
+
+def _import_lazy(name):
+    """ Import a name in _LAZY_NAMES from its module.
+
+        :param str name: the name
+        :returns: the object named
+        :raises ImportError: if the module can not be imported
+    """
+    module = _importlib.import_module(_LAZY_NAMES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+if _sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _LAZY_NAMES:
+            try:
+                return _import_lazy(name)
+            except ImportError: # numpy is not available
+                pass
+        raise AttributeError(
+           "module %r has no attribute %r" % (__name__, name)
+        )
+
+    def __dir__():
+        return sorted(set(globals()) | set(_LAZY_NAMES))
+else: # module __getattr__ is not supported
+    for _name in _LAZY_NAMES:
+        try:
+            _import_lazy(_name)
+        except ImportError: # numpy is not available
+            pass
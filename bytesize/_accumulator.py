@@ -0,0 +1,92 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" A mutable running total of bytes. """
+
+import six
+
+from ._errors import SizeNonsensicalBinOpError
+from ._errors import SizeValueError
+
+from ._size import Size
+from ._size import from_magnitude
+
+class SizeAccumulator(object):
+    """ A running total of bytes, updated in place.
+
+        Unlike total = total + Size(n), total += n neither constructs
+        a Size nor rebinds total to a new object.
+    """
+
+    __slots__ = ("_magnitude",)
+
+    __hash__ = None
+
+    def __init__(self, start=None):
+        """ Initializer.
+
+            :param start: the initial total, default is Size(0)
+            :type start: :class:`._size.Size`, int, a number of bytes,
+               or NoneType
+            :raises SizeValueError: if start is not a size
+        """
+        if start is None:
+            self._magnitude = 0
+        elif isinstance(start, (Size,) + six.integer_types):
+            self._magnitude = int(start)
+        else:
+            raise SizeValueError(
+               start,
+               "start",
+               "must be a Size or an int number of bytes"
+            )
+
+    def __iadd__(self, other):
+        # pylint: disable=protected-access
+        if isinstance(other, six.integer_types):
+            self._magnitude += other
+        elif isinstance(other, Size):
+            self._magnitude += other._magnitude
+        else:
+            raise SizeNonsensicalBinOpError("iadd", other)
+        return self
+
+    def __isub__(self, other):
+        # pylint: disable=protected-access
+        if isinstance(other, six.integer_types):
+            self._magnitude -= other
+        elif isinstance(other, Size):
+            self._magnitude -= other._magnitude
+        else:
+            raise SizeNonsensicalBinOpError("isub", other)
+        return self
+
+    def __int__(self):
+        return self._magnitude
+
+    def __str__(self):
+        return Size.get_str_config().formatter(self._magnitude)
+
+    def __repr__(self):
+        return "SizeAccumulator(%s)" % repr(from_magnitude(self._magnitude))
+
+    def snapshot(self):
+        """ The total so far.
+
+            :returns: the total
+            :rtype: :class:`._size.Size`
+        """
+        return from_magnitude(self._magnitude)
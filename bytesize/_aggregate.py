@@ -0,0 +1,139 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Aggregation of many sizes in a single pass.
+
+    Each function consumes an iterable, which may be a generator, of
+    items which are Sizes, strings such as "1.5 GiB", or pairs of a
+    value and a unit, such as (3, MiB). Only the magnitudes of the
+    items are accumulated, so memory use does not depend on the number
+    of items and no intermediate Size is constructed.
+"""
+
+# pylint: disable=protected-access
+
+from fractions import Fraction
+
+import six
+
+from ._errors import SizeValueError
+
+from ._parse import parse_magnitude
+
+from ._size import Size
+from ._size import from_magnitude
+
+def _magnitude(item):
+    """ The magnitude of an item.
+
+        :param item: the item
+        :type item: Size, str, or a pair of a value and a unit
+        :returns: the number of bytes
+        :rtype: int
+        :raises SizeValueError: if item is not a size
+    """
+    if isinstance(item, Size):
+        return item._magnitude
+    if isinstance(item, six.string_types):
+        return parse_magnitude(item)
+    if isinstance(item, tuple) and len(item) == 2:
+        return int(Size(item[0], item[1]))
+    raise SizeValueError(
+       item,
+       "item",
+       "must be a Size, a string or a pair of a value and a unit"
+    )
+
+def _empty(function):
+    """ The error for a function which needs at least one item.
+
+        :param str function: the name of the function
+        :rtype: :class:`SizeValueError`
+    """
+    return SizeValueError([], "items", "%s of no sizes" % function)
+
+def total(items):
+    """ The sum of sizes.
+
+        :param items: the sizes
+        :type items: an iterable of Size, str, or pairs of value and unit
+        :returns: the sum, Size(0) if there are no items
+        :rtype: :class:`Size`
+        :raises SizeValueError: if any item is not a size
+    """
+    ret = 0
+    for item in items:
+        if isinstance(item, Size):
+            ret += item._magnitude
+        else:
+            ret += _magnitude(item)
+    return from_magnitude(ret)
+
+def mean(items):
+    """ The arithmetic mean of sizes.
+
+        :param items: the sizes
+        :type items: an iterable of Size, str, or pairs of value and unit
+        :returns: the exact mean number of bytes
+        :rtype: :class:`fractions.Fraction`
+        :raises SizeValueError: if any item is not a size or there are none
+    """
+    (ret, count) = (0, 0)
+    for item in items:
+        if isinstance(item, Size):
+            ret += item._magnitude
+        else:
+            ret += _magnitude(item)
+        count += 1
+    if count == 0:
+        raise _empty("mean")
+    return Fraction(ret, count)
+
+def minimum(items):
+    """ The smallest of sizes.
+
+        :param items: the sizes
+        :type items: an iterable of Size, str, or pairs of value and unit
+        :returns: the smallest size
+        :rtype: :class:`Size`
+        :raises SizeValueError: if any item is not a size or there are none
+    """
+    ret = None
+    for item in items:
+        magnitude = _magnitude(item)
+        if ret is None or magnitude < ret:
+            ret = magnitude
+    if ret is None:
+        raise _empty("minimum")
+    return from_magnitude(ret)
+
+def maximum(items):
+    """ The largest of sizes.
+
+        :param items: the sizes
+        :type items: an iterable of Size, str, or pairs of value and unit
+        :returns: the largest size
+        :rtype: :class:`Size`
+        :raises SizeValueError: if any item is not a size or there are none
+    """
+    ret = None
+    for item in items:
+        magnitude = _magnitude(item)
+        if ret is None or magnitude > ret:
+            ret = magnitude
+    if ret is None:
+        raise _empty("maximum")
+    return from_magnitude(ret)
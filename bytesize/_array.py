@@ -0,0 +1,491 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" SizeArray class, for operating on many Sizes at once.
+
+    A SizeArray stores the magnitudes of its Sizes in a numpy array and
+    implements the same arithmetic operations as Size, applying each
+    operation to every element at once. The types of operands and
+    results follow the rules for the corresponding Size operation.
+    Wherever a Size is a permissible operand, a SizeArray of the same
+    length is permissible as well.
+
+    Magnitudes are stored in int64 while they fit, and arithmetic is
+    checked for overflow, as described in :mod:`._bulk`.
+
+    Requires numpy.
+"""
+
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy
+import six
+
+from . import _bulk
+
+from ._constants import B
+
+from ._errors import SizeNonsensicalBinOpError
+from ._errors import SizePowerResultError
+from ._errors import SizeValueError
+
+from ._serial import HEADER
+from ._serial import decode_header
+from ._serial import decode_varints
+from ._serial import encode_header
+from ._serial import encode_varints
+
+from ._size import Size
+from ._size import from_magnitude
+
+def _magnitudes_of(other):
+    """ The magnitudes of other, if other is a Size or a SizeArray.
+
+        :param object other: any object
+        :returns: the magnitudes, or None if other is neither
+        :rtype: int or :class:`numpy.ndarray` or NoneType
+    """
+    # pylint: disable=protected-access
+    if isinstance(other, SizeArray):
+        return other._magnitudes
+    if isinstance(other, Size):
+        return other._magnitude
+    return None
+
+def from_magnitudes(magnitudes):
+    """ Construct a SizeArray directly from an array of magnitudes.
+
+        :param magnitudes: the numbers of bytes
+        :type magnitudes: :class:`numpy.ndarray` of int64 or object
+        :returns: a SizeArray with the given magnitudes
+        :rtype: :class:`SizeArray`
+
+        Skips all the validation done by :meth:`SizeArray.__init__`.
+    """
+    # pylint: disable=protected-access
+    array = object.__new__(SizeArray)
+    array._magnitudes = magnitudes
+    return array
+
+def round_to(magnitudes, unit, rounding):
+    # pylint: disable=line-too-long
+    """ Round many magnitudes to a unit.
+
+        :param magnitudes: the numbers of bytes
+        :type magnitudes: a numpy integer array or a sequence of int
+        :param unit: a unit specifier
+        :type unit: any non-negative :class:`Size` or element in :func:`._constants.UNITS`
+        :param rounding: rounding mode to use
+        :type rounding: a field of :class:`._constants.RoundingMethods`
+        :returns: the rounded magnitudes
+        :rtype: :class:`numpy.ndarray` of int64, or of object if necessary
+        :raises SizeValueError: on unusable arguments
+
+        Each magnitude is rounded as by :meth:`._size.Size.roundTo`,
+        but all are rounded at once.
+    """
+    factor = int(unit)
+    if factor < 0:
+        raise SizeValueError(factor, "factor")
+
+    if isinstance(magnitudes, numpy.ndarray) and magnitudes.dtype.kind in "iu":
+        magnitudes = _bulk.from_integers(magnitudes, 1)
+    else:
+        magnitudes = _bulk.pack(magnitudes)
+
+    if factor == 0:
+        return numpy.zeros(len(magnitudes), dtype=numpy.int64)
+    return _bulk.round_to(magnitudes, factor, rounding)
+
+class SizeArray(object):
+    """ Class for instantiating arrays of Size objects. """
+
+    __slots__ = ("_magnitudes",)
+
+    __hash__ = None
+
+    # Size leaves binary operations with a SizeArray to the SizeArray.
+    _SIZE_ARRAY = True
+
+    _NUMERIC_TYPES = (six.integer_types, Decimal, Fraction)
+
+    def __init__(self, values=(), units=None):
+        """ Initialize a new SizeArray object.
+
+            :param values: size values, default is empty
+            :type values: SizeArray, an iterable of Size or of numeric
+               values (possibly as str), or a numpy integer array
+            :param units: the units of the sizes, default is None
+            :type units: any of the publicly defined units constants
+            :raises SizeValueError: on bad parameters
+
+            Each element is interpreted exactly as Size would interpret
+            it, so the meaning of units and the rounding of fractional
+            quantities are the same as for Size.
+        """
+        if isinstance(values, SizeArray):
+            if units is not None:
+                raise SizeValueError(
+                   units,
+                   "units",
+                   "meaningless when SizeArray value is passed"
+                )
+            self._magnitudes = values._magnitudes.copy()
+            return
+
+        if isinstance(values, numpy.ndarray) and values.dtype.kind in "iu":
+            self._magnitudes = _bulk.from_integers(values, int(units or B))
+            return
+
+        self._magnitudes = _bulk.pack(
+           [int(Size(value, units)) for value in values]
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """ Decode sizes encoded by :meth:`to_bytes`.
+
+            :param data: the encoding, every byte of which is used
+            :type data: bytes or any object supporting the buffer protocol
+            :returns: the sizes
+            :rtype: :class:`SizeArray`
+            :raises SizeValueError: if data is not an encoding of sizes
+
+            Unless the sizes are wide, the result shares memory with
+            data, which must not be changed while the result is in use.
+        """
+        (count, wide) = decode_header(data)
+        if wide:
+            (magnitudes, end) = decode_varints(data, HEADER.size, count)
+            if end != len(data):
+                raise SizeValueError(end, "data", "bytes follow the sizes")
+            return from_magnitudes(_bulk.pack(magnitudes))
+
+        if len(data) != HEADER.size + 8 * count:
+            raise SizeValueError(
+               len(data),
+               "data",
+               "length is not that of %s sizes" % count
+            )
+        magnitudes = numpy.frombuffer(
+           data,
+           dtype="<i8",
+           count=count,
+           offset=HEADER.size
+        )
+        return from_magnitudes(magnitudes.astype(numpy.int64, copy=False))
+
+    @property
+    def magnitudes(self):
+        """ The numbers of bytes, as a read-only numpy array. """
+        view = self._magnitudes.view()
+        view.flags.writeable = False
+        return view
+
+    def __len__(self):
+        return len(self._magnitudes)
+
+    def __getitem__(self, index):
+        result = self._magnitudes[index]
+        if isinstance(result, numpy.ndarray):
+            return from_magnitudes(result)
+        return from_magnitude(int(result))
+
+    def __iter__(self):
+        for magnitude in self._magnitudes:
+            yield from_magnitude(int(magnitude))
+
+    def __str__(self):
+        return "[%s]" % ", ".join(str(s) for s in self)
+
+    def __repr__(self):
+        return "SizeArray(%s)" % [int(m) for m in self._magnitudes]
+
+    def __deepcopy__(self, memo):
+        # pylint: disable=unused-argument
+        return from_magnitudes(self._magnitudes.copy())
+
+    # UNARY OPERATIONS
+
+    def __abs__(self):
+        return from_magnitudes(_bulk.absolute(self._magnitudes))
+
+    def __neg__(self):
+        return from_magnitudes(_bulk.negative(self._magnitudes))
+
+    def __pos__(self):
+        return from_magnitudes(self._magnitudes.copy())
+
+    # BINARY OPERATIONS
+
+    def _elementwise(self, method, other):
+        """ Apply a Size method to every element, for uncommon operands.
+
+            :param str method: the name of the Size method
+            :param object other: the other operand
+            :returns: the magnitudes of the results
+            :rtype: :class:`numpy.ndarray`
+        """
+        return _bulk.pack(
+           [int(getattr(s, method)(other)) for s in self]
+        )
+
+    def __add__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("+", other)
+        return from_magnitudes(_bulk.add(self._magnitudes, magnitudes))
+    __radd__ = __add__
+
+    def __divmod__(self, other):
+        if isinstance(other, six.integer_types):
+            # Size divmod of an int rounds toward negative infinity,
+            # unlike Size floordiv of an int.
+            other = int(other)
+            return (
+               from_magnitudes(_bulk.floor_divide(self._magnitudes, other)),
+               from_magnitudes(_bulk.modulo(self._magnitudes, other))
+            )
+        if isinstance(other, self._NUMERIC_TYPES):
+            # Follows Size, which defines divmod, but not //, for a
+            # Fraction.
+            pairs = [divmod(s, other) for s in self]
+            return (
+               from_magnitudes(_bulk.pack([int(q) for (q, _) in pairs])),
+               from_magnitudes(_bulk.pack([int(r) for (_, r) in pairs]))
+            )
+        return (self // other, self % other)
+
+    def __rdivmod__(self, other):
+        if _magnitudes_of(other) is None:
+            raise SizeNonsensicalBinOpError("rdivmod", other)
+        return (self.__rfloordiv__(other), self.__rmod__(other))
+
+    def __eq__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            return numpy.zeros(len(self), dtype=bool)
+        (left, right) = _bulk.align(self._magnitudes, magnitudes)
+        return left == right
+
+    def __floordiv__(self, other):
+        # Follows Size: if T(other) is Size, the result is an array of ints,
+        # if T(other) is numeric, the result is a SizeArray.
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is not None:
+            return _bulk.floor_divide(self._magnitudes, magnitudes)
+        if isinstance(other, six.integer_types):
+            # Size floordiv of a numeric type rounds toward 0.
+            return from_magnitudes(
+               _bulk.truncate_divide(self._magnitudes, int(other))
+            )
+        if isinstance(other, self._NUMERIC_TYPES):
+            return from_magnitudes(self._elementwise("__floordiv__", other))
+        raise SizeNonsensicalBinOpError("floordiv", other)
+
+    def __rfloordiv__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("rfloordiv", other)
+        return _bulk.floor_divide(magnitudes, self._magnitudes)
+
+    def _compare(self, operator, other):
+        """ Fetch the aligned operands for a comparison.
+
+            :param str operator: the comparison operator
+            :param object other: the other operand
+            :returns: a pair of operands
+            :rtype: tuple
+            :raises SizeNonsensicalBinOpError: if other is not a Size
+        """
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError(operator, other)
+        return _bulk.align(self._magnitudes, magnitudes)
+
+    def __ge__(self, other):
+        (left, right) = self._compare(">=", other)
+        return left >= right
+
+    def __gt__(self, other):
+        (left, right) = self._compare(">", other)
+        return left > right
+
+    def __le__(self, other):
+        (left, right) = self._compare("<=", other)
+        return left <= right
+
+    def __lt__(self, other):
+        (left, right) = self._compare("<", other)
+        return left < right
+
+    def __mod__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None and isinstance(other, six.integer_types):
+            magnitudes = other
+        if magnitudes is not None:
+            return from_magnitudes(_bulk.modulo(self._magnitudes, magnitudes))
+        if isinstance(other, self._NUMERIC_TYPES):
+            return from_magnitudes(self._elementwise("__mod__", other))
+        raise SizeNonsensicalBinOpError("%", other)
+
+    def __rmod__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("rmod", other)
+        return from_magnitudes(_bulk.modulo(magnitudes, self._magnitudes))
+
+    def __mul__(self, other):
+        if isinstance(other, six.integer_types):
+            return from_magnitudes(
+               _bulk.multiply(self._magnitudes, int(other))
+            )
+        if isinstance(other, self._NUMERIC_TYPES):
+            return from_magnitudes(self._elementwise("__mul__", other))
+        if _magnitudes_of(other) is not None:
+            raise SizePowerResultError()
+        raise SizeNonsensicalBinOpError("*", other)
+    __rmul__ = __mul__
+
+    def __pow__(self, other):
+        if not isinstance(other, self._NUMERIC_TYPES):
+            raise SizeNonsensicalBinOpError("**", other)
+        raise SizePowerResultError()
+
+    def __rpow__(self, other):
+        raise SizeNonsensicalBinOpError("rpow", other)
+
+    def __ne__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            return numpy.ones(len(self), dtype=bool)
+        (left, right) = _bulk.align(self._magnitudes, magnitudes)
+        return left != right
+
+    def __sub__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("-", other)
+        return from_magnitudes(_bulk.subtract(self._magnitudes, magnitudes))
+
+    def __rsub__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("rsub", other)
+        return from_magnitudes(_bulk.subtract(magnitudes, self._magnitudes))
+
+    def __truediv__(self, other):
+        # The result is an array of Fractions, as for Size.
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("truediv", other)
+        _bulk.check_divisor(magnitudes)
+        return numpy.vectorize(Fraction, otypes=[object])(
+           _bulk.widen(self._magnitudes),
+           _bulk.widen(magnitudes)
+        )
+
+    __div__ = __truediv__
+
+    def __rtruediv__(self, other):
+        magnitudes = _magnitudes_of(other)
+        if magnitudes is None:
+            raise SizeNonsensicalBinOpError("rtruediv", other)
+        _bulk.check_divisor(self._magnitudes)
+        return numpy.vectorize(Fraction, otypes=[object])(
+           _bulk.widen(magnitudes),
+           _bulk.widen(self._magnitudes)
+        )
+
+    __rdiv__ = __rtruediv__
+
+    def convertTo(self, spec=None):
+        """ Return the sizes in the units indicated by the specifier.
+
+            :param spec: a units specifier
+            :type spec: a units specifier or :class:`Size`
+            :returns: numeric values in the units indicated by the specifier
+            :rtype: :class:`numpy.ndarray` of :class:`fractions.Fraction`
+            :raises SizeValueError: if unit specifier is non-positive
+        """
+        spec = B if spec is None else spec
+        factor = int(spec)
+
+        if factor <= 0:
+            raise SizeValueError(
+               factor,
+               "factor",
+               "can not convert to non-positive unit %s"
+            )
+
+        return numpy.vectorize(Fraction, otypes=[object])(
+           _bulk.widen(self._magnitudes),
+           factor
+        )
+
+    def to_buffers(self):
+        """ Encode the sizes as a header and a buffer of magnitudes.
+
+            :returns: the header and a read-only view of the magnitudes
+            :rtype: tuple of bytes * memoryview
+
+            Unless the sizes are wide, the view shares memory with the
+            array, if it is contiguous and little-endian, so the two
+            parts can be written out, e.g., by writelines() or
+            sendmsg(), without copying the magnitudes. See
+            :mod:`._serial` for the format.
+        """
+        magnitudes = self._magnitudes
+        if magnitudes.dtype == object:
+            payload = numpy.frombuffer(
+               encode_varints(magnitudes),
+               dtype=numpy.uint8
+            )
+        else:
+            payload = numpy.ascontiguousarray(magnitudes, dtype="<i8") \
+               .view(numpy.uint8)
+        payload.flags.writeable = False
+        wide = magnitudes.dtype == object
+        return (encode_header(len(magnitudes), wide), memoryview(payload))
+
+    def to_bytes(self):
+        """ Encode the sizes.
+
+            :returns: the encoding
+            :rtype: bytes
+
+            The result is the concatenation of the parts returned by
+            :meth:`to_buffers`.
+        """
+        (header, payload) = self.to_buffers()
+        return header + payload.tobytes()
+
+    def roundTo(self, unit, rounding):
+        # pylint: disable=line-too-long
+        """ Rounds each size to unit specified as a named constant or a Size.
+
+            :param unit: a unit specifier
+            :type unit: any non-negative :class:`Size` or element in :func:`._constants.UNITS`
+            :keyword rounding: rounding mode to use
+            :type rounding: a field of :class:`._constants.RoundingMethods`
+            :returns: appropriately rounded sizes
+            :rtype: :class:`SizeArray`
+            :raises SizeValueError: on unusable arguments
+
+            Each element is rounded as by :meth:`._size.Size.roundTo`.
+        """
+        return from_magnitudes(round_to(self._magnitudes, unit, rounding))
@@ -0,0 +1,392 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Overflow-checked arithmetic on arrays of magnitudes.
+
+    Magnitudes are stored in numpy int64 arrays while they fit. When
+    they do not, they are stored in numpy object arrays of Python ints,
+    the wide representation, which is exact but much slower.
+
+    Every function here accepts operands in either representation, or
+    Python ints, and returns the result in the int64 representation if
+    it fits, otherwise in the wide representation. Arithmetic on int64
+    operands is done in int64; if any element of the result overflows,
+    the operation is repeated on the wide representation, so results
+    are always exact, as they are for Size.
+
+    Division by zero raises ZeroDivisionError, as for Python ints.
+
+    Requires numpy.
+"""
+
+import numpy
+
+from ._constants import RoundingMethods
+
+from ._errors import SizeValueError
+
+INT64 = numpy.iinfo(numpy.int64)
+
+def fits(value):
+    """ Whether an integer fits in an int64.
+
+        :param int value: the value
+        :rtype: bool
+    """
+    return INT64.min <= value <= INT64.max
+
+def is_wide(magnitudes):
+    """ Whether magnitudes are in the wide representation.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: int or :class:`numpy.ndarray`
+        :rtype: bool
+    """
+    if isinstance(magnitudes, numpy.ndarray):
+        return magnitudes.dtype == object
+    return not fits(magnitudes)
+
+def pack(magnitudes):
+    """ Pack a sequence of integer magnitudes into a numpy array.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: a sequence of int
+        :returns: the magnitudes in the narrowest representation
+        :rtype: :class:`numpy.ndarray`
+    """
+    try:
+        return numpy.array(magnitudes, dtype=numpy.int64)
+    except OverflowError:
+        return numpy.array(magnitudes, dtype=object)
+
+def narrow(magnitudes):
+    """ Convert magnitudes to the int64 representation if they fit.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray`
+        :returns: the magnitudes in the narrowest representation
+        :rtype: :class:`numpy.ndarray`
+    """
+    if magnitudes.dtype != object:
+        return magnitudes
+    try:
+        return magnitudes.astype(numpy.int64)
+    except OverflowError:
+        return magnitudes
+
+def widen(magnitudes):
+    """ Convert magnitudes to the wide representation.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: int or :class:`numpy.ndarray`
+        :returns: the magnitudes, as an int or an object array of int
+        :rtype: int or :class:`numpy.ndarray`
+    """
+    if isinstance(magnitudes, numpy.ndarray) and magnitudes.dtype != object:
+        return magnitudes.astype(object)
+    return magnitudes
+
+def align(left, right):
+    """ Convert two operands to the same representation.
+
+        :param left: the left operand
+        :type left: int or :class:`numpy.ndarray`
+        :param right: the right operand
+        :type right: int or :class:`numpy.ndarray`
+        :returns: the operands, both wide if either is
+        :rtype: tuple
+    """
+    if is_wide(left) or is_wide(right):
+        return (widen(left), widen(right))
+    return (left, right)
+
+def from_integers(values, factor):
+    """ Convert a numpy integer array of units to magnitudes.
+
+        :param values: numbers of units
+        :type values: :class:`numpy.ndarray` of any integer type
+        :param int factor: the number of bytes in a unit
+        :returns: the magnitudes
+        :rtype: :class:`numpy.ndarray`
+    """
+    if values.dtype == numpy.uint64 and len(values) != 0 and \
+       int(values.max()) > INT64.max:
+        return narrow(values.astype(object) * factor)
+    return multiply(values.astype(numpy.int64), factor)
+
+def check_divisor(divisor):
+    """ Raise ZeroDivisionError if any divisor is 0.
+
+        :param divisor: the divisor or divisors
+        :type divisor: int or :class:`numpy.ndarray`
+        :raises ZeroDivisionError: if any divisor is 0
+
+        numpy only warns on integer division by 0.
+    """
+    if numpy.any(numpy.asarray(divisor) == 0):
+        raise ZeroDivisionError("integer division or modulo by zero")
+
+def add(left, right):
+    """ Add magnitudes.
+
+        :param left: the left operand
+        :type left: :class:`numpy.ndarray`
+        :param right: the right operand
+        :type right: int or :class:`numpy.ndarray`
+        :returns: the sums
+        :rtype: :class:`numpy.ndarray`
+    """
+    (left, right) = align(left, right)
+    if left.dtype != object:
+        result = left + right
+        # Overflow iff both operands differ in sign from the result.
+        if not numpy.any(((left ^ result) & (right ^ result)) < 0):
+            return result
+    return narrow(widen(left) + widen(right))
+
+def subtract(left, right):
+    """ Subtract magnitudes.
+
+        :param left: the left operand
+        :type left: int or :class:`numpy.ndarray`
+        :param right: the right operand
+        :type right: int or :class:`numpy.ndarray`
+        :returns: the differences
+        :rtype: :class:`numpy.ndarray`
+
+        At least one of the operands must be an array.
+    """
+    (left, right) = align(left, right)
+    # Widening an int operand leaves it an int, so check both.
+    if not is_wide(left) and not is_wide(right):
+        result = numpy.subtract(left, right)
+        # Overflow iff the operands differ in sign and the result
+        # differs in sign from left.
+        if not numpy.any(((left ^ right) & (left ^ result)) < 0):
+            return result
+    return narrow(numpy.subtract(widen(left), widen(right)))
+
+def multiply(left, factor):
+    """ Multiply magnitudes by an integer.
+
+        :param left: the magnitudes
+        :type left: :class:`numpy.ndarray`
+        :param int factor: the multiplier
+        :returns: the products
+        :rtype: :class:`numpy.ndarray`
+    """
+    (left, factor) = align(left, factor)
+    if left.dtype != object:
+        result = left * factor
+        if factor == 0 or bound(left) <= INT64.max // abs(factor):
+            return result
+        if factor == -1:
+            overflow = numpy.any(left == INT64.min)
+        else:
+            overflow = numpy.any(result // factor != left)
+        if not overflow:
+            return result
+    return narrow(widen(left) * factor)
+
+def floor_divide(left, right):
+    """ Divide magnitudes, rounding toward negative infinity.
+
+        :param left: the dividends
+        :type left: int or :class:`numpy.ndarray`
+        :param right: the divisors
+        :type right: int or :class:`numpy.ndarray`
+        :returns: the quotients
+        :rtype: :class:`numpy.ndarray`
+        :raises ZeroDivisionError: if any divisor is 0
+
+        At least one of the operands must be an array.
+    """
+    check_divisor(right)
+    (left, right) = align(left, right)
+    if is_wide(left) or \
+       numpy.any((numpy.asarray(left) == INT64.min) & \
+                 (numpy.asarray(right) == -1)):
+        return narrow(numpy.floor_divide(widen(left), widen(right)))
+    return numpy.floor_divide(left, right)
+
+def truncate_divide(left, divisor):
+    """ Divide magnitudes by an integer, rounding toward 0.
+
+        :param left: the dividends
+        :type left: :class:`numpy.ndarray`
+        :param int divisor: the divisor
+        :returns: the quotients
+        :rtype: :class:`numpy.ndarray`
+        :raises ZeroDivisionError: if the divisor is 0
+    """
+    quotient = floor_divide(left, divisor)
+    (left, divisor) = align(left, divisor)
+    inexact = (left % divisor != 0) & ((left < 0) != (divisor < 0))
+    return add(quotient, inexact.astype(numpy.int64))
+
+def modulo(left, right):
+    """ Compute the remainders of floor division of magnitudes.
+
+        :param left: the dividends
+        :type left: int or :class:`numpy.ndarray`
+        :param right: the divisors
+        :type right: int or :class:`numpy.ndarray`
+        :returns: the remainders, with the sign of the divisors
+        :rtype: :class:`numpy.ndarray`
+        :raises ZeroDivisionError: if any divisor is 0
+
+        At least one of the operands must be an array.
+    """
+    check_divisor(right)
+    (left, right) = align(left, right)
+    if is_wide(left):
+        return narrow(numpy.remainder(left, right))
+    return numpy.remainder(left, right)
+
+def negative(magnitudes):
+    """ Negate magnitudes.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray`
+        :returns: the negated magnitudes
+        :rtype: :class:`numpy.ndarray`
+    """
+    if magnitudes.dtype == object or numpy.any(magnitudes == INT64.min):
+        return narrow(-widen(magnitudes))
+    return -magnitudes
+
+def absolute(magnitudes):
+    """ Take the absolute values of magnitudes.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray`
+        :returns: the absolute values
+        :rtype: :class:`numpy.ndarray`
+    """
+    if magnitudes.dtype == object or numpy.any(magnitudes == INT64.min):
+        return narrow(abs(widen(magnitudes)))
+    return abs(magnitudes)
+
+def bound(magnitudes):
+    """ The largest absolute value among magnitudes.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray`
+        :returns: the largest absolute value, 0 if there are none
+        :rtype: int
+    """
+    if len(magnitudes) == 0:
+        return 0
+    return max(-int(magnitudes.min()), int(magnitudes.max()))
+
+# Factors must be less than this for quantize's long division to fit in
+# int64; places must be at most MAX_PLACES.
+_MAX_FACTOR = 2 ** 59
+MAX_PLACES = 18
+_POWERS_OF_TEN = numpy.array(
+   [10 ** i for i in range(MAX_PLACES + 1)],
+   dtype=numpy.int64
+)
+
+def quantize(magnitudes, factors, places, prec):
+    """ Divide magnitudes by factors to a fixed number of decimal places.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray` of int64
+        :param factors: the divisors, all positive
+        :type factors: :class:`numpy.ndarray` of int64
+        :param int places: the number of decimal places, at most MAX_PLACES
+        :param int prec: the precision of the division
+        :returns: whole parts, fractional parts and a mask of valid results
+        :rtype: tuple of :class:`numpy.ndarray`
+
+        The absolute value of each quotient, divided as by the decimal
+        module with precision prec and then quantized to places places,
+        is whole + fraction / 10**places. The results are not computed
+        where the mask is False; the caller must compute them otherwise.
+        That is so for factors of 2**59 or more, for INT64.min, and for
+        quotients so close to halfway between two results that the
+        rounding to prec digits might decide which is chosen.
+    """
+    valid = (magnitudes != INT64.min) & (factors < _MAX_FACTOR)
+    factors = numpy.where(valid, factors, 1)
+    (whole, rest) = \
+       numpy.divmod(abs(numpy.where(valid, magnitudes, 0)), factors)
+
+    # Long division, one digit at a time, so that rest * 10 fits.
+    fraction = numpy.zeros_like(whole)
+    for _ in range(places):
+        (digit, rest) = numpy.divmod(rest * 10, factors)
+        fraction = fraction * 10 + digit
+
+    # As for _util.round_ratio, with the number of digits of the scaled
+    # quotient bounded by the number of digits of whole plus places.
+    digits = numpy.searchsorted(_POWERS_OF_TEN, whole, side="right") + places
+    slack = numpy.clip(prec - digits, 0, MAX_PLACES)
+    distance = abs(2 * rest - factors)
+    valid &= (digits < prec) & (distance > factors // _POWERS_OF_TEN[slack])
+
+    fraction += 2 * rest > factors
+    carry = fraction == 10 ** places
+    return (whole + carry, numpy.where(carry, 0, fraction), valid)
+
+def round_to(magnitudes, factor, rounding):
+    """ Round magnitudes to multiples of a factor.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: :class:`numpy.ndarray`
+        :param int factor: the factor, positive
+        :param rounding: rounding method
+        :type rounding: a member of RoundingMethods
+        :returns: the rounded magnitudes
+        :rtype: :class:`numpy.ndarray`
+        :raises SizeValueError: if rounding is not a rounding method
+
+        Each magnitude is rounded as by _util.round_quotient, then
+        multiplied by factor. If factor is a power of two the quotient
+        and remainder are found with bit masks.
+    """
+    if is_wide(magnitudes) or not fits(factor):
+        magnitudes = widen(magnitudes)
+        (quotients, rests) = (magnitudes // factor, magnitudes % factor)
+        odd = quotients % 2 == 1
+    elif factor & (factor - 1) == 0:
+        quotients = magnitudes >> (factor.bit_length() - 1)
+        rests = magnitudes & (factor - 1)
+        odd = magnitudes & factor != 0
+    else:
+        (quotients, rests) = numpy.divmod(magnitudes, factor)
+        odd = quotients % 2 == 1
+
+    # 2 * rests may overflow, so compare rests with factor - rests.
+    if rounding is RoundingMethods.ROUND_DOWN or \
+       rounding is RoundingMethods.ROUND_FLOOR:
+        up = None
+    elif rounding is RoundingMethods.ROUND_UP or \
+       rounding is RoundingMethods.ROUND_CEILING:
+        up = rests != 0
+    elif rounding is RoundingMethods.ROUND_HALF_UP:
+        up = rests >= factor - rests
+    elif rounding is RoundingMethods.ROUND_HALF_DOWN:
+        up = rests > factor - rests
+    elif rounding is RoundingMethods.ROUND_HALF_EVEN:
+        up = (rests > factor - rests) | ((rests == factor - rests) & odd)
+    else:
+        raise SizeValueError(rounding, "rounding")
+
+    if up is not None:
+        quotients = add(quotients, up.astype(numpy.int64))
+    return multiply(quotients, factor)
@@ -0,0 +1,104 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" A bounded cache of rendered sizes. """
+
+from collections import namedtuple
+from collections import OrderedDict
+from threading import Lock
+
+import six
+
+from ._errors import SizeValueError
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+""" Statistics for a RenderCache, as for functools.lru_cache. """
+
+class RenderCache(object):
+    """ A least recently used cache of sizes rendered as strings.
+
+        Entries are keyed on a magnitude and a StrConfig, so a cache
+        may be shared by many configurations; configurations are
+        compared by identity. The cache is safe to use from many
+        threads; the rendering itself is done outside the lock.
+    """
+
+    __slots__ = ("_entries", "_hits", "_lock", "_maxsize", "_misses")
+
+    def __init__(self, maxsize=128):
+        """ Initializer.
+
+            :param int maxsize: the largest number of entries, positive
+            :raises SizeValueError: if maxsize is not a positive integer
+        """
+        if not isinstance(maxsize, six.integer_types) or maxsize <= 0:
+            raise SizeValueError(
+               maxsize,
+               "maxsize",
+               "must be a positive integer"
+            )
+        self._maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def render(self, magnitude, config):
+        """ Render a magnitude according to a configuration.
+
+            :param int magnitude: the number of bytes
+            :param :class:`._config.StrConfig` config: the configuration
+            :returns: the rendered size
+            :rtype: str
+        """
+        key = (magnitude, config)
+        with self._lock:
+            try:
+                ret = self._entries.pop(key)
+            except KeyError:
+                self._misses += 1
+            else:
+                self._entries[key] = ret
+                self._hits += 1
+                return ret
+
+        ret = config.formatter(magnitude)
+        with self._lock:
+            self._entries[key] = ret
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return ret
+
+    def info(self):
+        """ Statistics for this cache.
+
+            :returns: the numbers of hits and misses, and the sizes
+            :rtype: :class:`CacheInfo`
+        """
+        with self._lock:
+            return CacheInfo(
+               self._hits,
+               self._misses,
+               self._maxsize,
+               len(self._entries)
+            )
+
+    def clear(self):
+        """ Remove all entries and reset the statistics. """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
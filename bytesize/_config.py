@@ -18,6 +18,15 @@
 
 """ Configuration of the bytesize package. """
 
+from threading import local
+
+from ._format import StrFormatter
+
+try:
+    from contextvars import ContextVar
+except ImportError: # Python < 3.7
+    ContextVar = None
+
 class StrConfig(object):
     """ Configuration for __str__ method.
 
@@ -48,6 +57,9 @@ class StrConfig(object):
        "strip=%(strip)s"
     ])
 
+    # A StrConfig unpickled from before there was a formatter has none.
+    _formatter = None
+
     def __init__(
        self,
        max_places=2,
@@ -68,6 +80,7 @@ class StrConfig(object):
         self._strip = strip
         self._min_value = min_value
         self._binary_units = binary_units
+        self._formatter = None
 
     def __str__(self):
         values = {
@@ -79,15 +92,78 @@ class StrConfig(object):
         return "StrConfig(%s)" % (self._FMT_STR % values)
     __repr__ = __str__
 
+    def __getstate__(self):
+        # The formatter is rebuilt when next requested.
+        state = self.__dict__.copy()
+        state.pop("_formatter", None)
+        return state
+
     # pylint: disable=protected-access
     max_places = property(lambda s: s._max_places)
     min_value = property(lambda s: s._min_value)
     strip = property(lambda s: s._strip)
     binary_units = property(lambda s: s._binary_units)
 
+    @property
+    def formatter(self):
+        """ The formatter for this configuration.
+
+            :returns: a callable which formats a Size, or a number of bytes
+            :rtype: :class:`._format.StrFormatter`
+            :raises SizeValueError: if the configuration is not usable
+
+            The formatter is constructed the first time it is requested.
+        """
+        if self._formatter is None:
+            self._formatter = StrFormatter(self)
+        return self._formatter
+
 class Defaults(object):
     """ Configuration defaults. """
     # pylint: disable=too-few-public-methods
 
     STR_CONFIG = StrConfig(2, False, 1, True)
     """ Default configuration for string display. """
+
+class _ThreadLocalVar(object):
+    """ A stand-in for a ContextVar, with a value for each thread. """
+
+    def __init__(self, default=None):
+        """ Initializer.
+
+            :param default: the value in a thread where none is set
+        """
+        self._local = local()
+        self._default = default
+
+    def get(self):
+        """ Get the value for the current thread. """
+        return getattr(self._local, "value", self._default)
+
+    def set(self, value):
+        """ Set the value for the current thread.
+
+            :param value: the new value
+            :returns: a token for reset, the previous value
+        """
+        token = self.get()
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        """ Restore the value which was replaced by a call to set.
+
+            :param token: the token returned by set
+        """
+        self._local.value = token
+
+if ContextVar is not None:
+    SCOPED_STR_CONFIG = ContextVar("bytesize_str_config", default=None)
+else:
+    SCOPED_STR_CONFIG = _ThreadLocalVar()
+""" The configuration for string display in the current context, if any.
+
+    Each thread and each asyncio task has its own value; where it is
+    None, the configuration set with Size.set_str_config is in effect.
+    Only thread-local where contextvars is not available.
+"""
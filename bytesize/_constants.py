@@ -49,8 +49,19 @@ class RoundingMethods(object):
     ROUND_HALF_DOWN = _RoundingMethod("Round to nearest, down on a tie.")
     ROUND_HALF_UP = _RoundingMethod("Round to nearest, up on a tie.")
     ROUND_UP = _RoundingMethod("Round up.")
-
-    _METHODS = [ROUND_DOWN, ROUND_HALF_DOWN, ROUND_HALF_UP, ROUND_UP]
+    ROUND_HALF_EVEN = _RoundingMethod("Round to nearest, even on a tie.")
+    ROUND_CEILING = _RoundingMethod("Round toward positive infinity.")
+    ROUND_FLOOR = _RoundingMethod("Round toward negative infinity.")
+
+    _METHODS = [
+       ROUND_DOWN,
+       ROUND_HALF_DOWN,
+       ROUND_HALF_UP,
+       ROUND_UP,
+       ROUND_HALF_EVEN,
+       ROUND_CEILING,
+       ROUND_FLOOR
+    ]
 
     @classmethod
     def METHODS(cls):
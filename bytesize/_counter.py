@@ -0,0 +1,152 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" A byte counter for use from many threads. """
+
+from threading import Lock
+from threading import local
+
+import weakref
+
+import six
+
+from ._errors import SizeNonsensicalBinOpError
+
+from ._size import Size
+from ._size import from_magnitude
+
+class _Owner(object):
+    """ A value which lives exactly as long as a thread's shard is used.
+
+        It is kept only in the thread's local storage, so it is freed
+        when the thread exits.
+    """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("__weakref__",)
+
+class _Shard(object):
+    """ The part of a count contributed by one thread. """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("magnitude", "owner")
+
+    def __init__(self, owner):
+        """ Initialize a new shard.
+
+            :param owner: a reference to the owning thread's _Owner
+            :type owner: :class:`weakref.ref`
+        """
+        self.magnitude = 0
+        self.owner = owner
+
+class SizeCounter(object):
+    """ A count of bytes which many threads may add to at once.
+
+        Each thread adds to its own shard, so adding takes no lock and
+        threads do not contend; only the thread which owns a shard
+        ever writes to it. Reading the count sums all the shards.
+
+        When a thread exits, its shard is folded into a base count,
+        which holds what all exited threads added, the next time the
+        count is read or a thread makes a shard. So the number of
+        shards follows the number of live threads which have added.
+    """
+
+    __slots__ = ("_base", "_local", "_lock", "_shards")
+
+    __hash__ = None
+
+    def __init__(self):
+        self._local = local()
+        self._lock = Lock()
+        self._base = 0
+        self._shards = []
+
+    def _retire(self):
+        """ Fold the shards of exited threads into the base count.
+
+            The caller must hold the lock.
+        """
+        live = []
+        for shard in self._shards:
+            if shard.owner() is None:
+                self._base += shard.magnitude
+            else:
+                live.append(shard)
+        self._shards = live
+
+    def _shard(self):
+        """ Make and register a shard for the current thread.
+
+            :returns: the new shard
+            :rtype: :class:`_Shard`
+        """
+        owner = _Owner()
+        shard = _Shard(weakref.ref(owner))
+        with self._lock:
+            self._retire()
+            self._shards.append(shard)
+        self._local.owner = owner
+        self._local.shard = shard
+        return shard
+
+    def add(self, amount):
+        """ Add to the count.
+
+            :param amount: the amount, which may be negative
+            :type amount: :class:`._size.Size` or int, a number of bytes
+            :raises SizeNonsensicalBinOpError: if amount is not a size
+        """
+        # pylint: disable=protected-access
+        if isinstance(amount, Size):
+            amount = amount._magnitude
+        elif not isinstance(amount, six.integer_types):
+            raise SizeNonsensicalBinOpError("add", amount)
+
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        shard.magnitude += amount
+
+    def __iadd__(self, other):
+        self.add(other)
+        return self
+
+    def __int__(self):
+        with self._lock:
+            self._retire()
+            base = self._base
+            shards = self._shards[:]
+        return base + sum(shard.magnitude for shard in shards)
+
+    def __str__(self):
+        return Size.get_str_config().formatter(int(self))
+
+    def __repr__(self):
+        return "SizeCounter(%s)" % repr(self.snapshot())
+
+    def snapshot(self):
+        """ The count so far.
+
+            :returns: the sum of all amounts added so far
+            :rtype: :class:`._size.Size`
+
+            Amounts which other threads add while the snapshot is taken
+            may or may not be included.
+        """
+        return from_magnitude(int(self))
@@ -0,0 +1,118 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Arithmetic on Sizes without checking operands.
+
+    Each operation of FastMath does what the corresponding operation of
+    Size does, for operands of the types that operation accepts, but
+    does not check its operands, and constructs its result directly
+    from the numbers of bytes. It is for code in which the operands are
+    known to be valid, such as inner loops over sizes already checked.
+
+    There are no comparisons: calling one through FastMath costs more
+    than the check which Size's own comparisons make.
+
+    Operands of other types give results which are undefined: usually,
+    an AttributeError or TypeError, but possibly a wrong result.
+"""
+
+from fractions import Fraction
+
+from ._size import Size
+
+# pylint: disable=protected-access
+
+_new = object.__new__
+
+class FastMath(object):
+    """ Static class of unchecked operations on Sizes. """
+    # pylint: disable=too-few-public-methods
+
+    @staticmethod
+    def add(left, right):
+        """ left + right, for Sizes left and right. """
+        size = _new(Size)
+        size._magnitude = left._magnitude + right._magnitude
+        return size
+
+    @staticmethod
+    def subtract(left, right):
+        """ left - right, for Sizes left and right. """
+        size = _new(Size)
+        size._magnitude = left._magnitude - right._magnitude
+        return size
+
+    @staticmethod
+    def multiply(left, factor):
+        """ left * factor, for a Size left and an int factor. """
+        size = _new(Size)
+        size._magnitude = left._magnitude * factor
+        return size
+
+    @staticmethod
+    def truncate_divide(left, divisor):
+        """ left // divisor, for a Size left and a non-zero int divisor.
+
+            The quotient is rounded toward 0, as by Size, but is exact
+            however large it is.
+        """
+        magnitude = left._magnitude
+        quotient = abs(magnitude) // abs(divisor)
+        size = _new(Size)
+        size._magnitude = \
+           quotient if (magnitude < 0) == (divisor < 0) else -quotient
+        return size
+
+    @staticmethod
+    def floor_divide(left, right):
+        """ left // right, an int, for Sizes left and right. """
+        return left._magnitude // right._magnitude
+
+    @staticmethod
+    def divide(left, right):
+        """ left / right, a Fraction, for Sizes left and right. """
+        return Fraction(left._magnitude, right._magnitude)
+
+    @staticmethod
+    def modulo(left, right):
+        """ left % right, for Sizes left and right. """
+        size = _new(Size)
+        size._magnitude = left._magnitude % right._magnitude
+        return size
+
+    @staticmethod
+    def negative(value):
+        """ -value, for a Size value. """
+        size = _new(Size)
+        size._magnitude = -value._magnitude
+        return size
+
+    @staticmethod
+    def absolute(value):
+        """ abs(value), for a Size value. """
+        size = _new(Size)
+        size._magnitude = abs(value._magnitude)
+        return size
+
+    @staticmethod
+    def total(sizes, start=None):
+        """ The sum of Sizes, plus start, which is Size(0) by default. """
+        size = _new(Size)
+        size._magnitude = sum(
+           (s._magnitude for s in sizes),
+           0 if start is None else start._magnitude
+        )
+        return size
@@ -0,0 +1,396 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Formatters compiled from string configurations. """
+
+from bisect import bisect_right
+from decimal import Decimal
+from decimal import DefaultContext
+from decimal import Inexact
+from decimal import Rounded
+from fractions import Fraction
+
+import six
+
+from . import _instrument
+
+from ._errors import SizeValueError
+
+from ._util import divide_to_precision
+from ._util import format_magnitude
+from ._util import integer_context
+from ._util import render_digits
+from ._util import round_ratio
+from ._util import unit_table
+
+_BYTES_SYMBOL = "B"
+
+# Imported by _load_bulk(), on first use, as importing numpy is slow.
+_bulk = None
+_bulk_loaded = False
+
+def _load_bulk():
+    """ Import the _bulk module, if it has not been imported.
+
+        :returns: the module, or None if numpy is not available
+    """
+    # pylint: disable=global-statement, redefined-outer-name
+    global _bulk, _bulk_loaded
+    if not _bulk_loaded:
+        try:
+            from . import _bulk
+        except ImportError: # numpy is not available
+            pass
+        _bulk_loaded = True
+    return _bulk
+
+def _context_key(context):
+    """ The attributes of a decimal context which formatting depends on.
+
+        :param context: a decimal context
+        :type context: :class:`decimal.Context`
+        :returns: the attributes which integer_context and the integer
+           engine use
+        :rtype: tuple
+    """
+    traps = context.traps
+    return (
+       context.prec,
+       context.rounding,
+       context.capitals,
+       context.clamp,
+       context.Emin,
+       context.Emax,
+       traps[Inexact],
+       traps[Rounded]
+    )
+
+class StrFormatter(object):
+    """ Formats sizes for display according to a StrConfig.
+
+        Everything that depends only on the configuration is computed
+        once, when the formatter is constructed. The result of calling
+        a formatter on a size is the same as the result of str() on the
+        size when the configuration is in effect.
+    """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = (
+       "_factors",
+       "_integer",
+       "_key",
+       "_max_places",
+       "_prec",
+       "_strip",
+       "_suffixes",
+       "_thresholds"
+    )
+
+    def __init__(self, config):
+        """ Initializer.
+
+            :param :class:`._config.StrConfig` config: the configuration
+            :raises SizeValueError: if the configuration is not usable
+
+            The decimal context is DefaultContext, as for str(). The
+            formatter rechecks it before formatting, so as to follow
+            any changes made to it.
+        """
+        max_places = config.max_places
+        if max_places is not None and \
+           (max_places < 0 or not isinstance(max_places, six.integer_types)):
+            raise SizeValueError(
+               max_places,
+               "max_places",
+               "must be None or a non-negative integer value"
+            )
+
+        min_value = config.min_value
+        if min_value < 0 or \
+           not isinstance(min_value, (six.integer_types, Decimal, Fraction)):
+            raise SizeValueError(
+               min_value,
+               "min_value",
+               "must be a precise positive numeric value."
+            )
+
+        (self._thresholds, units) = unit_table(
+           min_value,
+           config.binary_units
+        )
+        self._factors = [int(unit) for unit in units]
+        self._suffixes = [" " + unit.abbr + _BYTES_SYMBOL for unit in units]
+        self._max_places = max_places
+        self._strip = config.strip
+        self._key = None
+        self._prec = None
+        self._integer = False
+        self._check_context()
+
+    def _check_context(self):
+        """ Decide again how to format, if DefaultContext has changed. """
+        key = _context_key(DefaultContext)
+        if key != self._key:
+            self._key = key
+            self._prec = DefaultContext.prec
+            self._integer = integer_context(DefaultContext)
+
+    def __call__(self, size):
+        """ Format a size.
+
+            :param size: the size
+            :type size: :class:`._size.Size` or int, its number of bytes
+            :returns: the formatted size
+            :rtype: str
+        """
+        magnitude = int(size)
+        index = bisect_right(self._thresholds, abs(magnitude))
+        return self.format_value(magnitude, self._factors[index]) + \
+           self._suffixes[index]
+
+    def format_value(self, magnitude, factor):
+        """ Format the numeric part of a size.
+
+            :param int magnitude: the number of bytes
+            :param int factor: the number of bytes in the unit
+            :returns: the formatted number of units
+            :rtype: str
+
+            Same as format_magnitude(Fraction(magnitude, factor), ...),
+            with this formatter's max_places and strip.
+        """
+        self._check_context()
+        ret = None
+        if self._integer:
+            places = self._max_places
+            if places is None:
+                (coefficient, exponent) = \
+                   divide_to_precision(abs(magnitude), factor, self._prec)
+            else:
+                (coefficient, exponent) = (
+                   round_ratio(abs(magnitude), factor, places, self._prec),
+                   -places
+                )
+            ret = render_digits(magnitude < 0, coefficient, exponent)
+
+        if ret is None:
+            if _instrument.ENABLED:
+                _instrument.slow_path("StrFormatter.format_value")
+            return format_magnitude(
+               Fraction(magnitude, factor),
+               max_places=self._max_places,
+               strip=self._strip,
+               context=DefaultContext
+            )
+
+        if self._strip and '.' in ret:
+            ret = ret.rstrip("0").rstrip(".")
+        return ret
+
+    def format_many(self, values):
+        """ Format many sizes.
+
+            :param values: the sizes
+            :type values: :class:`._array.SizeArray`, a numpy integer
+               array of numbers of bytes, or an iterable of sizes or ints
+            :returns: the formatted sizes
+            :rtype: list of str
+
+            Each result is the same as the result of calling this
+            formatter on the corresponding size. If numpy is available,
+            units are chosen and values are divided and rounded for all
+            sizes at once; sizes for which that cannot be done exactly
+            are formatted one at a time.
+        """
+        magnitudes = self._magnitudes(values)
+        if isinstance(magnitudes, list):
+            return [self(m) for m in magnitudes]
+
+        # abs(INT64.min) is INT64.min, which is 2**63 as a uint64.
+        numpy = _bulk.numpy
+        indices = numpy.searchsorted(
+           self._bulk_tables()[0],
+           abs(magnitudes).view(numpy.uint64),
+           side="right"
+        )
+        numbers = self._numbers(magnitudes, indices)
+        suffixes = self._suffixes
+        return [
+           number + suffixes[i] for (number, i) in \
+              six.moves.zip(numbers, indices.tolist())
+        ]
+
+    def format_column(self, values, percentile=None):
+        """ Format many sizes in a single unit, aligned on the right.
+
+            :param values: the sizes
+            :type values: :class:`._array.SizeArray`, a numpy integer
+               array of numbers of bytes, or an iterable of sizes or ints
+            :param percentile: the percentile of the absolute values of
+               the sizes which determines the unit, default is 100
+            :type percentile: a real number, more than 0 and at most 100
+            :returns: the formatted sizes, all of the same length
+            :rtype: list of str
+            :raises SizeValueError: if percentile is out of range
+
+            The unit is the one this formatter would choose for the
+            size at the percentile, by the nearest-rank method; so by
+            default it is the one for the largest size.
+        """
+        if percentile is not None and not 0 < percentile <= 100:
+            raise SizeValueError(
+               percentile,
+               "percentile",
+               "must be more than 0 and at most 100"
+            )
+
+        magnitudes = self._magnitudes(values)
+        if len(magnitudes) == 0:
+            return []
+
+        index = bisect_right(
+           self._thresholds,
+           _rank(magnitudes, percentile)
+        )
+        if isinstance(magnitudes, list):
+            factor = self._factors[index]
+            numbers = [self.format_value(m, factor) for m in magnitudes]
+        else:
+            numbers = self._numbers(
+               magnitudes,
+               _bulk.numpy.full(len(magnitudes), index)
+            )
+
+        width = max(len(number) for number in numbers)
+        suffix = self._suffixes[index]
+        return [number.rjust(width) + suffix for number in numbers]
+
+    def _magnitudes(self, values):
+        """ Get the magnitudes of sizes, packed if they can be formatted
+            all at once.
+
+            :param values: the sizes
+            :type values: :class:`._array.SizeArray`, a numpy integer
+               array of numbers of bytes, or an iterable of sizes or ints
+            :returns: the magnitudes
+            :rtype: :class:`numpy.ndarray` of int64 or list of int
+        """
+        self._check_context()
+        magnitudes = getattr(values, "magnitudes", values)
+        places = self._max_places
+        if _load_bulk() is None or places is None or \
+           not self._integer or places > _bulk.MAX_PLACES:
+            return [int(m) for m in magnitudes]
+
+        if isinstance(magnitudes, _bulk.numpy.ndarray) and \
+           magnitudes.dtype.kind == "i":
+            return magnitudes.astype(_bulk.numpy.int64)
+
+        magnitudes = _bulk.pack([int(m) for m in magnitudes])
+        if _bulk.is_wide(magnitudes):
+            return magnitudes.tolist()
+        return magnitudes
+
+    def _bulk_tables(self):
+        """ The thresholds and factors for int64 magnitudes.
+
+            :returns: a pair of thresholds and factors
+            :rtype: tuple of :class:`numpy.ndarray` of uint64 and int64
+
+            Thresholds are for absolute values, which fit in a uint64;
+            those which do not fit are left out, as no absolute value is
+            as large. Factors which do not fit in an int64 are replaced
+            by INT64.max, for which quantize gives no valid results.
+        """
+        numpy = _bulk.numpy
+        limit = _bulk.INT64.max
+        return (
+           numpy.array(
+              [t for t in self._thresholds if t < 2 ** 64],
+              dtype=numpy.uint64
+           ),
+           numpy.array(
+              [min(f, limit) for f in self._factors],
+              dtype=numpy.int64
+           )
+        )
+
+    def _numbers(self, magnitudes, indices):
+        """ Format the numeric parts of many sizes.
+
+            :param magnitudes: the magnitudes
+            :type magnitudes: :class:`numpy.ndarray` of int64
+            :param indices: the index of the unit for each magnitude
+            :type indices: :class:`numpy.ndarray` of int
+            :returns: the formatted numbers of units
+            :rtype: list of str
+        """
+        numpy = _bulk.numpy
+        places = self._max_places
+        (wholes, fractions, valid) = _bulk.quantize(
+           magnitudes,
+           self._bulk_tables()[1][indices],
+           places,
+           self._prec
+        )
+
+        # str() of a Decimal uses exponential notation for values with
+        # more than five zeros after the decimal point.
+        if places > 6:
+            valid &= (wholes != 0) | (fractions >= 10 ** (places - 6))
+
+        signs = numpy.where(magnitudes < 0, "-", "").tolist()
+        if places == 0:
+            ret = [
+               "%s%d" % pair for pair in six.moves.zip(signs, wholes.tolist())
+            ]
+        else:
+            template = "%%s%%d.%%0%dd" % places
+            ret = [
+               template % triple for triple in \
+                  six.moves.zip(signs, wholes.tolist(), fractions.tolist())
+            ]
+            if self._strip:
+                ret = [number.rstrip("0").rstrip(".") for number in ret]
+
+        for i in numpy.flatnonzero(~valid).tolist():
+            ret[i] = self.format_value(
+               int(magnitudes[i]),
+               self._factors[indices[i]]
+            )
+        return ret
+
+def _rank(magnitudes, percentile):
+    """ The absolute value at a percentile of magnitudes.
+
+        :param magnitudes: the magnitudes, at least one
+        :type magnitudes: :class:`numpy.ndarray` of int64 or list of int
+        :param percentile: the percentile or None for the largest
+        :type percentile: a real number or NoneType
+        :returns: the absolute value, by the nearest-rank method
+        :rtype: int
+    """
+    if percentile is None:
+        if isinstance(magnitudes, list):
+            return max(abs(m) for m in magnitudes)
+        return _bulk.bound(magnitudes)
+
+    rank = max(-(-Fraction(percentile) * len(magnitudes) // 100), 1)
+    if isinstance(magnitudes, list):
+        return sorted(abs(m) for m in magnitudes)[rank - 1]
+    return int(
+       _bulk.numpy.partition(_bulk.absolute(magnitudes), rank - 1)[rank - 1]
+    )
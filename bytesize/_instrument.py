@@ -0,0 +1,173 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Opt-in instrumentation of the hot paths of bytesize.
+
+    While instrumentation is enabled, each instrumented function counts
+    its calls and the time spent in them, and each slow path counts
+    the times it is taken, against the innermost instrumented function
+    being called, or, if there is none, against the function in which
+    the slow path is. The slow paths are:
+
+    * constructing a Fraction to convert a value to bytes
+    * converting a value to a string with Decimal, rather than integer,
+      arithmetic, and each increase of precision in the conversion
+    * computing a table of units, rather than finding it in the cache
+    * formatting a size with Decimal, rather than integer, arithmetic
+
+    Functions are instrumented by replacing them with wrappers when
+    instrumentation is enabled, and restoring them when it is disabled;
+    slow paths check whether instrumentation is enabled only once they
+    have been taken. So instrumentation costs nothing while disabled.
+    Functions are replaced where they are looked up, in their classes
+    and modules and in bytesize itself; a reference to a function taken
+    while instrumentation is disabled is never instrumented.
+"""
+
+import functools
+import importlib
+import sys
+import threading
+import time
+
+ENABLED = False
+
+# (name, module, owner, attribute): each function is found as the
+# attribute of the owner, an attribute of the module, or the module
+# itself if owner is None. Functions imported under the same name into
+# several modules are replaced in each.
+_FUNCTIONS = [
+   ("Size.__init__", "._size", "Size", "__init__"),
+   ("Size.__str__", "._size", "Size", "__str__"),
+   ("Size.__format__", "._size", "Size", "__format__"),
+   ("Size.components", "._size", "Size", "components"),
+   ("Size.convertTo", "._size", "Size", "convertTo"),
+   ("Size.roundTo", "._size", "Size", "roundTo"),
+   ("convert_magnitude", "._util", None, "convert_magnitude"),
+   ("convert_magnitude", "", None, "convert_magnitude"),
+   ("format_magnitude", "._util", None, "format_magnitude"),
+   ("format_magnitude", "._format", None, "format_magnitude"),
+   ("format_magnitude", "", None, "format_magnitude")
+]
+
+_clock = getattr(time, "perf_counter", time.time)
+
+_LOCK = threading.Lock()
+_STATS = {}
+_ORIGINALS = []
+_CALLS = threading.local()
+
+def _entry(name):
+    """ The statistics for name, which must be updated under _LOCK.
+
+        :param str name: the name of the function
+        :returns: the number of calls, of slow path hits, and the time
+        :rtype: list
+    """
+    entry = _STATS.get(name)
+    if entry is None:
+        entry = _STATS[name] = [0, 0, 0.0]
+    return entry
+
+def slow_path(name):
+    """ Count a slow path taken, if instrumentation is enabled.
+
+        :param str name: the function in which the slow path is
+
+        Callers should call only if ENABLED is True, so that a slow
+        path costs nothing more when instrumentation is disabled.
+    """
+    stack = getattr(_CALLS, "stack", None)
+    if stack:
+        name = stack[-1]
+    with _LOCK:
+        _entry(name)[1] += 1
+
+def _instrumented(name, func):
+    """ Wrap func to count calls to it and the time spent in them.
+
+        :param str name: the name of the function
+        :param func: the function
+        :returns: the wrapped function
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # pylint: disable=missing-docstring
+        stack = getattr(_CALLS, "stack", None)
+        if stack is None:
+            stack = _CALLS.stack = []
+        stack.append(name)
+        start = _clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = _clock() - start
+            stack.pop()
+            with _LOCK:
+                entry = _entry(name)
+                entry[0] += 1
+                entry[2] += elapsed
+    return wrapper
+
+def enable():
+    """ Enable instrumentation, if it is not enabled. """
+    # pylint: disable=global-statement
+    global ENABLED
+    package = __name__.rpartition(".")[0]
+    with _LOCK:
+        if ENABLED:
+            return
+        for (name, module, owner, attribute) in _FUNCTIONS:
+            target = sys.modules[package] if module == "" else \
+               importlib.import_module(module, package)
+            if owner is not None:
+                target = getattr(target, owner)
+            original = target.__dict__[attribute]
+            _ORIGINALS.append((target, attribute, original))
+            setattr(target, attribute, _instrumented(name, original))
+        ENABLED = True
+
+def disable():
+    """ Disable instrumentation, if it is enabled.
+
+        Statistics gathered while it was enabled are kept.
+    """
+    # pylint: disable=global-statement
+    global ENABLED
+    with _LOCK:
+        ENABLED = False
+        while _ORIGINALS:
+            (target, attribute, original) = _ORIGINALS.pop()
+            setattr(target, attribute, original)
+
+def snapshot():
+    """ The statistics gathered so far.
+
+        :returns: a map from function names to their statistics: the
+           number of calls, of slow paths taken, and the total time in
+           seconds spent in calls, under keys "calls", "slow", "seconds"
+        :rtype: dict
+    """
+    with _LOCK:
+        return dict(
+           (name, {"calls": calls, "slow": slow, "seconds": seconds}) \
+              for (name, (calls, slow, seconds)) in _STATS.items()
+        )
+
+def reset():
+    """ Discard the statistics gathered so far. """
+    with _LOCK:
+        _STATS.clear()
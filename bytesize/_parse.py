@@ -0,0 +1,132 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Parsing of sizes written with units, e.g., "1.5 GiB".
+
+    The grammar is a number, optionally followed by whitespace and a unit.
+
+    The number may have a sign, a fractional part and an exponent, as in
+    "-1.5e3", or it may be a ratio of non-negative integers, as in
+    "-3/4". The unit may be written as its symbol ("KiB", "kB"), as its
+    abbreviation alone ("Ki", "k") or as its name ("kibibytes",
+    "kilobyte"). Units are matched without regard to case. If the unit
+    is omitted, the number is a number of bytes.
+
+    Fractional quantities are rounded toward 0, as for Size.
+"""
+
+import re
+
+from ._constants import B
+from ._constants import UNITS
+
+from ._errors import SizeValueError
+
+from ._util import divide_toward_zero
+
+_GRAMMAR = re.compile(r"""
+   \s*
+   (?P<sign>[-+]?)
+   (?:
+      (?P<numerator>\d+)/(?P<denominator>\d+)
+      |
+      (?=\d|\.\d)(?P<integer>\d*)(?:\.(?P<fraction>\d*))?
+      (?:[eE](?P<exponent>[-+]?\d+))?
+   )
+   \s*
+   (?P<unit>[a-zA-Z]*)
+   \s*
+   \Z
+""", re.VERBOSE)
+
+def _unit_factors():
+    """ Build the table of unit factors.
+
+        :returns: a map from lowercase unit spellings to unit factors
+        :rtype: dict
+    """
+    factors = {"": int(B)}
+    for unit in UNITS():
+        factor = int(unit)
+        for spelling in (
+           unit.abbr + "B",
+           unit.abbr,
+           unit.prefix + "byte",
+           unit.prefix + "bytes"
+        ):
+            if spelling:
+                factors[spelling.lower()] = factor
+    return factors
+
+_UNIT_FACTORS = _unit_factors()
+
+def parse_magnitude(text):
+    """ Parse a size written with a unit.
+
+        :param str text: the text
+        :returns: the number of bytes, rounded toward 0
+        :rtype: int
+        :raises SizeValueError: if text is not a size
+    """
+    match = _GRAMMAR.match(text)
+    if match is None:
+        raise SizeValueError(text, "text", "not a number with a unit")
+
+    factor = _UNIT_FACTORS.get(match.group("unit").lower())
+    if factor is None:
+        raise SizeValueError(text, "text", "unknown unit")
+
+    (sign, numerator, denominator, integer, fraction, exponent) = \
+       match.group(
+          "sign",
+          "numerator",
+          "denominator",
+          "integer",
+          "fraction",
+          "exponent"
+       )
+
+    if numerator is not None:
+        denominator = int(denominator)
+        if denominator == 0:
+            raise SizeValueError(text, "text", "denominator is 0")
+        numerator = int(numerator) * factor
+    else:
+        fraction = fraction or ""
+        numerator = int(integer + fraction) * factor
+        exponent = int(exponent or 0) - len(fraction)
+        if exponent >= 0:
+            numerator = numerator * 10 ** exponent
+            denominator = 1
+        else:
+            denominator = 10 ** -exponent
+
+    if sign == "-":
+        numerator = -numerator
+    return divide_toward_zero(numerator, denominator)
+
+def parse_magnitudes(texts):
+    """ Parse sizes written with units.
+
+        :param texts: the texts
+        :type texts: an iterable of str
+        :returns: the number of bytes for each text
+        :rtype: a generator of int
+        :raises SizeValueError: if any text is not a size
+    """
+    # pylint: disable=invalid-name
+    for text in texts:
+        yield parse_magnitude(text)
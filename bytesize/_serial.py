@@ -0,0 +1,179 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Binary encodings of magnitudes.
+
+    A single magnitude is encoded either in a fixed number of bytes, as
+    a little-endian two's complement integer, or as a varint: the
+    magnitude is zigzag encoded, so that magnitudes near 0 of either
+    sign are small, and the result written in LEB128, seven bits to a
+    byte, least significant first, with the high bit of every byte
+    but the last set. A varint may encode a magnitude of any size.
+
+    An array of magnitudes is encoded as a 16 byte header, followed by
+    the magnitudes. The header is the magic string "BSZA", a version
+    byte, a flags byte, two zero bytes and the number of magnitudes as
+    an unsigned little-endian 64 bit integer. If the WIDE flag is not
+    set, every magnitude follows as a little-endian 64 bit integer; if
+    it is set, some magnitude does not fit in 64 bits, and every
+    magnitude follows as a varint.
+"""
+
+import binascii
+import struct
+
+from ._errors import SizeValueError
+
+MAGIC = b"BSZA"
+VERSION = 1
+WIDE = 0x01
+
+HEADER = struct.Struct("<4sBBHQ")
+
+def encode_fixed(magnitude, length):
+    """ Encode a magnitude in a fixed number of bytes.
+
+        :param int magnitude: the magnitude
+        :param int length: the number of bytes
+        :returns: the encoding
+        :rtype: bytes
+        :raises SizeValueError: if magnitude does not fit in length bytes
+    """
+    if length < 1:
+        raise SizeValueError(length, "length", "must be at least 1")
+    bits = 8 * length
+    if not -(1 << (bits - 1)) <= magnitude < (1 << (bits - 1)):
+        raise SizeValueError(
+           length,
+           "length",
+           "too small for magnitude %s" % magnitude
+        )
+    digits = "%0*x" % (2 * length, magnitude % (1 << bits))
+    return binascii.unhexlify(digits.encode("ascii"))[::-1]
+
+def decode_fixed(data):
+    """ Decode a magnitude encoded in a fixed number of bytes.
+
+        :param data: the encoding, every byte of which is used
+        :type data: bytes or any object supporting the buffer protocol
+        :returns: the magnitude
+        :rtype: int
+        :raises SizeValueError: if data is empty
+    """
+    data = bytes(bytearray(data))
+    if not data:
+        raise SizeValueError(data, "data", "must not be empty")
+    value = int(binascii.hexlify(data[::-1]), 16)
+    bits = 8 * len(data)
+    return value - (1 << bits) if value >> (bits - 1) else value
+
+def encode_varint(magnitude):
+    """ Encode a magnitude as a varint.
+
+        :param int magnitude: the magnitude
+        :returns: the encoding
+        :rtype: bytes
+    """
+    value = 2 * magnitude if magnitude >= 0 else -2 * magnitude - 1
+    result = bytearray()
+    while value > 0x7f:
+        result.append(value & 0x7f | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+def decode_varint(data, offset=0):
+    """ Decode a magnitude encoded as a varint.
+
+        :param data: the data containing the encoding
+        :type data: bytes or bytearray
+        :param int offset: the offset of the encoding in data
+        :returns: the magnitude and the offset just past its encoding
+        :rtype: tuple of int * int
+        :raises SizeValueError: if the encoding is incomplete
+    """
+    if not isinstance(data, bytearray):
+        data = bytearray(data)
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise SizeValueError(data, "data", "incomplete varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return ((value >> 1) ^ -(value & 1), offset)
+
+def encode_varints(magnitudes):
+    """ Encode magnitudes as consecutive varints.
+
+        :param magnitudes: the magnitudes
+        :type magnitudes: an iterable of int
+        :returns: the encoding
+        :rtype: bytes
+    """
+    return b"".join(encode_varint(int(m)) for m in magnitudes)
+
+def decode_varints(data, offset, count):
+    """ Decode consecutive varints.
+
+        :param data: the data containing the encoding
+        :type data: bytes or bytearray
+        :param int offset: the offset of the first varint in data
+        :param int count: the number of varints
+        :returns: the magnitudes and the offset just past their encoding
+        :rtype: tuple of (list of int) * int
+        :raises SizeValueError: if the encoding is incomplete
+    """
+    if not isinstance(data, bytearray):
+        data = bytearray(data)
+    magnitudes = []
+    for _ in range(count):
+        (magnitude, offset) = decode_varint(data, offset)
+        magnitudes.append(magnitude)
+    return (magnitudes, offset)
+
+def encode_header(count, wide):
+    """ Encode the header of an array of magnitudes.
+
+        :param int count: the number of magnitudes
+        :param bool wide: whether magnitudes are encoded as varints
+        :returns: the header
+        :rtype: bytes
+    """
+    return HEADER.pack(MAGIC, VERSION, WIDE if wide else 0, 0, count)
+
+def decode_header(data):
+    """ Decode the header of an array of magnitudes.
+
+        :param data: the data, beginning with the header
+        :type data: bytes or any object supporting the buffer protocol
+        :returns: the number of magnitudes and whether they are wide
+        :rtype: tuple of int * bool
+        :raises SizeValueError: if data does not begin with a header
+    """
+    if len(data) < HEADER.size:
+        raise SizeValueError(len(data), "data", "too short for a header")
+    (magic, version, flags, reserved, count) = \
+       HEADER.unpack(bytes(bytearray(data[:HEADER.size])))
+    if magic != MAGIC:
+        raise SizeValueError(magic, "data", "not a size array")
+    if version != VERSION or flags & ~WIDE or reserved != 0:
+        raise SizeValueError(version, "data", "unsupported format")
+    return (count, bool(flags & WIDE))
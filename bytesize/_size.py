@@ -25,12 +25,20 @@
     will cause an exception to be raised.
 """
 
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
 from decimal import Decimal
 from fractions import Fraction
 
 import six
 
+from . import _instrument
+
+from ._cache import RenderCache
+
 from ._config import Defaults
+from ._config import SCOPED_STR_CONFIG
 from ._config import StrConfig
 
 from ._errors import SizeNonsensicalBinOpError
@@ -38,25 +46,101 @@ from ._errors import SizePowerResultError
 from ._errors import SizeValueError
 
 from ._constants import B
-from ._constants import BinaryUnits
-from ._constants import DecimalUnits
-
-from ._util import format_magnitude
-from ._util import round_fraction
 
-_BYTES_SYMBOL = "B"
+from ._parse import parse_magnitude
+from ._parse import parse_magnitudes
+
+from ._serial import decode_fixed
+from ._serial import decode_varint
+from ._serial import encode_fixed
+from ._serial import encode_varint
+
+from ._spec import spec_formatter
+
+from ._util import divide_toward_zero
+from ._util import round_quotient
+from ._util import unit_table
+
+def _to_magnitude(value, factor):
+    """ Compute the whole number of bytes in value units of factor bytes.
+
+        :param value: a number of units
+        :type value: any finite numeric type (possibly as str)
+        :param int factor: the number of bytes in a unit
+        :returns: the number of bytes, rounded toward 0
+        :rtype: int
+        :raises ValueError: if value is not a finite number
+        :raises TypeError: if value has an unusable type
+
+        The result is the same as int(Fraction(value) * factor), but
+        is computed in integer arithmetic; a Fraction is constructed
+        only if value is a str.
+    """
+    if isinstance(value, six.integer_types):
+        return int(value) * factor
+
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(value)
+        try:
+            (numerator, denominator) = value.as_integer_ratio()
+        except AttributeError: # Decimal.as_integer_ratio() is new in 3.6
+            if _instrument.ENABLED:
+                _instrument.slow_path("_to_magnitude")
+            value = Fraction(value)
+            (numerator, denominator) = (value.numerator, value.denominator)
+        return divide_toward_zero(numerator * factor, denominator)
+
+    if not isinstance(value, Fraction):
+        if _instrument.ENABLED:
+            _instrument.slow_path("_to_magnitude")
+        value = Fraction(value)
+    return divide_toward_zero(value.numerator * factor, value.denominator)
+
+def from_magnitude(magnitude):
+    """ Construct a Size directly from a number of bytes.
+
+        :param int magnitude: the number of bytes
+        :returns: a Size with the given magnitude
+        :rtype: :class:`Size`
+
+        Skips all the validation done by :meth:`Size.__init__`, so
+        magnitude must already be an integer.
+    """
+    # pylint: disable=protected-access
+    size = object.__new__(Size)
+    size._magnitude = magnitude
+    return size
+
+def is_size_array(value):
+    """ Whether value is an array of Sizes.
+
+        :param object value: any value
+        :returns: True if value is a :class:`._array.SizeArray`
+        :rtype: bool
+
+        Size leaves binary operations with an array of Sizes to the
+        array. The array class is marked by an attribute, so that this
+        module need not import numpy.
+    """
+    return getattr(type(value), "_SIZE_ARRAY", False)
 
 class Size(object):
     """ Class for instantiating Size objects. """
 
+    __slots__ = ("_magnitude",)
+
     _NUMERIC_TYPES = (six.integer_types, Decimal, Fraction)
     _STR_CONFIG = Defaults.STR_CONFIG
+    _STR_CACHE = None
 
     @classmethod
     def set_str_config(cls, config):
         """ Set the configuration for __str__ method for all Size objects.
 
             :param :class:`._config.StrConfig` config: a configuration object
+
+            Clears the cache of rendered sizes, if there is one.
         """
         cls._STR_CONFIG = StrConfig(
             max_places=config.max_places,
@@ -64,6 +148,188 @@ class Size(object):
             min_value=config.min_value,
             binary_units=config.binary_units
         )
+        if cls._STR_CACHE is not None:
+            cls._STR_CACHE.clear()
+
+    @classmethod
+    @contextmanager
+    def str_config(cls, config=None, **kwargs):
+        """ Set the configuration for __str__ in a with block.
+
+            :param config: a configuration, default is the one in effect
+            :type config: :class:`._config.StrConfig` or NoneType
+            :param kwargs: StrConfig parameters to override those of config
+            :returns: a context manager which yields the configuration
+            :raises SizeValueError: if the configuration is not usable
+
+            Unlike set_str_config, this affects only the current thread
+            or asyncio task, and only until the block is left, as::
+
+                with Size.str_config(strip=True):
+                    print(Size(1024)) # 1 KiB
+        """
+        if config is None:
+            config = cls.get_str_config()
+        if kwargs:
+            values = {
+               'max_places' : config.max_places,
+               'strip' : config.strip,
+               'min_value' : config.min_value,
+               'binary_units' : config.binary_units
+            }
+            values.update(kwargs)
+            config = StrConfig(**values)
+        config.formatter # pylint: disable=pointless-statement
+
+        token = SCOPED_STR_CONFIG.set(config)
+        try:
+            yield config
+        finally:
+            SCOPED_STR_CONFIG.reset(token)
+
+    @classmethod
+    def get_str_config(cls):
+        """ Get the configuration for __str__ in effect.
+
+            :returns: the configuration
+            :rtype: :class:`._config.StrConfig`
+
+            That set by str_config if in a str_config block, otherwise
+            that set by set_str_config.
+        """
+        return SCOPED_STR_CONFIG.get() or cls._STR_CONFIG
+
+    @classmethod
+    def set_str_cache(cls, maxsize=128):
+        """ Set the size of the cache of strings rendered by __str__.
+
+            :param maxsize: the number of strings to keep, None for no cache
+            :type maxsize: int or NoneType
+            :raises SizeValueError: if maxsize is not None or positive
+
+            There is no cache by default. Setting one replaces any
+            previous cache, with its entries and statistics.
+        """
+        cls._STR_CACHE = None if maxsize is None else RenderCache(maxsize)
+
+    @classmethod
+    def str_cache_info(cls):
+        """ Statistics for the cache of strings rendered by __str__.
+
+            :returns: the statistics, or None if there is no cache
+            :rtype: :class:`._cache.CacheInfo` or NoneType
+        """
+        cache = cls._STR_CACHE
+        return None if cache is None else cache.info()
+
+    @classmethod
+    def parse(cls, text):
+        """ Parse a size written with a unit, e.g., "1.5 GiB".
+
+            :param str text: the text
+            :returns: the size
+            :rtype: :class:`Size`
+            :raises SizeValueError: if text is not a size
+
+            Any string produced by __str__ can be parsed. See
+            :mod:`._parse` for the grammar.
+        """
+        return from_magnitude(parse_magnitude(text))
+
+    @classmethod
+    def parse_many(cls, texts, packed=False):
+        """ Parse many sizes written with units.
+
+            :param texts: the texts
+            :type texts: an iterable of str
+            :param bool packed: if True, return a packed array of magnitudes
+            :returns: the sizes, or their magnitudes if packed is True
+            :rtype: list of :class:`Size` or :class:`array.array` of 'q'
+            :raises SizeValueError: if any text is not a size, or if
+               packed is True and any magnitude does not fit in 64 bits
+        """
+        magnitudes = parse_magnitudes(texts)
+        if not packed:
+            return [from_magnitude(m) for m in magnitudes]
+
+        result = array("q")
+        try:
+            result.extend(magnitudes)
+        except OverflowError:
+            raise SizeValueError(
+               packed,
+               "packed",
+               "some magnitude does not fit in 64 bits"
+            )
+        return result
+
+    @classmethod
+    def from_bytes(cls, data, length=None):
+        """ Decode a size encoded by :meth:`to_bytes`.
+
+            :param data: the encoding, every byte of which is used
+            :type data: bytes or any object supporting the buffer protocol
+            :param length: the number of bytes, or None for a varint
+            :type length: int or NoneType
+            :returns: the size
+            :rtype: :class:`Size`
+            :raises SizeValueError: if data is not an encoding of a size
+
+            See :mod:`._serial` for the encodings.
+        """
+        if length is not None:
+            if len(data) != length:
+                raise SizeValueError(
+                   len(data),
+                   "data",
+                   "length is not %s" % length
+                )
+            return from_magnitude(decode_fixed(data))
+
+        (magnitude, end) = decode_varint(data)
+        if end != len(data):
+            raise SizeValueError(end, "data", "bytes follow the varint")
+        return from_magnitude(magnitude)
+
+    @classmethod
+    def format_many(cls, values, config=None):
+        """ Format many sizes, as str() formats each one.
+
+            :param values: the sizes
+            :type values: :class:`._array.SizeArray`, a numpy integer
+               array of numbers of bytes, or an iterable of sizes or ints
+            :param config: the configuration, default is that for str()
+            :type config: :class:`._config.StrConfig` or NoneType
+            :returns: the formatted sizes
+            :rtype: list of str
+            :raises SizeValueError: if the configuration is not usable
+        """
+        if config is None:
+            config = cls.get_str_config()
+        return config.formatter.format_many(values)
+
+    @classmethod
+    def format_column(cls, values, config=None, percentile=None):
+        """ Format many sizes in a single unit, aligned on the right.
+
+            :param values: the sizes
+            :type values: :class:`._array.SizeArray`, a numpy integer
+               array of numbers of bytes, or an iterable of sizes or ints
+            :param config: the configuration, default is that for str()
+            :type config: :class:`._config.StrConfig` or NoneType
+            :param percentile: the percentile of the absolute values of
+               the sizes which determines the unit, default is 100
+            :type percentile: a real number, more than 0 and at most 100
+            :returns: the formatted sizes, all of the same length
+            :rtype: list of str
+            :raises SizeValueError: on bad parameters
+
+            The unit is the one str() would choose for the size at the
+            percentile, by the nearest-rank method.
+        """
+        if config is None:
+            config = cls.get_str_config()
+        return config.formatter.format_column(values, percentile)
 
     def __init__(self, value=0, units=None):
         """ Initialize a new Size object.
@@ -80,10 +346,14 @@ class Size(object):
             are rounded. Rounding is always toward 0. So,
             Size('-0.5', B) == Size(0), not Size(-1).
         """
+        if isinstance(value, six.integer_types) and units is None:
+            self._magnitude = int(value)
+            return
+
         if isinstance(value, six.string_types) or \
            isinstance(value, self._NUMERIC_TYPES):
             try:
-                magnitude = int(Fraction(value) * int(units or B))
+                magnitude = _to_magnitude(value, int(units or B))
             except (ValueError, TypeError):
                 raise SizeValueError(value, "value")
 
@@ -94,30 +364,43 @@ class Size(object):
                    "units",
                    "meaningless when Size value is passed"
                 )
-            magnitude = value
+            magnitude = value._magnitude
         else:
             raise SizeValueError(value, "value")
 
-        self._magnitude = int(magnitude)
+        self._magnitude = magnitude
 
     def __str__(self):
-        (magnitude, units) = self.components(
-           min_value=self._STR_CONFIG.min_value,
-           binary_units=self._STR_CONFIG.binary_units
-        )
-        res = format_magnitude(
-           magnitude,
-           max_places=self._STR_CONFIG.max_places,
-           strip=self._STR_CONFIG.strip
-        )
-        return res + " " + units.abbr + _BYTES_SYMBOL
+        config = SCOPED_STR_CONFIG.get() or self._STR_CONFIG
+        if self._STR_CACHE is None:
+            return config.formatter(self._magnitude)
+        return self._STR_CACHE.render(self._magnitude, config)
+
+    def __format__(self, spec):
+        if not spec:
+            return str(self)
+        config = SCOPED_STR_CONFIG.get() or self._STR_CONFIG
+        return spec_formatter(spec, config)(self._magnitude)
 
     def __repr__(self):
         return "Size('%s')" % self._magnitude
 
+    # Sizes are immutable, so a copy may be the Size itself.
+    def __copy__(self):
+        return self
+
     def __deepcopy__(self, memo):
         # pylint: disable=unused-argument
-        return Size(self._magnitude)
+        return self
+
+    def __reduce__(self):
+        # Pickle only the magnitude, which needs no validation.
+        return (from_magnitude, (self._magnitude,))
+
+    def __setstate__(self, state):
+        # Sizes pickled before Size had __slots__ are reconstructed
+        # without __init__, and then given their __dict__ as state.
+        self._magnitude = state["_magnitude"]
 
     def __nonzero__(self):
         return self._magnitude != 0
@@ -135,19 +418,21 @@ class Size(object):
     # UNARY OPERATIONS
 
     def __abs__(self):
-        return Size(abs(self._magnitude))
+        return from_magnitude(abs(self._magnitude))
 
     def __neg__(self):
-        return Size(-(self._magnitude))
+        return from_magnitude(-(self._magnitude))
 
     def __pos__(self):
-        return Size(self._magnitude)
+        return from_magnitude(self._magnitude)
 
     # BINARY OPERATIONS
     def __add__(self, other):
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("+", other)
-        return Size(self._magnitude + int(other))
+        return from_magnitude(self._magnitude + other._magnitude)
     __radd__ = __add__
 
     def __divmod__(self, other):
@@ -156,11 +441,16 @@ class Size(object):
         #            T(div) = Size, if T(other) is numeric
         #                   = int, if T(other) is Size
         if isinstance(other, Size):
-            (div, rem) = divmod(self._magnitude, int(other))
-            return (div, Size(rem))
+            (div, rem) = divmod(self._magnitude, other._magnitude)
+            return (div, from_magnitude(rem))
+        if isinstance(other, six.integer_types):
+            (div, rem) = divmod(self._magnitude, other)
+            return (from_magnitude(div), from_magnitude(rem))
         if isinstance(other, self._NUMERIC_TYPES):
             (div, rem) = divmod(self._magnitude, other)
             return (Size(div), Size(rem))
+        if is_size_array(other):
+            return NotImplemented
         raise SizeNonsensicalBinOpError("divmod", other)
 
     def __rdivmod__(self, other):
@@ -169,76 +459,102 @@ class Size(object):
         #            T(div) = int
         # and T(other) is Size
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("rdivmod", other)
-        (div, rem) = divmod(int(other), self._magnitude)
-        return (div, Size(rem))
+        (div, rem) = divmod(other._magnitude, self._magnitude)
+        return (div, from_magnitude(rem))
 
     def __eq__(self, other):
-        return isinstance(other, Size) and self._magnitude == int(other)
+        if isinstance(other, Size):
+            return self._magnitude == other._magnitude
+        return NotImplemented if is_size_array(other) else False
 
     def __floordiv__(self, other):
         # other * floor + rem = self
         # Therefore, T(floor) = Size, if T(other) is numeric
         #                     = int, if T(other) is Size
         if isinstance(other, Size):
-            return self._magnitude.__floordiv__(int(other))
+            return self._magnitude.__floordiv__(other._magnitude)
         if isinstance(other, self._NUMERIC_TYPES):
             return Size(Decimal(self._magnitude).__floordiv__(other))
+        if is_size_array(other):
+            return NotImplemented
         raise SizeNonsensicalBinOpError("floordiv", other)
 
     def __rfloordiv__(self, other):
         # self * floor + rem = other
         # Therefore, T(floor) = int and T(other) is Size
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("rfloordiv", other)
-        return int(other).__floordiv__(self._magnitude)
+        return other._magnitude.__floordiv__(self._magnitude)
 
     def __ge__(self, other):
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError(">=", other)
-        return self._magnitude >= int(other)
+        return self._magnitude >= other._magnitude
 
     def __gt__(self, other):
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError(">", other)
-        return self._magnitude > int(other)
+        return self._magnitude > other._magnitude
 
     def __le__(self, other):
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("<=", other)
-        return self._magnitude <= int(other)
+        return self._magnitude <= other._magnitude
 
     def __lt__(self, other):
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("<", other)
-        return self._magnitude < int(other)
+        return self._magnitude < other._magnitude
 
     def __mod__(self, other):
         # other * div + mod = self
         # Therefore, T(mod) = Size
         if isinstance(other, Size):
-            return Size(self._magnitude % int(other))
+            return from_magnitude(self._magnitude % other._magnitude)
+        if isinstance(other, six.integer_types):
+            return from_magnitude(self._magnitude % other)
         if isinstance(other, self._NUMERIC_TYPES):
             return Size(self._magnitude % other)
+        if is_size_array(other):
+            return NotImplemented
         raise SizeNonsensicalBinOpError("%", other)
 
     def __rmod__(self, other):
         # self * div + mod = other
         # Therefore, T(mod) = T(other) and T(other) = Size.
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("rmod", other)
-        return Size(int(other) % self._magnitude)
+        return from_magnitude(other._magnitude % self._magnitude)
 
     def __mul__(self, other):
         # self * other = mul
         # Therefore, T(mul) = Size and T(other) is a numeric type.
+        if isinstance(other, six.integer_types):
+            return from_magnitude(self._magnitude * other)
         if isinstance(other, self._NUMERIC_TYPES):
             try:
-                return Size(self._magnitude * Fraction(other))
-            except TypeError:
+                return from_magnitude(_to_magnitude(other, self._magnitude))
+            except (ValueError, TypeError):
                 raise SizeNonsensicalBinOpError("*", other)
         if isinstance(other, Size):
             raise SizePowerResultError()
+        if is_size_array(other):
+            return NotImplemented
         raise SizeNonsensicalBinOpError("*", other)
     __rmul__ = __mul__
 
@@ -253,21 +569,27 @@ class Size(object):
         raise SizeNonsensicalBinOpError("rpow", other)
 
     def __ne__(self, other):
-        return not isinstance(other, Size) or self._magnitude != int(other)
+        if isinstance(other, Size):
+            return self._magnitude != other._magnitude
+        return NotImplemented if is_size_array(other) else True
 
     def __sub__(self, other):
         # self - other = sub
         # Therefore, T(sub) = T(self) = Size and T(other) = Size.
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("-", other)
-        return Size(self._magnitude - int(other))
+        return from_magnitude(self._magnitude - other._magnitude)
 
     def __rsub__(self, other):
         # other - self = sub
         # Therefore, T(sub) = T(self) = Size and T(other) = Size.
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("rsub", other)
-        return Size(int(other) - self._magnitude)
+        return from_magnitude(other._magnitude - self._magnitude)
 
     def __truediv__(self, other):
         # other * truediv = self
@@ -276,7 +598,9 @@ class Size(object):
         # Numeric type other is not allowed, because it results
         # in a fractional size, in the general case.
         if isinstance(other, Size):
-            return Fraction(self._magnitude).__truediv__(int(other))
+            return Fraction(self._magnitude).__truediv__(other._magnitude)
+        if is_size_array(other):
+            return NotImplemented
         raise SizeNonsensicalBinOpError("truediv", other)
 
     __div__ = __truediv__
@@ -285,8 +609,10 @@ class Size(object):
         # self * truediv = other
         # Therefore, T(truediv) = Fraction and T(other) = Size.
         if not isinstance(other, Size):
+            if is_size_array(other):
+                return NotImplemented
             raise SizeNonsensicalBinOpError("rtruediv", other)
-        return Fraction(int(other)).__truediv__(self._magnitude)
+        return Fraction(other._magnitude).__truediv__(self._magnitude)
 
     __rdiv__ = __rtruediv__
 
@@ -332,21 +658,30 @@ class Size(object):
                "must be a precise positive numeric value."
             )
 
-        units = BinaryUnits if binary_units else DecimalUnits
-
         # Find the smallest prefix which will allow a number less than
         # FACTOR * min_value to the left of the decimal point.
         # If the number is so large that no prefix will satisfy this
         # requirement use the largest prefix.
-        limit = units.FACTOR * Fraction(min_value)
-        for unit in [B] + units.UNITS():
-            newcheck = self.convertTo(unit)
-
-            if abs(newcheck) < limit:
-                break
-
-        # pylint: disable=undefined-loop-variable
-        return (newcheck, unit)
+        (thresholds, units) = unit_table(min_value, binary_units)
+        unit = units[bisect_right(thresholds, abs(self._magnitude))]
+        return (Fraction(self._magnitude, int(unit)), unit)
+
+    def to_bytes(self, length=None):
+        """ Encode the number of bytes.
+
+            :param length: the number of bytes, or None for a varint
+            :type length: int or NoneType
+            :returns: the encoding
+            :rtype: bytes
+            :raises SizeValueError: if the size does not fit in length bytes
+
+            If length is given, the encoding is a little-endian two's
+            complement integer, otherwise it is a zigzag LEB128 varint,
+            which is as long as necessary. See :mod:`._serial`.
+        """
+        if length is None:
+            return encode_varint(self._magnitude)
+        return encode_fixed(self._magnitude, length)
 
     def roundTo(self, unit, rounding):
         # pylint: disable=line-too-long
@@ -368,8 +703,7 @@ class Size(object):
             raise SizeValueError(factor, "factor")
 
         if factor == 0:
-            return Size(0)
+            return from_magnitude(0)
 
-        magnitude = self._magnitude / Fraction(factor)
-        rounded = round_fraction(magnitude, rounding)
-        return Size(rounded * factor)
+        rounded = round_quotient(self._magnitude, factor, rounding)
+        return from_magnitude(rounded * factor)
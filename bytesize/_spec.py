@@ -0,0 +1,145 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Format specifications for Size.__format__.
+
+    The grammar of a specification is::
+
+        [[fill]align][width][.places][type][unit]
+
+    where fill is any character, align is one of "<", ">" or "^", and
+    width and places are non-negative integers. The type is "f", to
+    show all places, or "g", to strip trailing zeros. The unit is a
+    unit symbol, such as "GiB", "MB" or "B", to show the size in that
+    unit; "h", to choose a binary unit; or "H", to choose an SI unit.
+
+    Where places, type or unit are omitted, the str() configuration
+    in effect decides, so the empty specification is the same as str().
+    Sizes are aligned on the right unless an alignment is given.
+"""
+
+import re
+
+from ._config import StrConfig
+
+from ._constants import UNITS
+
+from ._errors import SizeValueError
+
+_GRAMMAR = re.compile(
+   r"""\A
+   (?:(?P<fill>.)?(?P<align>[<>^]))?
+   (?P<width>\d+)?
+   (?:\.(?P<places>\d+))?
+   (?P<type>[fg])?
+   (?P<unit>[A-Za-z]*)
+   \Z""",
+   re.DOTALL | re.VERBOSE
+)
+
+_UNITS = dict((str(unit), unit) for unit in UNITS())
+
+_SPECS = {}
+_SPECS_MAX = 256
+
+class SpecFormatter(object):
+    """ Formats sizes according to a format specification. """
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("_factor", "_formatter", "_padding", "_suffix")
+
+    def __init__(self, spec, config):
+        """ Initializer.
+
+            :param str spec: the format specification
+            :param :class:`._config.StrConfig` config: the configuration
+               for whatever the specification omits
+            :raises SizeValueError: if the specification is not valid
+        """
+        match = _GRAMMAR.match(spec)
+        if match is None:
+            raise SizeValueError(spec, "spec", "not a format specification")
+
+        (fill, align, width, places, kind, unit) = match.group(
+           "fill",
+           "align",
+           "width",
+           "places",
+           "type",
+           "unit"
+        )
+
+        binary_units = config.binary_units
+        if unit in ("h", "H"):
+            binary_units = unit == "h"
+            unit = ""
+        if unit != "" and unit not in _UNITS:
+            raise SizeValueError(spec, "spec", "unknown unit")
+
+        self._formatter = StrConfig(
+           max_places=config.max_places if places is None else int(places),
+           strip=config.strip if kind is None else kind == "g",
+           min_value=config.min_value,
+           binary_units=binary_units
+        ).formatter
+
+        if unit == "":
+            (self._factor, self._suffix) = (None, None)
+        else:
+            (self._factor, self._suffix) = (int(_UNITS[unit]), " " + unit)
+
+        if width is None:
+            self._padding = None
+        else:
+            self._padding = (fill or "") + (align or ">") + width
+
+    def __call__(self, magnitude):
+        """ Format a size.
+
+            :param int magnitude: the number of bytes
+            :returns: the formatted size
+            :rtype: str
+        """
+        if self._factor is None:
+            ret = self._formatter(magnitude)
+        else:
+            ret = self._formatter.format_value(magnitude, self._factor) + \
+               self._suffix
+
+        if self._padding is None:
+            return ret
+        return format(ret, self._padding)
+
+def spec_formatter(spec, config):
+    """ Get the formatter for a format specification.
+
+        :param str spec: the format specification
+        :param :class:`._config.StrConfig` config: the configuration
+           for whatever the specification omits
+        :returns: the formatter
+        :rtype: :class:`SpecFormatter`
+        :raises SizeValueError: if the specification is not valid
+
+        Formatters are constructed once for each pair of arguments.
+    """
+    key = (spec, config)
+    formatter = _SPECS.get(key)
+    if formatter is None:
+        formatter = SpecFormatter(spec, config)
+        if len(_SPECS) >= _SPECS_MAX:
+            _SPECS.clear()
+        _SPECS[key] = formatter
+    return formatter
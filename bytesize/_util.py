@@ -20,15 +20,245 @@
 
 from decimal import Decimal
 from decimal import DefaultContext
+from decimal import Inexact
 from decimal import InvalidOperation
 from decimal import localcontext
+from decimal import ROUND_HALF_EVEN
+from decimal import Rounded
 from fractions import Fraction
 
 import six
 
+from . import _instrument
+
+from ._constants import B
+from ._constants import BinaryUnits
+from ._constants import DecimalUnits
 from ._constants import RoundingMethods
 from ._errors import SizeValueError
 
+_UNIT_TABLES = {}
+_UNIT_TABLES_MAX = 64
+
+# Coefficients with more bits than this are rendered by the decimal
+# module, since str() on very large ints may be slow or disallowed.
+_MAX_RENDER_BITS = 12000
+
+# The exponent limits of the decimal module's default context.
+_DEFAULT_EMIN = -999999
+_DEFAULT_EMAX = 999999
+
+def integer_context(context):
+    """ Whether the integer rendering engine agrees with context.
+
+        :param context: a decimal context
+        :type context: :class:`decimal.Context`
+        :returns: True if render_magnitude may be used for context
+        :rtype: bool
+
+        The engine rounds half to even, signals nothing, writes
+        exponents with a capital E, never pads a coefficient with zeros
+        to clamp its exponent, and does not limit exponents. So it can
+        stand in for a context only if the context does likewise, with
+        exponent limits no tighter than those of the default context.
+    """
+    return context.rounding == ROUND_HALF_EVEN and \
+       not context.traps[Inexact] and \
+       not context.traps[Rounded] and \
+       context.capitals == 1 and \
+       context.clamp == 0 and \
+       context.Emin <= _DEFAULT_EMIN and \
+       context.Emax >= _DEFAULT_EMAX
+
+def _adjusted_exponent(numerator, denominator):
+    """ The exponent of the leading digit of a positive quotient.
+
+        :param int numerator: the numerator, positive
+        :param int denominator: the denominator, positive
+        :returns: a, such that 10**a <= numerator/denominator < 10**(a+1)
+        :rtype: int
+    """
+    def at_least(exponent):
+        """ Whether the quotient is at least 10**exponent. """
+        if exponent >= 0:
+            return numerator >= denominator * 10 ** exponent
+        return numerator * 10 ** -exponent >= denominator
+
+    # log10(2) ~ 0.30103; the estimate is off by at most one or two.
+    exponent = \
+       (numerator.bit_length() - denominator.bit_length()) * 30103 // 100000
+    while at_least(exponent + 1):
+        exponent += 1
+    while not at_least(exponent):
+        exponent -= 1
+    return exponent
+
+def _round_half_even(quotient, remainder, divisor):
+    """ Round the result of an integer division half to even.
+
+        :param int quotient: the quotient, non-negative
+        :param int remainder: the remainder, non-negative
+        :param int divisor: the divisor, positive
+        :returns: the rounded quotient
+        :rtype: int
+    """
+    twice = 2 * remainder
+    if twice > divisor or (twice == divisor and quotient % 2 == 1):
+        return quotient + 1
+    return quotient
+
+def divide_to_precision(numerator, denominator, prec):
+    """ Divide as the decimal module does for a given precision.
+
+        :param int numerator: the numerator, non-negative
+        :param int denominator: the denominator, positive
+        :param int prec: the number of significant digits
+        :returns: a pair of coefficient and exponent
+        :rtype: tuple of int * int
+
+        The result is that of Decimal(numerator)/Decimal(denominator)
+        in a context with precision prec and ROUND_HALF_EVEN rounding.
+        The quotient is rounded to prec significant digits; if it is
+        exact, it is given with an exponent as near to 0 as possible.
+    """
+    if numerator == 0:
+        return (0, 0)
+
+    shift = prec - 1 - _adjusted_exponent(numerator, denominator)
+    if shift >= 0:
+        divisor = denominator
+        (quotient, remainder) = divmod(numerator * 10 ** shift, divisor)
+    else:
+        divisor = denominator * 10 ** -shift
+        (quotient, remainder) = divmod(numerator, divisor)
+
+    if remainder != 0:
+        quotient = _round_half_even(quotient, remainder, divisor)
+        if quotient == 10 ** prec:
+            return (quotient // 10, 1 - shift)
+        return (quotient, -shift)
+
+    exponent = -shift
+    while exponent < 0 and quotient % 10 == 0:
+        quotient //= 10
+        exponent += 1
+    return (quotient, exponent)
+
+def quantize_digits(coefficient, exponent, places):
+    """ Give a non-negative decimal number a fixed number of places.
+
+        :param int coefficient: the coefficient, non-negative
+        :param int exponent: the exponent
+        :param int places: the number of decimal places, non-negative
+        :returns: the coefficient for the exponent -places
+        :rtype: int
+
+        Rounds half to even, like Decimal.quantize; the result is
+        exact, whatever the number of digits.
+    """
+    if exponent >= -places:
+        return coefficient * 10 ** (exponent + places)
+    divisor = 10 ** (-places - exponent)
+    (quotient, remainder) = divmod(coefficient, divisor)
+    return _round_half_even(quotient, remainder, divisor)
+
+def round_ratio(numerator, denominator, places, prec):
+    """ Divide and quantize as the decimal module does.
+
+        :param int numerator: the numerator, non-negative
+        :param int denominator: the denominator, positive
+        :param int places: the number of decimal places, non-negative
+        :param int prec: the number of significant digits for the division
+        :returns: the coefficient for the exponent -places
+        :rtype: int
+
+        Same as quantize_digits applied to the result of
+        divide_to_precision, but usually with a single divmod.
+    """
+    (quotient, remainder) = divmod(numerator * 10 ** places, denominator)
+
+    # Rounding the quotient to prec digits first can only matter if
+    # it moves the quotient onto or past a point halfway between two
+    # results. The quotient is less than 10**(digits - places), so the
+    # first rounding is off by at most 10**(digits - places - prec)/2.
+    distance = abs(2 * remainder - denominator)
+    digits = quotient.bit_length() * 30103 // 100000 + 1
+    if digits < prec and distance * 10 ** (prec - digits) > denominator:
+        if 2 * remainder > denominator:
+            return quotient + 1
+        return quotient
+
+    (coefficient, exponent) = divide_to_precision(numerator, denominator, prec)
+    return quantize_digits(coefficient, exponent, places)
+
+def render_digits(negative, coefficient, exponent):
+    """ Render a decimal number as str() renders a Decimal.
+
+        :param bool negative: True if the sign is negative
+        :param int coefficient: the coefficient, non-negative
+        :param int exponent: the exponent
+        :returns: the string or None if the number is too large to render
+        :rtype: str or NoneType
+    """
+    if coefficient.bit_length() > _MAX_RENDER_BITS:
+        return None
+
+    digits = str(coefficient)
+    leftdigits = exponent + len(digits)
+    if exponent <= 0 and leftdigits > -6:
+        dotplace = leftdigits
+    else:
+        dotplace = 1
+
+    if dotplace <= 0:
+        ret = "0." + "0" * -dotplace + digits
+    elif dotplace >= len(digits):
+        ret = digits + "0" * (dotplace - len(digits))
+    else:
+        ret = digits[:dotplace] + "." + digits[dotplace:]
+
+    if leftdigits != dotplace:
+        ret = ret + "E%+d" % (leftdigits - dotplace)
+
+    return "-" + ret if negative else ret
+
+def render_magnitude(value, max_places, prec):
+    """ Convert an int or a Fraction to a decimal string with integers.
+
+        :param value: the value
+        :type value: int or Fraction
+        :param max_places: number of decimal places or None
+        :type max_places: int or NoneType
+        :param int prec: the precision of the decimal context
+        :returns: the string or None if it must be left to the decimal module
+        :rtype: str or NoneType
+
+        Produces the same string as the decimal module would under a
+        context with precision prec for which integer_context is True.
+    """
+    # An int is converted exactly; a Fraction is divided, and so is
+    # rounded to prec digits, even if its denominator is 1.
+    if not isinstance(value, Fraction):
+        (coefficient, exponent) = (abs(value), 0)
+        if max_places is not None:
+            coefficient = quantize_digits(coefficient, exponent, max_places)
+            exponent = -max_places
+    elif max_places is None:
+        (coefficient, exponent) = \
+           divide_to_precision(abs(value.numerator), value.denominator, prec)
+    else:
+        (coefficient, exponent) = (
+           round_ratio(
+              abs(value.numerator),
+              value.denominator,
+              max_places,
+              prec
+           ),
+           -max_places
+        )
+
+    return render_digits(value < 0, coefficient, exponent)
+
 def convert_magnitude(value, max_places=2, context=DefaultContext):
     """ Convert magnitude to a decimal string.
 
@@ -49,6 +279,10 @@ def convert_magnitude(value, max_places=2, context=DefaultContext):
         representation may be inexact if the number of significant digits
         is too large for the precision of the Decimal operations as
         specified by the context.
+
+        Ints and Fractions are rendered with integer arithmetic when
+        the context permits; the result is the same as that of the
+        decimal module.
     """
     if max_places is not None and \
        (max_places < 0 or not isinstance(max_places, six.integer_types)):
@@ -65,6 +299,15 @@ def convert_magnitude(value, max_places=2, context=DefaultContext):
            "must not be a float"
         )
 
+    if isinstance(value, (six.integer_types, Fraction)) and \
+       integer_context(context):
+        ret = render_magnitude(value, max_places, context.prec)
+        if ret is not None:
+            return ret
+
+    if _instrument.ENABLED:
+        _instrument.slow_path("convert_magnitude")
+
     with localcontext(context) as ctx:
         if isinstance(value, Fraction):
             value = Decimal(value.numerator)/Decimal(value.denominator)
@@ -77,6 +320,8 @@ def convert_magnitude(value, max_places=2, context=DefaultContext):
                     value = value.quantize(Decimal(10) ** -max_places)
                     break
                 except InvalidOperation:
+                    if _instrument.ENABLED:
+                        _instrument.slow_path("convert_magnitude")
                     ctx.prec += 2
 
         return str(value)
@@ -101,42 +346,103 @@ def format_magnitude(value, max_places=2, strip=False, context=DefaultContext):
 
     return ret
 
-def round_fraction(value, rounding):
-    """ Round a fraction to an integer according to rounding method.
+def divide_toward_zero(numerator, denominator):
+    """ Divide numerator by a positive denominator, rounding toward 0.
 
-        :param Fraction value: value to round
+        :param int numerator: the numerator
+        :param int denominator: the denominator, must be positive
+        :returns: the quotient, rounded toward 0
+        :rtype: int
+    """
+    if numerator < 0:
+        return -(-numerator // denominator)
+    return numerator // denominator
+
+def unit_table(min_value, binary_units):
+    """ Get the table for choosing units in which to display a magnitude.
+
+        :param min_value: Lower bound for value
+        :type min_value: A precise non-negative numeric type
+        :param bool binary_units: binary units if True, else SI
+        :returns: a pair of a list of thresholds and a list of units
+        :rtype: tuple of list of int and list of unit
+
+        The unit for a magnitude m is
+        units[bisect_right(thresholds, abs(m))]. That is the smallest
+        unit which will allow a number less than FACTOR * min_value to
+        the left of the decimal point or, if there is no such unit,
+        the largest unit.
+
+        Tables are computed once for each pair of arguments.
+    """
+    key = (min_value, binary_units)
+    table = _UNIT_TABLES.get(key)
+    if table is None:
+        if _instrument.ENABLED:
+            _instrument.slow_path("unit_table")
+        prefixes = BinaryUnits if binary_units else DecimalUnits
+        units = [B] + prefixes.UNITS()
+
+        # For a whole number m, m < limit iff m < ceil(limit).
+        thresholds = []
+        for unit in units[:-1]:
+            limit = prefixes.FACTOR * int(unit) * Fraction(min_value)
+            thresholds.append(-(-limit.numerator // limit.denominator))
+        table = (thresholds, units)
+
+        if len(_UNIT_TABLES) >= _UNIT_TABLES_MAX:
+            _UNIT_TABLES.clear()
+        _UNIT_TABLES[key] = table
+    return table
+
+def round_quotient(numerator, denominator, rounding):
+    """ Divide integers, rounding to an integer according to rounding method.
+
+        :param int numerator: the numerator
+        :param int denominator: the denominator, must be positive
         :param rounding: rounding method
         :type rounding: a member of RoundingMethods
-        :return: a rounded integer
+        :return: the rounded quotient
         :rtype: int
+        :raises SizeValueError: if rounding is not a rounding method
+
+        ROUND_DOWN and ROUND_UP round toward negative and positive
+        infinity, as do ROUND_FLOOR and ROUND_CEILING. On a tie,
+        ROUND_HALF_DOWN and ROUND_HALF_UP do likewise.
     """
     # pylint: disable=too-many-return-statements
-    (base, rest) = divmod(value.numerator, value.denominator)
-    if rest == 0:
+    (base, rest) = divmod(numerator, denominator)
+
+    if rounding is RoundingMethods.ROUND_DOWN or \
+       rounding is RoundingMethods.ROUND_FLOOR:
         return base
 
-    if rounding == RoundingMethods.ROUND_UP:
-        return base + 1
+    if rounding is RoundingMethods.ROUND_UP or \
+       rounding is RoundingMethods.ROUND_CEILING:
+        return base + 1 if rest != 0 else base
 
-    if rounding == RoundingMethods.ROUND_DOWN:
-        return base
+    twice = 2 * rest
+    if rounding is RoundingMethods.ROUND_HALF_UP:
+        return base + 1 if twice >= denominator else base
 
-    half_methods = (
-       RoundingMethods.ROUND_HALF_UP,
-       RoundingMethods.ROUND_HALF_DOWN
-    )
-    if rounding in half_methods:
-        fraction = Fraction(rest, value.denominator)
-        half = Fraction(1, 2)
-
-        if fraction < half:
-            return base
-        elif fraction > half:
+    if rounding is RoundingMethods.ROUND_HALF_DOWN:
+        return base + 1 if twice > denominator else base
+
+    if rounding is RoundingMethods.ROUND_HALF_EVEN:
+        if twice > denominator or (twice == denominator and base % 2 == 1):
             return base + 1
-        else:
-            if rounding == RoundingMethods.ROUND_HALF_UP:
-                return base + 1
-            else:
-                return base
+        return base
 
     raise SizeValueError(rounding, "rounding")
+
+def round_fraction(value, rounding):
+    """ Round a fraction to an integer according to rounding method.
+
+        :param Fraction value: value to round
+        :param rounding: rounding method
+        :type rounding: a member of RoundingMethods
+        :return: a rounded integer
+        :rtype: int
+        :raises SizeValueError: if rounding is not a rounding method
+    """
+    return round_quotient(value.numerator, value.denominator, rounding)
@@ -0,0 +1,96 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for accumulators. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from bytesize import KiB
+from bytesize import Size
+from bytesize import SizeAccumulator
+from bytesize import str_config
+
+from bytesize._errors import SizeNonsensicalBinOpError
+from bytesize._errors import SizeValueError
+
+from tests.utils import SIZE_STRATEGY
+
+class AccumulatorTestCase(unittest.TestCase):
+    """ Test SizeAccumulator. """
+
+    @given(
+       strategies.lists(
+          strategies.one_of(
+             SIZE_STRATEGY,
+             strategies.integers(min_value=-2**70, max_value=2**70)
+          )
+       )
+    )
+    def testAgreement(self, values):
+        """ Test that updates agree with Size arithmetic. """
+        accumulator = SizeAccumulator()
+        expected = Size(0)
+        for value in values:
+            same = accumulator
+            accumulator += value
+            self.assertIs(accumulator, same)
+            accumulator -= value
+            accumulator += value
+            expected = expected + Size(value)
+        self.assertEqual(accumulator.snapshot(), expected)
+        self.assertEqual(int(accumulator), int(expected))
+
+    def testSnapshot(self):
+        """ Test that a snapshot does not change with the accumulator. """
+        accumulator = SizeAccumulator(Size(1, KiB))
+        snapshot = accumulator.snapshot()
+        accumulator += 1
+        self.assertEqual(snapshot, Size(1, KiB))
+        self.assertEqual(accumulator.snapshot(), Size(1025))
+
+    def testStart(self):
+        """ Test that the initial total may be a Size or an int. """
+        self.assertEqual(SizeAccumulator().snapshot(), Size(0))
+        self.assertEqual(SizeAccumulator(0).snapshot(), Size(0))
+        self.assertEqual(SizeAccumulator(1024).snapshot(), Size(1, KiB))
+        self.assertEqual(
+           SizeAccumulator(Size(1, KiB)).snapshot(),
+           Size(1, KiB)
+        )
+
+    def testDisplay(self):
+        """ Test that display follows the configuration for Size. """
+        accumulator = SizeAccumulator(Size(1, KiB))
+        self.assertEqual(str(accumulator), str(Size(1, KiB)))
+        with str_config(strip=True):
+            self.assertEqual(str(accumulator), "1 KiB")
+        self.assertEqual(repr(accumulator), "SizeAccumulator(Size('1024'))")
+
+    def testExceptions(self):
+        """ Test bad operands. """
+        accumulator = SizeAccumulator()
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            accumulator += 1.5
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            accumulator -= "1 KiB"
+        with self.assertRaises(SizeValueError):
+            SizeAccumulator(1.5)
+        with self.assertRaises(SizeValueError):
+            SizeAccumulator("1 KiB")
+        with self.assertRaises(TypeError):
+            hash(accumulator)
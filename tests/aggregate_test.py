@@ -0,0 +1,75 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for aggregation of sizes. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from fractions import Fraction
+
+from bytesize import KiB
+from bytesize import MiB
+from bytesize import Size
+from bytesize import maximum
+from bytesize import mean
+from bytesize import minimum
+from bytesize import total
+
+from bytesize._errors import SizeValueError
+
+from tests.utils import SIZE_STRATEGY
+
+SIZES_STRATEGY = strategies.lists(SIZE_STRATEGY)
+
+class AggregateTestCase(unittest.TestCase):
+    """ Test aggregation functions. """
+
+    @given(SIZES_STRATEGY)
+    def testAgreement(self, sizes):
+        """ Test agreement with the builtin functions. """
+        self.assertEqual(total(iter(sizes)), sum(sizes, Size(0)))
+        if sizes:
+            self.assertEqual(
+               mean(iter(sizes)),
+               Fraction(sum(int(s) for s in sizes), len(sizes))
+            )
+            self.assertEqual(minimum(iter(sizes)), min(sizes))
+            self.assertEqual(maximum(iter(sizes)), max(sizes))
+
+    def testItems(self):
+        """ Test items of each kind. """
+        items = [Size(1, KiB), "1.5 KiB", (2, MiB), ("0.5", KiB)]
+        expected = 1024 + 1536 + 2 * 2**20 + 512
+        self.assertEqual(total(items), Size(expected))
+        self.assertEqual(minimum(items), Size(512))
+        self.assertEqual(maximum(items), Size(2, MiB))
+        self.assertEqual(mean(items), Fraction(expected, 4))
+
+    def testEmpty(self):
+        """ Test aggregation of no sizes. """
+        self.assertEqual(total([]), Size(0))
+        for function in (mean, minimum, maximum):
+            with self.assertRaises(SizeValueError):
+                function([])
+
+    def testExceptions(self):
+        """ Test items which are not sizes. """
+        for item in (1024, "a lot", (1, 2, 3), 1.5):
+            for function in (total, mean, minimum, maximum):
+                with self.assertRaises(SizeValueError):
+                    function([Size(1), item])
@@ -0,0 +1,378 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for SizeArray objects. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from decimal import Decimal
+from fractions import Fraction
+
+from bytesize import Size
+from bytesize import B
+from bytesize import KiB
+from bytesize import GiB
+from bytesize import YiB
+from bytesize import ROUND_HALF_UP
+from bytesize import ROUNDING_METHODS
+from bytesize import UNITS
+
+from bytesize._errors import SizeNonsensicalBinOpError
+from bytesize._errors import SizePowerResultError
+from bytesize._errors import SizeValueError
+
+try:
+    import numpy
+    from bytesize._array import SizeArray
+    from bytesize._array import round_to
+except ImportError:
+    numpy = None
+
+from tests.utils import SIZE_STRATEGY
+
+SIZES_STRATEGY = strategies.lists(SIZE_STRATEGY, min_size=1, max_size=8)
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class ConstructionTestCase(unittest.TestCase):
+    """ Test construction of SizeArray objects. """
+
+    def testExceptions(self):
+        """ Test exceptions. """
+        with self.assertRaises(SizeValueError):
+            SizeArray([1.2])
+        with self.assertRaises(SizeValueError):
+            SizeArray([Size(0)], KiB)
+        with self.assertRaises(SizeValueError):
+            SizeArray(SizeArray([0]), KiB)
+
+    def testConstruction(self):
+        """ Test the various kinds of values. """
+        sizes = SizeArray([1, "1.5", Decimal("0.5"), Fraction(1, 4)], KiB)
+        self.assertEqual(list(sizes), [Size(1024), Size(1536), Size(512), Size(256)])
+        self.assertEqual(list(SizeArray([Size(2, GiB)])), [Size(2, GiB)])
+        self.assertEqual(
+           list(SizeArray(numpy.arange(3), GiB)),
+           [Size(0), Size(1, GiB), Size(2, GiB)]
+        )
+        self.assertEqual(len(SizeArray()), 0)
+
+    def testWide(self):
+        """ Test magnitudes that do not fit in 64 bits. """
+        sizes = SizeArray(numpy.arange(3), YiB)
+        self.assertEqual(sizes[2], Size(2, YiB))
+        self.assertEqual(list(sizes + Size(1)), [Size(1), Size(1, YiB) + Size(1), Size(2, YiB) + Size(1)])
+        self.assertEqual(list(SizeArray([1]) + Size(1, YiB)), [Size(1, YiB) + Size(1)])
+
+    def testIndexing(self):
+        """ Test that single elements are Sizes. """
+        sizes = SizeArray([1, 2, 3], KiB)
+        self.assertIsInstance(sizes[0], Size)
+        self.assertEqual(sizes[-1], Size(3, KiB))
+        self.assertIsInstance(sizes[1:], SizeArray)
+        self.assertEqual(list(sizes[1:]), [Size(2, KiB), Size(3, KiB)])
+        with self.assertRaises(ValueError):
+            sizes.magnitudes[0] = 2
+
+    def testDisplay(self):
+        """ Test str and repr. """
+        sizes = SizeArray([1, 2], KiB)
+        self.assertEqual(str(sizes), "[1.00 KiB, 2.00 KiB]")
+        self.assertEqual(repr(sizes), "SizeArray([1024, 2048])")
+
+    @given(SIZES_STRATEGY)
+    def testFormatMany(self, sizes):
+        """ Test formatting all the sizes in an array at once. """
+        self.assertEqual(
+           Size.format_many(SizeArray(sizes)),
+           [str(s) for s in sizes]
+        )
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class OperationsTestCase(unittest.TestCase):
+    """ Test that operations agree with operations on Size. """
+
+    def _check(self, sizes, result, expected):
+        """ Check an array result against a list of expected results.
+
+            :param list sizes: the original Sizes
+            :param result: the array result
+            :param list expected: the expected results
+        """
+        self.assertEqual(len(result), len(sizes))
+        self.assertEqual(list(result), expected)
+
+    @given(SIZES_STRATEGY, SIZE_STRATEGY)
+    def testSizeOperations(self, sizes, other):
+        """ Test operations with a Size operand. """
+        array = SizeArray(sizes)
+        self._check(sizes, array + other, [s + other for s in sizes])
+        self._check(sizes, array - other, [s - other for s in sizes])
+        self._check(sizes, array < other, [s < other for s in sizes])
+        self._check(sizes, array >= other, [s >= other for s in sizes])
+        self._check(sizes, array == other, [s == other for s in sizes])
+        self._check(sizes, array != other, [s != other for s in sizes])
+        if int(other) != 0:
+            self._check(sizes, array // other, [s // other for s in sizes])
+            self._check(sizes, array % other, [s % other for s in sizes])
+            self._check(sizes, array / other, [s / other for s in sizes])
+            self._check(
+               sizes,
+               list(zip(*divmod(array, other))),
+               [divmod(s, other) for s in sizes]
+            )
+
+    @given(
+       SIZES_STRATEGY,
+       strategies.integers(min_value=-2**70, max_value=2**70).filter(
+          lambda x: x != 0
+       )
+    )
+    def testNumericOperations(self, sizes, other):
+        """ Test operations with an int operand. """
+        array = SizeArray(sizes)
+        self._check(sizes, array * other, [s * other for s in sizes])
+        self._check(sizes, other * array, [other * s for s in sizes])
+        self._check(sizes, array % other, [s % other for s in sizes])
+        self._check(
+           sizes,
+           list(zip(*divmod(array, other))),
+           [divmod(s, other) for s in sizes]
+        )
+
+    def testNumericDivmod(self):
+        """ Test that divmod by an int rounds as for Size. """
+        sizes = [Size(7), Size(-7), Size(6)]
+        array = SizeArray(sizes)
+        for other in (3, -3, 2**65):
+            self._check(
+               sizes,
+               list(zip(*divmod(array, other))),
+               [divmod(s, other) for s in sizes]
+            )
+
+    @given(
+       strategies.lists(
+          strategies.builds(
+             Size,
+             strategies.integers(min_value=-2**63, max_value=2**63 - 1)
+          ),
+          min_size=1,
+          max_size=8
+       ),
+       strategies.integers(min_value=-2**70, max_value=2**70).filter(
+          lambda x: x != 0
+       )
+    )
+    def testNumericFloorDiv(self, sizes, other):
+        """ Test floor division by an int operand.
+
+            Size floor division by a numeric type rounds toward 0.
+        """
+        array = SizeArray(sizes)
+        self._check(sizes, array // other, [s // other for s in sizes])
+
+    @given(SIZES_STRATEGY)
+    def testArrayOperations(self, sizes):
+        """ Test operations with a SizeArray operand. """
+        array = SizeArray(sizes)
+        other = SizeArray(reversed(sizes))
+        pairs = list(zip(sizes, reversed(sizes)))
+        self._check(sizes, array + other, [s + o for (s, o) in pairs])
+        self._check(sizes, array > other, [s > o for (s, o) in pairs])
+        self._check(sizes, -array, [-s for s in sizes])
+        self._check(sizes, abs(array), [abs(s) for s in sizes])
+
+    def testOtherNumericOperations(self):
+        """ Test operations with Decimal and Fraction operands. """
+        sizes = [Size(1023), Size(-7, KiB), Size(2, GiB)]
+        array = SizeArray(sizes)
+        for other in (Decimal("1.5"), Fraction(2, 3), Fraction(-3, 2)):
+            self._check(sizes, array * other, [s * other for s in sizes])
+            self._check(sizes, array % other, [s % other for s in sizes])
+            self._check(
+               sizes,
+               list(zip(*divmod(array, other))),
+               [divmod(s, other) for s in sizes]
+            )
+        self._check(
+           sizes,
+           array // Decimal("1.5"),
+           [s // Decimal("1.5") for s in sizes]
+        )
+
+    @given(SIZES_STRATEGY, SIZE_STRATEGY)
+    def testReflectedOperations(self, sizes, other):
+        """ Test operations with a Size as the left operand. """
+        array = SizeArray(sizes)
+        self._check(sizes, other + array, [other + s for s in sizes])
+        self._check(sizes, other - array, [other - s for s in sizes])
+        self._check(sizes, other < array, [other < s for s in sizes])
+        self._check(sizes, other <= array, [other <= s for s in sizes])
+        self._check(sizes, other > array, [other > s for s in sizes])
+        self._check(sizes, other >= array, [other >= s for s in sizes])
+        self._check(sizes, other == array, [other == s for s in sizes])
+        self._check(sizes, other != array, [other != s for s in sizes])
+        if all(int(s) != 0 for s in sizes):
+            self._check(sizes, other // array, [other // s for s in sizes])
+            self._check(sizes, other % array, [other % s for s in sizes])
+            self._check(sizes, other / array, [other / s for s in sizes])
+            self._check(
+               sizes,
+               list(zip(*divmod(other, array))),
+               [divmod(other, s) for s in sizes]
+            )
+
+    def testExceptions(self):
+        """ Test that operand types are checked as for Size. """
+        # pylint: disable=expression-not-assigned, pointless-statement
+        array = SizeArray([1, 2])
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array + 2
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array - 2
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array < 2
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array / 2
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array * "str"
+        with self.assertRaises(SizePowerResultError):
+            array * Size(2)
+        with self.assertRaises(SizePowerResultError):
+            Size(2) * array
+        with self.assertRaises(SizePowerResultError):
+            array ** 2
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            array ** array
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            2 // array
+        with self.assertRaises(ZeroDivisionError):
+            array // Size(0)
+        with self.assertRaises(ZeroDivisionError):
+            array % 0
+        self.assertFalse(numpy.any(array == 2))
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class NamedTestCase(unittest.TestCase):
+    """ Test named methods. """
+
+    @given(
+       SIZES_STRATEGY,
+       strategies.sampled_from(UNITS()),
+       strategies.sampled_from(ROUNDING_METHODS())
+    )
+    def testRoundTo(self, sizes, unit, rounding):
+        """ Test that roundTo agrees with Size.roundTo. """
+        self.assertEqual(
+           list(SizeArray(sizes).roundTo(unit, rounding)),
+           [s.roundTo(unit, rounding) for s in sizes]
+        )
+
+    @given(
+       SIZES_STRATEGY,
+       SIZE_STRATEGY.filter(lambda x: int(x) >= 0),
+       strategies.sampled_from(ROUNDING_METHODS())
+    )
+    def testRoundToFunction(self, sizes, unit, rounding):
+        """ Test that round_to agrees with Size.roundTo. """
+        self.assertEqual(
+           [int(m) for m in round_to([int(s) for s in sizes], unit, rounding)],
+           [int(s.roundTo(unit, rounding)) for s in sizes]
+        )
+
+    def testRoundToIntegers(self):
+        """ Test round_to on numpy integer arrays. """
+        values = numpy.array([2**64 - 1, 5], dtype=numpy.uint64)
+        self.assertEqual(
+           [int(m) for m in round_to(values, KiB, ROUND_HALF_UP)],
+           [2**64, 0]
+        )
+
+    @given(SIZES_STRATEGY, strategies.sampled_from(UNITS() + [None]))
+    def testConvertTo(self, sizes, unit):
+        """ Test that convertTo agrees with Size.convertTo. """
+        self.assertEqual(
+           list(SizeArray(sizes).convertTo(unit)),
+           [s.convertTo(unit) for s in sizes]
+        )
+
+    def testExceptions(self):
+        """ Test exceptions. """
+        with self.assertRaises(SizeValueError):
+            SizeArray([0]).convertTo(Size(0))
+        with self.assertRaises(SizeValueError):
+            SizeArray([0]).roundTo(Size(-1, B), ROUND_HALF_UP)
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class SerializationTestCase(unittest.TestCase):
+    """ Test binary encoding of SizeArrays. """
+
+    @given(SIZES_STRATEGY)
+    def testRoundTrip(self, sizes):
+        """ Test that arrays decode to the sizes encoded. """
+        array = SizeArray(sizes)
+        decoded = SizeArray.from_bytes(array.to_bytes())
+        self.assertEqual(list(decoded), sizes)
+        self.assertEqual(decoded.magnitudes.dtype, array.magnitudes.dtype)
+
+    def testWide(self):
+        """ Test that the wide flag is set only for wide arrays. """
+        for (sizes, flag) in (
+              ([Size(1, KiB), Size(-1)], 0),
+              ([Size(2**20, YiB), Size(-1)], 1),
+              ([], 0)
+           ):
+            array = SizeArray(sizes)
+            encoding = array.to_bytes()
+            self.assertEqual(bytearray(encoding)[5], flag)
+            self.assertEqual(list(SizeArray.from_bytes(encoding)), sizes)
+
+    def testZeroCopy(self):
+        """ Test that buffers share memory with arrays. """
+        array = SizeArray([Size(1, GiB), Size(2, KiB), Size(-3)])
+        (header, payload) = array.to_buffers()
+        self.assertTrue(payload.readonly)
+        self.assertTrue(
+           numpy.shares_memory(
+              numpy.frombuffer(payload, dtype=numpy.uint8),
+              array.magnitudes
+           )
+        )
+
+        data = bytearray(header + payload.tobytes())
+        decoded = SizeArray.from_bytes(data)
+        self.assertTrue(
+           numpy.shares_memory(
+              decoded.magnitudes,
+              numpy.frombuffer(data, dtype=numpy.uint8)
+           )
+        )
+        self.assertEqual(list(decoded), list(array))
+        self.assertEqual(list(SizeArray.from_bytes(array[::2].to_bytes())),
+           [Size(1, GiB), Size(-3)])
+
+    def testExceptions(self):
+        """ Test exceptions. """
+        encoding = SizeArray([Size(1)]).to_bytes()
+        with self.assertRaises(SizeValueError):
+            SizeArray.from_bytes(encoding[:-1])
+        with self.assertRaises(SizeValueError):
+            SizeArray.from_bytes(encoding[:8])
+        encoding = SizeArray([Size(1, YiB)]).to_bytes()
+        with self.assertRaises(SizeValueError):
+            SizeArray.from_bytes(encoding + b"\x00")
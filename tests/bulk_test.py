@@ -0,0 +1,179 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for overflow-checked arithmetic on arrays of magnitudes. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from bytesize import ROUNDING_METHODS
+
+from bytesize._errors import SizeValueError
+from bytesize._util import round_quotient
+
+try:
+    import numpy
+    from bytesize import _bulk
+except ImportError:
+    numpy = None
+
+_INT64_MIN = -2**63
+_INT64_MAX = 2**63 - 1
+
+MAGNITUDE_STRATEGY = strategies.one_of(
+   strategies.integers(min_value=_INT64_MIN, max_value=_INT64_MAX),
+   strategies.sampled_from([_INT64_MIN, _INT64_MAX, -1, 0, 1]),
+   strategies.integers(min_value=-2**90, max_value=2**90)
+)
+
+MAGNITUDES_STRATEGY = strategies.lists(MAGNITUDE_STRATEGY, max_size=8)
+
+@unittest.skipIf(numpy is None, "numpy is not available")
+class BulkTestCase(unittest.TestCase):
+    """ Test that results are exact and in the narrowest representation. """
+
+    def _check(self, result, expected):
+        """ Check an array result against a list of expected ints.
+
+            :param result: the result
+            :type result: :class:`numpy.ndarray`
+            :param list expected: the expected results
+        """
+        self.assertEqual([int(x) for x in result], expected)
+        wide = any(x < _INT64_MIN or x > _INT64_MAX for x in expected)
+        self.assertEqual(_bulk.is_wide(result), wide)
+
+    def testNarrowDifference(self):
+        """ Test that a difference of wide operands is narrowed. """
+        wide = _bulk.pack([2**63])
+        self._check(_bulk.subtract(0, wide), [-2**63])
+        self._check(_bulk.subtract(wide, 1), [2**63 - 1])
+
+    @given(MAGNITUDES_STRATEGY, MAGNITUDE_STRATEGY)
+    def testScalar(self, magnitudes, other):
+        """ Test operations with a scalar operand. """
+        array = _bulk.pack(magnitudes)
+        self._check(_bulk.add(array, other), [m + other for m in magnitudes])
+        self._check(
+           _bulk.subtract(array, other),
+           [m - other for m in magnitudes]
+        )
+        self._check(
+           _bulk.subtract(other, array),
+           [other - m for m in magnitudes]
+        )
+        self._check(
+           _bulk.multiply(array, other),
+           [m * other for m in magnitudes]
+        )
+        if other != 0:
+            self._check(
+               _bulk.floor_divide(array, other),
+               [m // other for m in magnitudes]
+            )
+            self._check(
+               _bulk.modulo(array, other),
+               [m % other for m in magnitudes]
+            )
+            self._check(
+               _bulk.truncate_divide(array, other),
+               [-(-m // other) if (m < 0) != (other < 0) else m // other \
+                  for m in magnitudes]
+            )
+
+    @given(
+       strategies.lists(
+          strategies.tuples(MAGNITUDE_STRATEGY, MAGNITUDE_STRATEGY),
+          max_size=8
+       )
+    )
+    def testArrays(self, pairs):
+        """ Test operations with an array operand. """
+        left = _bulk.pack([l for (l, _) in pairs])
+        right = _bulk.pack([r for (_, r) in pairs])
+        self._check(_bulk.add(left, right), [l + r for (l, r) in pairs])
+        self._check(_bulk.subtract(left, right), [l - r for (l, r) in pairs])
+        if all(r != 0 for (_, r) in pairs):
+            self._check(
+               _bulk.floor_divide(left, right),
+               [l // r for (l, r) in pairs]
+            )
+            self._check(_bulk.modulo(left, right), [l % r for (l, r) in pairs])
+
+    @given(MAGNITUDES_STRATEGY)
+    def testUnary(self, magnitudes):
+        """ Test unary operations. """
+        array = _bulk.pack(magnitudes)
+        self._check(_bulk.negative(array), [-m for m in magnitudes])
+        self._check(_bulk.absolute(array), [abs(m) for m in magnitudes])
+
+    def testOverflow(self):
+        """ Test that int64 overflow promotes to the wide representation. """
+        array = _bulk.pack([_INT64_MAX, 1])
+        self.assertFalse(_bulk.is_wide(array))
+        self._check(_bulk.add(array, 1), [_INT64_MAX + 1, 2])
+        self._check(_bulk.multiply(array, -1), [-_INT64_MAX, -1])
+        array = _bulk.pack([_INT64_MIN])
+        self._check(_bulk.floor_divide(array, -1), [-_INT64_MIN])
+        self._check(_bulk.multiply(array, -1), [-_INT64_MIN])
+
+    def testNarrowing(self):
+        """ Test that results that fit are narrowed. """
+        array = _bulk.pack([2**70, 1])
+        self.assertTrue(_bulk.is_wide(array))
+        self._check(_bulk.subtract(array, 2**70), [0, 1 - 2**70])
+        self._check(_bulk.modulo(array, 3), [2**70 % 3, 1])
+        empty = _bulk.pack([])
+        self._check(_bulk.subtract(2**70, empty), [])
+        self._check(_bulk.floor_divide(2**70, empty), [])
+        self._check(_bulk.modulo(2**70, empty), [])
+
+    def testFromIntegers(self):
+        """ Test conversion of numpy integer arrays. """
+        values = numpy.array([2**64 - 1, 0], dtype=numpy.uint64)
+        self._check(_bulk.from_integers(values, 2), [2**65 - 2, 0])
+        values = numpy.array([2**40, -1], dtype=numpy.int64)
+        self._check(_bulk.from_integers(values, 2**30), [2**70, -2**30])
+
+    def testExceptions(self):
+        """ Test division by zero. """
+        array = _bulk.pack([1, 2])
+        with self.assertRaises(ZeroDivisionError):
+            _bulk.floor_divide(array, 0)
+        with self.assertRaises(ZeroDivisionError):
+            _bulk.modulo(array, _bulk.pack([1, 0]))
+
+    @given(
+       MAGNITUDES_STRATEGY,
+       strategies.one_of(
+          strategies.integers(min_value=0, max_value=70).map(lambda n: 2**n),
+          strategies.integers(min_value=1, max_value=2**70),
+          strategies.sampled_from([3, 1000, 2**63 - 1, 2**63 + 1])
+       ),
+       strategies.sampled_from(ROUNDING_METHODS())
+    )
+    def testRoundTo(self, magnitudes, factor, rounding):
+        """ Test rounding to multiples of a factor. """
+        self._check(
+           _bulk.round_to(_bulk.pack(magnitudes), factor, rounding),
+           [round_quotient(m, factor, rounding) * factor for m in magnitudes]
+        )
+
+    def testRoundToExceptions(self):
+        """ Test rounding with an unknown method. """
+        with self.assertRaises(SizeValueError):
+            _bulk.round_to(_bulk.pack([1]), 4, "a string")
@@ -0,0 +1,75 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for the cache of rendered sizes. """
+
+import threading
+import unittest
+
+from bytesize import StrConfig
+
+from bytesize._cache import RenderCache
+
+class RenderCacheTestCase(unittest.TestCase):
+    """ Test the render cache. """
+
+    def testEviction(self):
+        """ Test that the least recently used entry is evicted. """
+        cache = RenderCache(2)
+        config = StrConfig()
+        cache.render(1, config)
+        cache.render(2, config)
+        cache.render(1, config)
+        cache.render(3, config)
+        cache.render(1, config)
+        self.assertEqual(tuple(cache.info()), (2, 3, 2, 2))
+        cache.render(2, config)
+        self.assertEqual(cache.info().misses, 4)
+
+    def testConfigs(self):
+        """ Test that entries for different configurations are distinct. """
+        cache = RenderCache()
+        self.assertEqual(cache.render(1024, StrConfig()), "1.00 KiB")
+        self.assertEqual(cache.render(1024, StrConfig(strip=True)), "1 KiB")
+
+    def testClear(self):
+        """ Test that clearing removes entries and statistics. """
+        cache = RenderCache()
+        cache.render(1, StrConfig())
+        cache.clear()
+        self.assertEqual(tuple(cache.info()), (0, 0, 128, 0))
+
+    def testThreads(self):
+        """ Test that concurrent use is counted exactly. """
+        cache = RenderCache(8)
+        config = StrConfig()
+
+        def work():
+            """ Render a few sizes many times. """
+            for i in range(1000):
+                self.assertEqual(
+                   cache.render(i % 16, config),
+                   config.formatter(i % 16)
+                )
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 4000)
+        self.assertLessEqual(info.currsize, 8)
@@ -17,14 +17,51 @@
 # Red Hat Author(s): Anne Mulhern <amulhern@redhat.com>
 
 """ Test for configuration classes. """
+import pickle
 import unittest
 
+from bytesize import Size
+from bytesize import format_many
+from bytesize import str_config
+
 from bytesize._config import Defaults
+from bytesize._config import StrConfig
 
 class ConfigTestCase(unittest.TestCase):
     """ Exercise methods of configuration classes. """
-    # pylint: disable=too-few-public-methods
 
     def testStrConfigObject(self):
         """ Miscellaneous tests for string configuration. """
         self.assertIsNotNone(str(Defaults.STR_CONFIG))
+
+    def testPickle(self):
+        """ Test that an unpickled configuration formats as the original. """
+        config = StrConfig(max_places=3, strip=True)
+        expected = config.formatter(Size(1536))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(config, protocol))
+            self.assertEqual(unpickled.formatter(Size(1536)), expected)
+
+    def testLegacyPickle(self):
+        """ Test a configuration pickled before it had a formatter. """
+        legacy = [
+           b'ccopy_reg\n_reconstructor\np0\n(cbytesize._config\nStrConfig'
+           b'\np1\nc__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\nV_max_places'
+           b'\np6\nI3\nsV_strip\np7\nI01\nsV_min_value\np8\nI1\n'
+           b'sV_binary_units\np9\nI01\nsb.',
+           b'\x80\x02cbytesize._config\nStrConfig\nq\x00)\x81q\x01}q\x02('
+           b'X\x0b\x00\x00\x00_max_placesq\x03K\x03X\x06\x00\x00\x00_strip'
+           b'q\x04\x88X\n\x00\x00\x00_min_valueq\x05K\x01X\r\x00\x00\x00'
+           b'_binary_unitsq\x06\x88ub.'
+        ]
+        sizes = [Size(1536), Size(2**20)]
+        for data in legacy:
+            config = pickle.loads(data)
+            expected = [
+               StrConfig(max_places=3, strip=True).formatter(s)
+               for s in sizes
+            ]
+            self.assertEqual([config.formatter(s) for s in sizes], expected)
+            self.assertEqual(format_many(sizes, config), expected)
+            with str_config(config):
+                self.assertEqual([str(s) for s in sizes], expected)
@@ -0,0 +1,110 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for counters shared between threads. """
+
+import threading
+import unittest
+
+from bytesize import KiB
+from bytesize import Size
+from bytesize import SizeCounter
+from bytesize import str_config
+
+from bytesize._errors import SizeNonsensicalBinOpError
+
+class CounterTestCase(unittest.TestCase):
+    """ Test SizeCounter. """
+
+    def testThreads(self):
+        """ Test that no addition from any thread is lost. """
+        counter = SizeCounter()
+        start = threading.Barrier(8) if hasattr(threading, "Barrier") \
+           else None
+
+        def work(index):
+            """ Add to the counter many times. """
+            if start is not None:
+                start.wait()
+            for _ in range(10000):
+                counter.add(index)
+                counter.add(Size(1, KiB))
+
+        threads = [
+           threading.Thread(target=work, args=(i,)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+           counter.snapshot(),
+           Size(10000 * (sum(range(8)) + 8 * 1024))
+        )
+
+    def testReadWhileAdding(self):
+        """ Test that reads during additions see a count so far. """
+        counter = SizeCounter()
+        done = threading.Event()
+        seen = []
+
+        def read():
+            """ Read the counter until the additions are done. """
+            while not done.is_set():
+                seen.append(int(counter))
+
+        reader = threading.Thread(target=read)
+        reader.start()
+        for _ in range(10000):
+            counter.add(1)
+        done.set()
+        reader.join()
+        self.assertEqual(seen, sorted(seen))
+        self.assertTrue(all(0 <= s <= 10000 for s in seen))
+        self.assertEqual(int(counter), 10000)
+
+    def testExitedThreads(self):
+        """ Test that the shards of exited threads are retired. """
+        # pylint: disable=protected-access
+        counter = SizeCounter()
+        for index in range(2000):
+            thread = threading.Thread(target=counter.add, args=(index,))
+            thread.start()
+            thread.join()
+            self.assertLessEqual(len(counter._shards), 2)
+        self.assertEqual(int(counter), sum(range(2000)))
+        self.assertLessEqual(len(counter._shards), 1)
+
+        counter.add(1)
+        self.assertEqual(int(counter), sum(range(2000)) + 1)
+        self.assertEqual(len(counter._shards), 1)
+
+    def testDisplay(self):
+        """ Test that display follows the configuration for Size. """
+        counter = SizeCounter()
+        counter += Size(1, KiB)
+        self.assertEqual(str(counter), str(Size(1, KiB)))
+        with str_config(strip=True):
+            self.assertEqual(str(counter), "1 KiB")
+        self.assertEqual(repr(counter), "SizeCounter(Size('1024'))")
+
+    def testExceptions(self):
+        """ Test bad amounts. """
+        counter = SizeCounter()
+        with self.assertRaises(SizeNonsensicalBinOpError):
+            counter.add(1.5)
+        with self.assertRaises(TypeError):
+            hash(counter)
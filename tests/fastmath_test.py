@@ -0,0 +1,77 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for unchecked arithmetic. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from decimal import Decimal
+from decimal import localcontext
+
+from bytesize import FastMath
+from bytesize import Size
+
+from tests.utils import SIZE_STRATEGY
+
+INTEGERS_STRATEGY = strategies.integers(min_value=-2**70, max_value=2**70)
+
+class FastMathTestCase(unittest.TestCase):
+    """ Test that FastMath agrees with Size. """
+
+    def _checkSize(self, result, expected):
+        """ Check that result is a Size equal to expected. """
+        self.assertIs(type(result), Size)
+        self.assertEqual(result, expected)
+
+    @given(SIZE_STRATEGY, SIZE_STRATEGY)
+    def testSizes(self, left, right):
+        """ Test operations on two Sizes. """
+        self._checkSize(FastMath.add(left, right), left + right)
+        self._checkSize(FastMath.subtract(left, right), left - right)
+        if right != Size(0):
+            self.assertEqual(FastMath.floor_divide(left, right), left // right)
+            self.assertEqual(FastMath.divide(left, right), left / right)
+            self._checkSize(FastMath.modulo(left, right), left % right)
+
+    @given(SIZE_STRATEGY, INTEGERS_STRATEGY)
+    def testNumbers(self, size, number):
+        """ Test operations on a Size and an int. """
+        self._checkSize(FastMath.multiply(size, number), size * number)
+        if number != 0:
+            with localcontext() as context:
+                context.prec = 100
+                expected = Size(Decimal(int(size)).__floordiv__(number))
+            self._checkSize(FastMath.truncate_divide(size, number), expected)
+            if abs(int(expected)) < 10 ** 28:
+                self._checkSize(
+                   FastMath.truncate_divide(size, number),
+                   size // number
+                )
+
+    @given(SIZE_STRATEGY)
+    def testUnary(self, size):
+        """ Test operations on one Size. """
+        self._checkSize(FastMath.negative(size), -size)
+        self._checkSize(FastMath.absolute(size), abs(size))
+
+    @given(strategies.lists(SIZE_STRATEGY), SIZE_STRATEGY)
+    def testTotal(self, sizes, start):
+        """ Test totals. """
+        expected = Size(sum(int(s) for s in sizes))
+        self._checkSize(FastMath.total(sizes), expected)
+        self._checkSize(FastMath.total(sizes, start), expected + start)
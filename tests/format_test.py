@@ -0,0 +1,257 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for formatters compiled from string configurations. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from decimal import Decimal
+from decimal import DefaultContext
+from decimal import ROUND_HALF_EVEN
+from decimal import ROUND_HALF_UP
+from fractions import Fraction
+
+from bytesize import MiB
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import UNITS
+from bytesize import format_column
+from bytesize import format_magnitude
+from bytesize import format_many
+
+from bytesize._errors import SizeValueError
+
+from tests.utils import SIZE_STRATEGY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CONFIG_STRATEGY = strategies.builds(
+   StrConfig,
+   strategies.one_of(strategies.none(), strategies.integers(0, 30)),
+   strategies.booleans(),
+   strategies.sampled_from([0, Decimal("0.001"), Decimal("0.1"), 1, 10]),
+   strategies.booleans()
+)
+
+def _reference(size, config):
+    """ Format size as __str__ did before formatters were compiled.
+
+        :param :class:`Size` size: the size
+        :param :class:`StrConfig` config: the configuration
+        :returns: the formatted size
+        :rtype: str
+    """
+    (magnitude, units) = size.components(
+       min_value=config.min_value,
+       binary_units=config.binary_units
+    )
+    res = format_magnitude(
+       magnitude,
+       max_places=config.max_places,
+       strip=config.strip
+    )
+    return res + " " + units.abbr + "B"
+
+class StrFormatterTestCase(unittest.TestCase):
+    """ Test compiled formatters. """
+
+    @given(
+       strategies.one_of(
+          SIZE_STRATEGY,
+          strategies.builds(
+             Size,
+             strategies.integers(min_value=-2**100, max_value=2**100)
+          )
+       ),
+       CONFIG_STRATEGY
+    )
+    def testAgreement(self, s, config):
+        """ Test that formatting agrees with components and format_magnitude.
+        """
+        self.assertEqual(config.formatter(s), _reference(s, config))
+        self.assertEqual(config.formatter(int(s)), _reference(s, config))
+
+    def testCompiledOnce(self):
+        """ Test that the formatter is constructed only once. """
+        config = StrConfig()
+        self.assertIs(config.formatter, config.formatter)
+
+    def testDefaultContext(self):
+        """ Test that formatting follows changes to DefaultContext. """
+        sizes = [Size(1023), Size(1537), Size(2**40 + 1)]
+        configs = [StrConfig(max_places=None), StrConfig()]
+        for config in configs:
+            self.assertEqual(
+               [config.formatter(s) for s in sizes],
+               [_reference(s, config) for s in sizes]
+            )
+
+        saved = DefaultContext.copy()
+        try:
+            for (prec, rounding, capitals) in [
+                  (3, ROUND_HALF_EVEN, 1),
+                  (3, ROUND_HALF_EVEN, 0),
+                  (28, ROUND_HALF_UP, 1),
+                  (5, ROUND_HALF_UP, 0)
+               ]:
+                DefaultContext.prec = prec
+                DefaultContext.rounding = rounding
+                DefaultContext.capitals = capitals
+                for config in configs:
+                    expected = [_reference(s, config) for s in sizes]
+                    self.assertEqual(
+                       [config.formatter(s) for s in sizes],
+                       expected
+                    )
+                    self.assertEqual(format_many(sizes, config), expected)
+        finally:
+            DefaultContext.prec = saved.prec
+            DefaultContext.rounding = saved.rounding
+            DefaultContext.capitals = saved.capitals
+
+    def testExceptions(self):
+        """ Test that an unusable configuration raises an exception. """
+        with self.assertRaises(SizeValueError):
+            StrConfig(max_places=-1).formatter # pylint: disable=expression-not-assigned
+        with self.assertRaises(SizeValueError):
+            StrConfig(min_value=-1).formatter # pylint: disable=expression-not-assigned
+
+class FormatManyTestCase(unittest.TestCase):
+    """ Test formatting many sizes at once. """
+
+    @given(
+       strategies.lists(
+          strategies.one_of(
+             strategies.integers(min_value=-2**63, max_value=2**63 - 1),
+             strategies.integers(min_value=-2**20, max_value=2**20)
+          )
+       ),
+       CONFIG_STRATEGY
+    )
+    def testAgreement(self, magnitudes, config):
+        """ Test that each result is the same as for the formatter. """
+        expected = [config.formatter(m) for m in magnitudes]
+        self.assertEqual(format_many(magnitudes, config), expected)
+        sizes = [Size(m) for m in magnitudes]
+        self.assertEqual(format_many(sizes, config), expected)
+        if numpy is not None:
+            self.assertEqual(
+               format_many(numpy.array(magnitudes, dtype=numpy.int64), config),
+               expected
+            )
+
+    @given(
+       strategies.lists(
+          strategies.integers(min_value=-2**100, max_value=2**100)
+       )
+    )
+    def testWide(self, magnitudes):
+        """ Test sizes which do not fit in 64 bits. """
+        self.assertEqual(
+           format_many(magnitudes),
+           [str(Size(m)) for m in magnitudes]
+        )
+
+    def testHalfway(self):
+        """ Test values halfway between two results. """
+        magnitudes = [5, 128, -128, 1536, 3 * 2**19, 2**59 + 2**58]
+        config = StrConfig(max_places=2)
+        self.assertEqual(
+           format_many(magnitudes, config),
+           [config.formatter(m) for m in magnitudes]
+        )
+
+    def testExtremes(self):
+        """ Test the smallest and largest 64 bit magnitudes. """
+        magnitudes = [-2**63, 2**63 - 1]
+        for config in (StrConfig(), StrConfig(0, True, 0, False)):
+            expected = [config.formatter(m) for m in magnitudes]
+            self.assertEqual(format_many(magnitudes, config), expected)
+
+    def testDefault(self):
+        """ Test that the default configuration is that of str(). """
+        self.assertEqual(format_many([Size(1024)]), [str(Size(1024))])
+
+class FormatColumnTestCase(unittest.TestCase):
+    """ Test formatting a column of sizes in a single unit. """
+
+    @given(
+       strategies.lists(
+          strategies.integers(min_value=-2**63, max_value=2**63 - 1),
+          min_size=1
+       ),
+       CONFIG_STRATEGY,
+       strategies.one_of(
+          strategies.none(),
+          strategies.integers(min_value=1, max_value=100)
+       )
+    )
+    def testColumn(self, magnitudes, config, percentile):
+        """ Test that every size is converted to the chosen unit. """
+        column = format_column(magnitudes, config, percentile)
+
+        ordered = sorted(abs(m) for m in magnitudes)
+        if percentile is None:
+            reference = ordered[-1]
+        else:
+            rank = -(-percentile * len(ordered) // 100)
+            reference = ordered[max(rank, 1) - 1]
+        suffix = config.formatter(reference).split(" ")[1]
+
+        factors = dict((unit.abbr + "B", int(unit)) for unit in UNITS())
+        self.assertEqual(len(set(len(text) for text in column)), 1)
+        for (m, text) in zip(magnitudes, column):
+            (number, unit) = text.split()
+            self.assertEqual(unit, suffix)
+            self.assertEqual(
+               number,
+               format_magnitude(
+                  Fraction(m, factors[unit]),
+                  max_places=config.max_places,
+                  strip=config.strip
+               )
+            )
+        if numpy is not None:
+            self.assertEqual(
+               format_column(numpy.array(magnitudes), config, percentile),
+               column
+            )
+
+    def testAlignment(self):
+        """ Test a column chosen by its largest size. """
+        self.assertEqual(
+           format_column([Size(1), Size(1536), Size(-5, MiB)]),
+           [" 0.00 MiB", " 0.00 MiB", "-5.00 MiB"]
+        )
+        self.assertEqual(
+           format_column([Size(1), Size(1536), Size(-5, MiB)], percentile=50),
+           ["    0.00 KiB", "    1.50 KiB", "-5120.00 KiB"]
+        )
+
+    def testExceptions(self):
+        """ Test bad percentiles. """
+        for percentile in (0, -1, 101):
+            with self.assertRaises(SizeValueError):
+                format_column([Size(1)], percentile=percentile)
+
+    def testEmpty(self):
+        """ Test an empty column. """
+        self.assertEqual(format_column([]), [])
@@ -0,0 +1,119 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for the cost of importing bytesize. """
+
+import subprocess
+import sys
+import unittest
+
+import bytesize
+
+# The largest acceptable time to import bytesize, as a multiple of the
+# time to import decimal and fractions, in the same fresh interpreter.
+# bytesize takes about as long as those two; importing numpy takes
+# many times as long.
+IMPORT_BUDGET = 2
+
+# Modules which importing bytesize must not import.
+DEFERRED_MODULES = [
+   "bytesize._accumulator",
+   "bytesize._aggregate",
+   "bytesize._array",
+   "bytesize._bulk",
+   "bytesize._counter",
+   "bytesize._fastmath",
+   "numpy"
+]
+
+def _run(*args):
+    """ Run a fresh interpreter.
+
+        :param args: the arguments to the interpreter
+        :returns: what the interpreter wrote to stdout and stderr
+        :rtype: tuple of str * str
+    """
+    process = subprocess.Popen(
+       [sys.executable] + list(args),
+       stdout=subprocess.PIPE,
+       stderr=subprocess.PIPE,
+       universal_newlines=True
+    )
+    (out, err) = process.communicate()
+    if process.returncode != 0:
+        raise AssertionError(err)
+    return (out, err)
+
+class ImportTestCase(unittest.TestCase):
+    """ Test what importing bytesize does. """
+
+    def testDeferred(self):
+        """ Test that importing bytesize does not import some modules. """
+        (out, _) = _run(
+           "-c",
+           "import sys; import bytesize; "
+           "print(' '.join(sorted(m for m in sys.modules)))"
+        )
+        self.assertEqual(
+           [m for m in DEFERRED_MODULES if m in out.split()],
+           []
+        )
+
+    @unittest.skipIf(
+       sys.version_info < (3, 7),
+       "-X importtime is not supported"
+    )
+    def testBudget(self):
+        """ Test that importing bytesize takes no more than the budget.
+
+            decimal, fractions and six are imported first, so that the
+            time for bytesize is only that for the modules it adds.
+        """
+        times = {"bytesize": [], "reference": []}
+        for _ in range(5):
+            (_, err) = _run(
+               "-X",
+               "importtime",
+               "-c",
+               "import decimal, fractions, six; import bytesize"
+            )
+            cumulative = {}
+            for line in err.splitlines():
+                fields = [field.strip() for field in line.split("|")]
+                cumulative[fields[-1]] = fields[1]
+            times["bytesize"].append(int(cumulative["bytesize"]))
+            times["reference"].append(
+               int(cumulative["decimal"]) + int(cumulative["fractions"])
+            )
+        self.assertLessEqual(
+           min(times["bytesize"]),
+           IMPORT_BUDGET * min(times["reference"])
+        )
+
+    def testNames(self):
+        """ Test that names imported on first use are available. """
+        # pylint: disable=protected-access
+        for name in bytesize._LAZY_NAMES:
+            try:
+                value = getattr(bytesize, name)
+            except AttributeError:
+                self.assertIn(name, ("SizeArray", "round_to"))
+                continue
+            self.assertIs(getattr(bytesize, name), value)
+            self.assertIn(name, dir(bytesize))
+        # pylint: disable=no-member, pointless-statement
+        with self.assertRaises(AttributeError):
+            bytesize.SizeFrobnicator
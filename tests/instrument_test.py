@@ -0,0 +1,119 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for instrumentation. """
+
+from decimal import Decimal
+from fractions import Fraction
+import threading
+import unittest
+
+import bytesize
+
+from bytesize import KiB
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import disable_instrumentation
+from bytesize import enable_instrumentation
+from bytesize import instrumentation_snapshot
+from bytesize import reset_instrumentation
+
+from bytesize import _util
+
+class InstrumentationTestCase(unittest.TestCase):
+    """ Test instrumentation. """
+
+    def setUp(self):
+        # A unit table is built, and counted, only on a cache miss.
+        _util._UNIT_TABLES.clear() # pylint: disable=protected-access
+        reset_instrumentation()
+
+    def tearDown(self):
+        disable_instrumentation()
+        reset_instrumentation()
+
+    def testDisabled(self):
+        """ Test that nothing is counted or replaced while disabled. """
+        originals = (Size.__init__, Size.components, _util.convert_magnitude)
+        enable_instrumentation()
+        enable_instrumentation()
+        self.assertIsNot(Size.__init__, originals[0])
+        disable_instrumentation()
+        self.assertEqual(
+           (Size.__init__, Size.components, _util.convert_magnitude),
+           originals
+        )
+        Size("1.5", KiB).components()
+        self.assertEqual(instrumentation_snapshot(), {})
+
+    def testCalls(self):
+        """ Test that calls are counted and timed. """
+        enable_instrumentation()
+        for i in range(10):
+            Size(i)
+        str(Size(1, KiB))
+        snapshot = instrumentation_snapshot()
+        self.assertEqual(snapshot["Size.__init__"]["calls"], 11)
+        self.assertEqual(snapshot["Size.__init__"]["slow"], 0)
+        self.assertGreater(snapshot["Size.__init__"]["seconds"], 0)
+        self.assertEqual(snapshot["Size.__str__"]["calls"], 1)
+
+        reset_instrumentation()
+        self.assertEqual(instrumentation_snapshot(), {})
+
+    def testSlowPaths(self):
+        """ Test that slow paths are counted against callers. """
+        enable_instrumentation()
+        Size("1.5", KiB)
+        Size(Fraction(3, 2), KiB)
+        Size(1).components(min_value=Decimal("0.125"))
+        bytesize.convert_magnitude(Fraction(1, 3), 40)
+        bytesize.convert_magnitude(Decimal("1.5"))
+        bytesize.convert_magnitude(Decimal("1e30"), 2)
+
+        snapshot = instrumentation_snapshot()
+        self.assertEqual(snapshot["Size.__init__"]["slow"], 1)
+        self.assertEqual(snapshot["Size.components"]["slow"], 1)
+        # Decimals are converted with Decimal arithmetic, and 1e30 needs
+        # three increases of precision to be quantized to two places.
+        self.assertEqual(snapshot["convert_magnitude"]["calls"], 3)
+        self.assertEqual(snapshot["convert_magnitude"]["slow"], 5)
+
+    def testFormatter(self):
+        """ Test that the formatter's Decimal fallback is counted. """
+        enable_instrumentation()
+        formatter = StrConfig().formatter
+        formatter(Size(2 ** 20000))
+        snapshot = instrumentation_snapshot()
+        self.assertEqual(snapshot["StrFormatter.format_value"]["slow"], 1)
+        self.assertEqual(snapshot["format_magnitude"]["calls"], 1)
+
+    def testThreads(self):
+        """ Test that counts from many threads are all kept. """
+        enable_instrumentation()
+        def work():
+            """ Construct sizes. """
+            for i in range(1000):
+                Size(i)
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(
+           instrumentation_snapshot()["Size.__init__"]["calls"],
+           4000
+        )
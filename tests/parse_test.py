@@ -0,0 +1,115 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for parsing sizes written with units. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from decimal import Decimal
+
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import B
+from bytesize import KB
+from bytesize import KiB
+from bytesize import GiB
+from bytesize import UNITS
+from bytesize import parse
+from bytesize import parse_many
+
+from bytesize._config import Defaults
+from bytesize._errors import SizeValueError
+
+from tests.utils import SIZE_STRATEGY
+
+class ParseTestCase(unittest.TestCase):
+    """ Test parsing of single sizes. """
+
+    def testExamples(self):
+        """ Test some typical spellings. """
+        self.assertEqual(parse("1.5 GiB"), Size("1.5", GiB))
+        self.assertEqual(parse("300MB"), Size(300000000))
+        self.assertEqual(parse("4k"), Size(4, KB))
+        self.assertEqual(parse("4 Ki"), Size(4, KiB))
+        self.assertEqual(parse(" 2 kibibytes "), Size(2, KiB))
+        self.assertEqual(parse("1 byte"), Size(1))
+        self.assertEqual(parse("-1/2 KiB"), Size(-512))
+        self.assertEqual(parse("1e3"), Size(1000))
+        self.assertEqual(parse("1EB"), Size(10**18))
+        self.assertEqual(Size.parse("-1.00 kib"), Size(-1, KiB))
+
+    def testExceptions(self):
+        """ Test unparseable texts. """
+        for text in ("", ".", "KiB", "1.2.3", "1 / 2", "1/0", "1 KiBs", "--1"):
+            with self.assertRaises(SizeValueError):
+                parse(text)
+
+    @given(
+       strategies.one_of(
+          strategies.integers(),
+          strategies.decimals().filter(lambda x: x.is_finite())
+       ),
+       strategies.sampled_from(UNITS())
+    )
+    def testAgreement(self, n, u):
+        """ Test that parsing agrees with the initializer. """
+        text = "%s %s" % (n, u)
+        self.assertEqual(parse(text), Size(n, u))
+
+class RoundTripTestCase(unittest.TestCase):
+    """ Test that whatever __str__ produces can be parsed. """
+
+    def tearDown(self):
+        """ Reset configuration to default. """
+        Size.set_str_config(Defaults.STR_CONFIG)
+
+    @given(
+       SIZE_STRATEGY,
+       strategies.one_of(strategies.none(), strategies.integers(0, 10)),
+       strategies.booleans(),
+       strategies.sampled_from([0, Decimal("0.1"), 1, 10]),
+       strategies.booleans()
+    )
+    def testRoundTrip(self, s, max_places, strip, min_value, binary_units):
+        """ Test that the parsed value is the value that was displayed. """
+        Size.set_str_config(
+           StrConfig(max_places, strip, min_value, binary_units)
+        )
+        text = str(s)
+        (number, symbol) = text.split(" ")
+        unit = [u for u in UNITS() if str(u) == symbol][0]
+        self.assertEqual(parse(text), Size(number, unit))
+
+class ParseManyTestCase(unittest.TestCase):
+    """ Test parsing of many sizes. """
+
+    def testParseMany(self):
+        """ Test results of both kinds. """
+        texts = ["1 KiB", "2B", "3 kB"]
+        sizes = parse_many(texts)
+        self.assertEqual(sizes, [Size(1, KiB), Size(2, B), Size(3, KB)])
+        packed = parse_many(iter(texts), packed=True)
+        self.assertEqual(packed.typecode, "q")
+        self.assertEqual(list(packed), [int(s) for s in sizes])
+
+    def testExceptions(self):
+        """ Test unparseable texts and unpackable magnitudes. """
+        with self.assertRaises(SizeValueError):
+            parse_many(["1 KiB", "junk"])
+        with self.assertRaises(SizeValueError):
+            parse_many(["16 EiB"], packed=True)
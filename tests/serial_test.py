@@ -0,0 +1,143 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for binary encodings of sizes. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from bytesize import Size
+from bytesize import YiB
+
+from bytesize._errors import SizeValueError
+from bytesize._serial import HEADER
+from bytesize._serial import decode_fixed
+from bytesize._serial import decode_header
+from bytesize._serial import decode_varint
+from bytesize._serial import decode_varints
+from bytesize._serial import encode_fixed
+from bytesize._serial import encode_header
+from bytesize._serial import encode_varint
+from bytesize._serial import encode_varints
+
+from tests.utils import SIZE_STRATEGY
+
+MAGNITUDES_STRATEGY = strategies.one_of(
+   strategies.integers(),
+   strategies.builds(
+      lambda n: n * int(YiB),
+      strategies.integers(min_value=-2**20, max_value=2**20)
+   )
+)
+
+class SerialTestCase(unittest.TestCase):
+    """ Test encoding and decoding of magnitudes. """
+
+    @given(MAGNITUDES_STRATEGY)
+    def testVarint(self, magnitude):
+        """ Test that varints decode to the magnitude encoded. """
+        encoding = encode_varint(magnitude)
+        self.assertEqual(
+           decode_varint(encoding),
+           (magnitude, len(encoding))
+        )
+        self.assertEqual(
+           decode_varint(memoryview(b"\x00" + encoding), 1),
+           (magnitude, len(encoding) + 1)
+        )
+
+    @given(MAGNITUDES_STRATEGY, strategies.integers(min_value=0, max_value=8))
+    def testFixed(self, magnitude, extra):
+        """ Test that fixed width encodings decode to the magnitude. """
+        length = (magnitude.bit_length() + 8) // 8 + extra
+        encoding = encode_fixed(magnitude, length)
+        self.assertEqual(len(encoding), length)
+        self.assertEqual(decode_fixed(encoding), magnitude)
+
+    @given(strategies.lists(MAGNITUDES_STRATEGY))
+    def testVarints(self, magnitudes):
+        """ Test that consecutive varints decode to the magnitudes. """
+        encoding = encode_varints(magnitudes)
+        self.assertEqual(
+           decode_varints(encoding, 0, len(magnitudes)),
+           (magnitudes, len(encoding))
+        )
+
+    def testKnown(self):
+        """ Test some encodings against known values. """
+        self.assertEqual(encode_varint(0), b"\x00")
+        self.assertEqual(encode_varint(-1), b"\x01")
+        self.assertEqual(encode_varint(1), b"\x02")
+        self.assertEqual(encode_varint(150), b"\xac\x02")
+        self.assertEqual(encode_fixed(-2, 2), b"\xfe\xff")
+        self.assertEqual(encode_fixed(1024, 4), b"\x00\x04\x00\x00")
+        self.assertEqual(
+           encode_header(3, True),
+           b"BSZA\x01\x01\x00\x00\x03\x00\x00\x00\x00\x00\x00\x00"
+        )
+        self.assertEqual(decode_header(encode_header(3, True)), (3, True))
+        self.assertEqual(HEADER.size, 16)
+
+    def testExceptions(self):
+        """ Test exceptions. """
+        with self.assertRaises(SizeValueError):
+            encode_fixed(128, 1)
+        with self.assertRaises(SizeValueError):
+            encode_fixed(-129, 1)
+        with self.assertRaises(SizeValueError):
+            encode_fixed(0, 0)
+        with self.assertRaises(SizeValueError):
+            decode_fixed(b"")
+        with self.assertRaises(SizeValueError):
+            decode_varint(b"\x80")
+        with self.assertRaises(SizeValueError):
+            decode_header(b"BSZA")
+        with self.assertRaises(SizeValueError):
+            decode_header(b"ASZB" + encode_header(0, False)[4:])
+        with self.assertRaises(SizeValueError):
+            decode_header(encode_header(0, False)[:4] + b"\x02" + b"\x00" * 11)
+
+class SizeBytesTestCase(unittest.TestCase):
+    """ Test Size.to_bytes and Size.from_bytes. """
+
+    @given(SIZE_STRATEGY)
+    def testRoundTrip(self, size):
+        """ Test that sizes decode to the size encoded. """
+        self.assertEqual(Size.from_bytes(size.to_bytes()), size)
+        length = (int(size).bit_length() + 8) // 8
+        self.assertEqual(
+           Size.from_bytes(size.to_bytes(length), length),
+           size
+        )
+
+    @given(strategies.integers(min_value=-2**20, max_value=2**20))
+    def testYiB(self, count):
+        """ Test round trips of multiples of YiB. """
+        size = Size(count, YiB)
+        self.assertEqual(Size.from_bytes(size.to_bytes()), size)
+        self.assertEqual(Size.from_bytes(size.to_bytes(16), 16), size)
+
+    def testExceptions(self):
+        """ Test exceptions. """
+        with self.assertRaises(SizeValueError):
+            Size(1, YiB).to_bytes(8)
+        with self.assertRaises(SizeValueError):
+            Size.from_bytes(b"\x00\x00", 1)
+        with self.assertRaises(SizeValueError):
+            Size.from_bytes(b"\x00\x00")
+        with self.assertRaises(SizeValueError):
+            Size.from_bytes(b"")
@@ -24,6 +24,7 @@ from hypothesis import Settings
 import unittest
 
 import copy
+import pickle
 import re
 
 from bytesize import Size
@@ -88,9 +89,38 @@ class ConversionTestCase(unittest.TestCase):
         self.assertEqual(int(match.group('val')), int(s))
 
     def testDeepCopy(self):
-        """ Test that deepcopy is different but equal. """
+        """ Test that copies of an immutable Size are the Size itself. """
         s1 = Size(0)
-        s2 = copy.deepcopy(s1)
-        self.assertEqual(s1, s2)
-        s1._magnitude += 1
-        self.assertNotEqual(s1, s2)
+        self.assertIs(copy.deepcopy(s1), s1)
+        self.assertIs(copy.copy(s1), s1)
+        sizes = [s1, Size(1)]
+        self.assertIs(copy.deepcopy(sizes)[0], s1)
+
+    @given(
+       strategies.builds(
+          Size,
+          strategies.integers(),
+          strategies.sampled_from(UNITS())
+       ),
+       strategies.integers(min_value=0, max_value=pickle.HIGHEST_PROTOCOL)
+    )
+    def testPickle(self, s, protocol):
+        """ Test that a pickled Size unpickles to an equal Size. """
+        unpickled = pickle.loads(pickle.dumps(s, protocol))
+        self.assertIs(type(unpickled), Size)
+        self.assertEqual(unpickled, s)
+
+    def testLegacyPickle(self):
+        """ Test unpickling a Size pickled before Size had __slots__. """
+        legacy = [
+           b'ccopy_reg\n_reconstructor\np0\n(cbytesize._size\nSize\np1\n'
+           b'c__builtin__\nobject\np2\nNtp3\nRp4\n(dp5\nV_magnitude\np6\n'
+           b'I1024\nsb.',
+           b'\x80\x02cbytesize._size\nSize\nq\x00)\x81q\x01}q\x02X\n\x00'
+           b'\x00\x00_magnitudeq\x03M\x00\x04sb.'
+        ]
+        for data in legacy:
+            unpickled = pickle.loads(data)
+            self.assertIs(type(unpickled), Size)
+            self.assertEqual(unpickled, Size(1024))
+            self.assertEqual(str(unpickled), str(Size(1024)))
@@ -26,6 +26,7 @@ from decimal import Decimal
 from fractions import Fraction
 
 from bytesize import B
+from bytesize import KiB
 from bytesize import Size
 from bytesize import UNITS
 
@@ -42,6 +43,8 @@ class InitializerTestCase(unittest.TestCase):
             Size("1.2.3")
         with self.assertRaises(SizeValueError):
             Size(Decimal('NaN'))
+        with self.assertRaises(SizeValueError):
+            Size(Decimal('-Infinity'), KiB)
 
         s = Size(0)
         with self.assertRaises(SizeValueError):
@@ -62,3 +65,23 @@ class InitializerTestCase(unittest.TestCase):
     def testInitialization(self, s, u):
         """ Test the initializer. """
         self.assertEqual(int(Size(s, u)), int(Fraction(s) * int(u)))
+
+    def testTruncation(self):
+        """ Test that every kind of value is rounded toward 0. """
+        self.assertEqual(Size(Decimal("-0.5")), Size(0))
+        self.assertEqual(Size(Decimal("-1.5"), KiB), Size(-1536))
+        self.assertEqual(Size(Decimal("-1.0009"), KiB), Size(-1024))
+        self.assertEqual(Size(Fraction(-1, 1025), KiB), Size(0))
+        self.assertEqual(Size(Fraction(-1025, 1024), KiB), Size(-1025))
+        self.assertEqual(Size("-1.9"), Size(-1))
+        self.assertEqual(Size(Decimal("1E+3"), KiB), Size(1000, KiB))
+
+    @given(
+       strategies.integers(),
+       strategies.integers(min_value=-40, max_value=40),
+       strategies.sampled_from(UNITS())
+    )
+    def testDecimalInitialization(self, n, e, u):
+        """ Test the initializer on Decimals with various exponents. """
+        s = Decimal(n).scaleb(e)
+        self.assertEqual(int(Size(s, u)), int(Fraction(s) * int(u)))
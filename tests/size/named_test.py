@@ -26,7 +26,10 @@ from fractions import Fraction
 
 from bytesize import Size
 from bytesize import B
+from bytesize import ROUND_CEILING
 from bytesize import ROUND_DOWN
+from bytesize import ROUND_FLOOR
+from bytesize import ROUND_HALF_EVEN
 from bytesize import ROUND_HALF_UP
 from bytesize import ROUND_UP
 from bytesize import ROUNDING_METHODS
@@ -89,6 +92,35 @@ class ComponentsTestCase(unittest.TestCase):
             self.assertIn(u, DecimalUnits.UNITS())
         self.assertTrue(abs(m) >= min_value)
 
+    @given(
+       strategies.builds(
+          Size,
+          strategies.one_of(
+             strategies.integers(),
+             strategies.integers(min_value=-2**100, max_value=2**100)
+          )
+       ),
+       strategies.one_of(
+          strategies.integers(min_value=0, max_value=2000),
+          strategies.fractions(min_value=0, max_value=2000),
+          strategies.decimals(min_value=0, max_value=2000).filter(
+             lambda x: x.is_finite()
+          )
+       ),
+       strategies.booleans()
+    )
+    def testUnitScan(self, s, min_value, binary_units):
+        """ Test that the unit is that found by scanning all the units. """
+        units = BinaryUnits if binary_units else DecimalUnits
+        limit = units.FACTOR * Fraction(min_value)
+        for unit in [B] + units.UNITS():
+            if abs(s.convertTo(unit)) < limit:
+                break
+
+        (m, u) = s.components(min_value, binary_units)
+        self.assertIs(u, unit) # pylint: disable=undefined-loop-variable
+        self.assertEqual(m, s.convertTo(u))
+
 class RoundingTestCase(unittest.TestCase):
     """ Test rounding methods. """
 
@@ -117,11 +149,11 @@ class RoundingTestCase(unittest.TestCase):
         (q, r) = divmod(converted.numerator, converted.denominator)
         ceiling = Size((q + 1) * factor)
         floor = Size(q * factor)
-        if rounding is ROUND_UP:
+        if rounding in (ROUND_UP, ROUND_CEILING):
             self.assertEqual(rounded, ceiling)
             return
 
-        if rounding is ROUND_DOWN:
+        if rounding in (ROUND_DOWN, ROUND_FLOOR):
             self.assertEqual(rounded, floor)
             return
 
@@ -134,6 +166,8 @@ class RoundingTestCase(unittest.TestCase):
         else:
             if rounding is ROUND_HALF_UP:
                 self.assertEqual(rounded, ceiling)
+            elif rounding is ROUND_HALF_EVEN:
+                self.assertEqual(rounded, floor if q % 2 == 0 else ceiling)
             else:
                 self.assertEqual(rounded, floor)
 
@@ -18,6 +18,7 @@
 
 """ Tests for behavior of Size objects. """
 
+import threading
 import unittest
 
 from decimal import Decimal
@@ -31,11 +32,14 @@ from bytesize import GiB
 from bytesize import TiB
 from bytesize import KB
 from bytesize import StrConfig
+from bytesize import str_config
 
 from bytesize._config import Defaults
 
 from bytesize._errors import SizeValueError
 
+from bytesize._size import from_magnitude
+
 class ConstructionTestCase(unittest.TestCase):
     """ Test construction of Size objects. """
 
@@ -77,6 +81,19 @@ class ConstructionTestCase(unittest.TestCase):
            Size(Fraction(1, 2), MiB)
         )
 
+    def testSlots(self):
+        """ Test that Size objects carry no instance dictionary. """
+        self.assertFalse(hasattr(Size(0), "__dict__"))
+        with self.assertRaises(AttributeError):
+            Size(0).junk = 2 # pylint: disable=attribute-defined-outside-init
+
+    def testFromMagnitude(self):
+        """ Test the unvalidated internal constructor. """
+        s = from_magnitude(1024)
+        self.assertIsInstance(s, Size)
+        self.assertEqual(s, Size(1, KiB))
+        self.assertEqual(-s, Size(-1024))
+
 class DisplayTestCase(unittest.TestCase):
     """ Test formatting Size for display. """
 
@@ -149,6 +166,102 @@ class DisplayTestCase(unittest.TestCase):
         s = Size(1000)
         self.assertEqual(s.components(binary_units=False), (1, KB))
 
+class CacheTestCase(unittest.TestCase):
+    """ Test the cache of strings rendered by __str__. """
+
+    def tearDown(self):
+        """ Reset configuration and cache to default. """
+        Size.set_str_cache(None)
+        Size.set_str_config(Defaults.STR_CONFIG)
+
+    def testNoCache(self):
+        """ Test that there is no cache by default. """
+        self.assertIsNone(Size.str_cache_info())
+
+    def testCache(self):
+        """ Test that cached strings are used and counted. """
+        Size.set_str_cache(2)
+        s = Size(64, GiB)
+        self.assertEqual(str(s), "64.00 GiB")
+        self.assertEqual(str(s), "64.00 GiB")
+        info = Size.str_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def testInvalidation(self):
+        """ Test that setting the configuration clears the cache. """
+        Size.set_str_cache(2)
+        s = Size(64, GiB)
+        str(s)
+        Size.set_str_config(StrConfig(strip=True))
+        self.assertEqual(Size.str_cache_info().currsize, 0)
+        self.assertEqual(str(s), "64 GiB")
+
+    def testExceptions(self):
+        """ Test bad cache sizes. """
+        for maxsize in (0, -1, "128"):
+            with self.assertRaises(SizeValueError):
+                Size.set_str_cache(maxsize)
+
+class ScopedConfigurationTestCase(unittest.TestCase):
+    """ Test setting configuration for display in a with block. """
+
+    def tearDown(self):
+        """ Reset configuration to default. """
+        Size.set_str_config(Defaults.STR_CONFIG)
+
+    def testScope(self):
+        """ Test that configuration applies only in the block. """
+        s = Size(64, GiB)
+        with str_config(strip=True) as config:
+            self.assertEqual(str(s), "64 GiB")
+            self.assertIs(Size.get_str_config(), config)
+            with str_config(StrConfig(max_places=1)):
+                self.assertEqual(str(s), "64.0 GiB")
+            self.assertEqual(str(s), "64 GiB")
+        self.assertEqual(str(s), "64.00 GiB")
+
+    def testOverride(self):
+        """ Test that the scope takes precedence over set_str_config. """
+        Size.set_str_config(StrConfig(max_places=1))
+        s = Size(64, GiB)
+        with str_config(strip=True):
+            self.assertEqual(str(s), "64 GiB")
+        with str_config():
+            self.assertEqual(str(s), "64.0 GiB")
+        self.assertEqual(str(s), "64.0 GiB")
+
+    def testException(self):
+        """ Test that the configuration is restored on an exception. """
+        with self.assertRaises(SizeValueError):
+            with str_config(max_places=-1):
+                pass
+        with self.assertRaises(ValueError):
+            with str_config(strip=True):
+                raise ValueError()
+        self.assertIs(Size.get_str_config(), Size._STR_CONFIG) # pylint: disable=protected-access
+
+    def testThreads(self):
+        """ Test that a scope in one thread does not affect another. """
+        s = Size(64, GiB)
+        entered = threading.Event()
+        done = threading.Event()
+        results = []
+
+        def scoped():
+            """ Hold a scope open while the other thread formats. """
+            with str_config(strip=True):
+                entered.set()
+                done.wait()
+                results.append(str(s))
+
+        thread = threading.Thread(target=scoped)
+        thread.start()
+        entered.wait()
+        results.append(str(s))
+        done.set()
+        thread.join()
+        self.assertEqual(results, ["64.00 GiB", "64 GiB"])
+
 class ConfigurationTestCase(unittest.TestCase):
     """ Test setting configuration for display. """
 
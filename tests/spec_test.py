@@ -0,0 +1,104 @@
+# Copyright (C) 2015  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+
+""" Tests for format specifications. """
+
+from hypothesis import given
+from hypothesis import strategies
+import unittest
+
+from fractions import Fraction
+
+from bytesize import GiB
+from bytesize import MiB
+from bytesize import Size
+from bytesize import StrConfig
+from bytesize import UNITS
+from bytesize import format_magnitude
+from bytesize import str_config
+
+from bytesize._config import Defaults
+from bytesize._errors import SizeValueError
+from bytesize._spec import spec_formatter
+
+from tests.utils import SIZE_STRATEGY
+
+class SpecTestCase(unittest.TestCase):
+    """ Test Size.__format__. """
+
+    def tearDown(self):
+        """ Reset configuration to default. """
+        Size.set_str_config(Defaults.STR_CONFIG)
+
+    @given(
+       SIZE_STRATEGY,
+       strategies.sampled_from(UNITS()),
+       strategies.integers(min_value=0, max_value=10),
+       strategies.sampled_from(["f", "g"])
+    )
+    def testFixedUnit(self, s, unit, places, kind):
+        """ Test that a size in a fixed unit agrees with format_magnitude.
+        """
+        expected = format_magnitude(
+           Fraction(int(s), int(unit)),
+           max_places=places,
+           strip=kind == "g"
+        ) + " " + str(unit)
+        spec = ".%d%s%s" % (places, kind, unit)
+        self.assertEqual(format(s, spec), expected)
+
+    @given(SIZE_STRATEGY)
+    def testAutoUnit(self, s):
+        """ Test that automatic units agree with str(). """
+        self.assertEqual(format(s, ""), str(s))
+        self.assertEqual(format(s, "h"), str(s))
+        self.assertEqual(
+           format(s, "H"),
+           StrConfig(binary_units=False).formatter(s)
+        )
+        self.assertEqual(format(s, ".1g"), StrConfig(1, True).formatter(s))
+
+    def testDefaults(self):
+        """ Test that the configuration in effect fills in omissions. """
+        s = Size(64, GiB)
+        self.assertEqual(format(s, "GiB"), "64.00 GiB")
+        with str_config(strip=True, max_places=1):
+            self.assertEqual(format(s, "GiB"), "64 GiB")
+            self.assertEqual(format(s, "fGiB"), "64.0 GiB")
+            self.assertEqual(format(s, "{0}".format("MiB")), "65536 MiB")
+
+    def testPadding(self):
+        """ Test fill, alignment and width. """
+        s = Size("1.5", MiB)
+        self.assertEqual(format(s, "12"), "    1.50 MiB")
+        self.assertEqual(format(s, "<12"), "1.50 MiB    ")
+        self.assertEqual(format(s, "*^12.1f"), "**1.5 MiB***")
+        self.assertEqual("{0:>12.0fKiB}".format(s), "    1536 KiB")
+
+    def testExceptions(self):
+        """ Test bad specifications. """
+        for spec in ("GiBs", "Gib", "2.", ".x", "h2", "=10", "ff"):
+            with self.assertRaises(SizeValueError):
+                format(Size(0), spec)
+
+    def testCache(self):
+        """ Test that a specification is parsed once for a configuration.
+        """
+        config = StrConfig()
+        self.assertIs(
+           spec_formatter(".1fGiB", config),
+           spec_formatter(".1fGiB", config)
+        )
@@ -21,15 +21,46 @@ from hypothesis import given
 from hypothesis import strategies
 import unittest
 
+from decimal import Context
 from decimal import Decimal
 from decimal import DefaultContext
+from decimal import InvalidOperation
+from decimal import ROUND_CEILING
+from decimal import ROUND_FLOOR
+from decimal import ROUND_HALF_EVEN
+from decimal import ROUND_HALF_UP
+from decimal import localcontext
 from fractions import Fraction
 
 from bytesize._constants import RoundingMethods
 from bytesize._errors import SizeValueError
 from bytesize._util import convert_magnitude
 from bytesize._util import format_magnitude
+from bytesize._util import integer_context
 from bytesize._util import round_fraction
+from bytesize._util import round_quotient
+
+def _result(func, *args):
+    """ The result of func, or the type of the exception it raised. """
+    try:
+        return func(*args)
+    except Exception as err: # pylint: disable=broad-except
+        return type(err)
+
+def _decimal_reference(value, max_places, context):
+    """ Convert value to a string using only the decimal module. """
+    with localcontext(context) as ctx:
+        if isinstance(value, Fraction):
+            value = Decimal(value.numerator)/Decimal(value.denominator)
+        value = Decimal(value)
+        if max_places is not None:
+            while True:
+                try:
+                    value = value.quantize(Decimal(10) ** -max_places)
+                    break
+                except InvalidOperation:
+                    ctx.prec += 2
+        return str(value)
 
 class FormatTestCase(unittest.TestCase):
     """ Test formatting. """
@@ -79,6 +110,78 @@ class FormatTestCase(unittest.TestCase):
         )
         self.assertNotEqual(Fraction(converted), x)
 
+    @given(
+       strategies.integers(min_value=-(10**60), max_value=10**60),
+       strategies.integers(min_value=1, max_value=2**100),
+       strategies.one_of(
+          strategies.none(),
+          strategies.integers(min_value=0, max_value=30)
+       ),
+       strategies.integers(min_value=1, max_value=40)
+    )
+    def testDecimalAgreement(self, n, d, max_places, prec):
+        """ The integer rendering agrees with the decimal module. """
+        context = Context(prec=prec)
+        for x in (Fraction(n, d), n):
+            self.assertEqual(
+               convert_magnitude(x, max_places=max_places, context=context),
+               _decimal_reference(x, max_places, context)
+            )
+
+    @given(
+       strategies.integers(min_value=0, max_value=10**6),
+       strategies.integers(min_value=0, max_value=5)
+    )
+    def testTies(self, n, max_places):
+        """ Values halfway between results agree with the decimal module. """
+        x = Fraction(2 * n + 1, 2 * 10**max_places)
+        self.assertEqual(
+           convert_magnitude(x, max_places=max_places),
+           _decimal_reference(x, max_places, DefaultContext)
+        )
+
+    def testOtherContexts(self):
+        """ Contexts which do not round half to even use the decimal module.
+        """
+        context = Context(prec=28, rounding=ROUND_HALF_UP)
+        self.assertEqual(
+           convert_magnitude(Fraction(5, 2), max_places=0, context=context),
+           "3"
+        )
+        self.assertEqual(convert_magnitude(Fraction(5, 2), max_places=0), "2")
+
+    def testOtherContextAttributes(self):
+        """ Contexts which render or bound exponents otherwise use the
+            decimal module.
+        """
+        contexts = [
+           Context(capitals=0),
+           Context(clamp=1, Emax=10),
+           Context(Emax=3),
+           Context(Emin=-3, prec=2)
+        ]
+        for context in contexts:
+            self.assertFalse(integer_context(context))
+            for (value, max_places) in (
+                  (Fraction(1, 10**7), None),
+                  (Fraction(10**6, 3), None),
+                  (Fraction(1, 10**7), 9)
+               ):
+                self.assertEqual(
+                   _result(convert_magnitude, value, max_places, context),
+                   _result(_decimal_reference, value, max_places, context)
+                )
+        self.assertEqual(
+           convert_magnitude(Fraction(1, 10**7), None, Context(capitals=0)),
+           "1e-7"
+        )
+        self.assertTrue(integer_context(Context(Emin=-10**7, Emax=10**7)))
+
+    def testNegativeZero(self):
+        """ Small negative values keep their sign, as with the decimal module.
+        """
+        self.assertEqual(convert_magnitude(Fraction(-1, 1024)), "-0.00")
+
 class RoundingTestCase(unittest.TestCase):
     """ Test rounding of fraction. """
     # pylint: disable=too-few-public-methods
@@ -110,3 +213,57 @@ class RoundingTestCase(unittest.TestCase):
             self.assertEqual(r, 1)
         else:
             self.assertEqual(r, 0)
+
+        r = round_fraction(f, RoundingMethods.ROUND_HALF_EVEN)
+        if i > 5:
+            self.assertEqual(r, 1)
+        else:
+            self.assertEqual(r, 0)
+
+        self.assertEqual(round_fraction(f, RoundingMethods.ROUND_FLOOR), 0)
+        self.assertEqual(round_fraction(f, RoundingMethods.ROUND_CEILING), 1)
+
+    @given(
+       strategies.integers(),
+       strategies.integers(min_value=1),
+       strategies.sampled_from(RoundingMethods.METHODS())
+    )
+    def testQuotient(self, n, d, rounding):
+        """ Rounding agrees with the decimal module's analogous methods. """
+        analogues = {
+           RoundingMethods.ROUND_CEILING: ROUND_CEILING,
+           RoundingMethods.ROUND_DOWN: ROUND_FLOOR,
+           RoundingMethods.ROUND_FLOOR: ROUND_FLOOR,
+           RoundingMethods.ROUND_HALF_EVEN: ROUND_HALF_EVEN,
+           RoundingMethods.ROUND_UP: ROUND_CEILING
+        }
+        if rounding in analogues:
+            with localcontext() as ctx:
+                # Enough that a quotient which is not a tie cannot be
+                # rounded to one.
+                ctx.prec = len(str(abs(n))) + len(str(d)) + 2
+                expected = int(
+                   (Decimal(n) / Decimal(d)).to_integral_value(
+                      rounding=analogues[rounding]
+                   )
+                )
+            self.assertEqual(round_quotient(n, d, rounding), expected)
+        self.assertEqual(
+           round_quotient(n, d, rounding),
+           round_fraction(Fraction(n, d), rounding)
+        )
+
+    def testHalves(self):
+        """ Ties are broken according to the method. """
+        cases = ((5, (3, 2, 2)), (-5, (-2, -3, -2)), (3, (2, 1, 2)))
+        for (n, expected) in cases:
+            self.assertEqual(
+               tuple(
+                  round_quotient(n, 2, rounding) for rounding in (
+                     RoundingMethods.ROUND_HALF_UP,
+                     RoundingMethods.ROUND_HALF_DOWN,
+                     RoundingMethods.ROUND_HALF_EVEN
+                  )
+               ),
+               expected
+            )